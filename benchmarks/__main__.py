@@ -0,0 +1,103 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import sys
+import argparse
+from pathlib import Path
+from .cases import *
+from .runner import *
+
+
+def parse_overrides(values: list) -> dict:
+    overrides = dict()
+    for value in values:
+        name, _, tolerance = value.partition('=')
+        overrides[name] = float(tolerance)
+    return overrides
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    names = args.case or list(CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        sys.stderr.write(f"ERROR! Unknown benchmark cases: {', '.join(unknown)}\n")
+        return 2
+    results = run_benchmarks(names, args.repeats, args.scale)
+    write_results(Path(args.output), results)
+    sys.stderr.write(f"Results written to '{args.output}'.\n")
+    if args.baseline:
+        return report_comparison(results, read_results(Path(args.baseline)), args)
+    return 0
+
+
+def cmd_compare(args: argparse.Namespace) -> int:
+    current = read_results(Path(args.current))
+    baseline = read_results(Path(args.baseline))
+    return report_comparison(current, baseline, args)
+
+
+def report_comparison(current: dict, baseline: dict, args: argparse.Namespace) -> int:
+    overrides = parse_overrides(args.case_tolerance)
+    comparisons = compare_results(current, baseline, args.tolerance, overrides)
+    for cmp in comparisons:
+        status = "REGRESSED" if cmp.regressed else "ok"
+        sys.stdout.write(
+            f"{cmp.name:<32} {cmp.baseline * 1000:>10.3f} ms -> "
+            f"{cmp.current * 1000:>10.3f} ms  {cmp.ratio:>6.2f}x  {status}\n"
+        )
+    return 1 if any(cmp.regressed for cmp in comparisons) else 0
+
+
+def cmd_list(_: argparse.Namespace) -> int:
+    for case in CASES.values():
+        sys.stdout.write(f"{case.name:<32} {case.description}\n")
+    return 0
+
+
+def add_tolerance_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--tolerance", type=float, default=DEFAULT_TOLERANCE,
+        help="Allowed relative slowdown of the median timing. Default: 0.10"
+    )
+    parser.add_argument(
+        "--case-tolerance", action="append", default=list(), metavar="NAME=TOL",
+        help="Overrides the tolerance of a single case. Can be used multiple times."
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Runs the benchmark cases.")
+    run.add_argument("--case", "-c", action="append", help="A case to run. Default: all cases.")
+    run.add_argument("--repeats", "-r", type=int, default=5, help="Repeats per case. Default: 5")
+    run.add_argument("--scale", "-s", type=float, default=1.0, help="Scales the synthetic trees.")
+    run.add_argument("--output", "-o", default="bench-results.json", help="The results file.")
+    run.add_argument("--baseline", "-b", help="Compares the results against a baseline file.")
+    add_tolerance_args(run)
+    run.set_defaults(func=cmd_run)
+
+    compare = commands.add_parser("compare", help="Compares a results file against a baseline.")
+    compare.add_argument("current")
+    compare.add_argument("baseline")
+    add_tolerance_args(compare)
+    compare.set_defaults(func=cmd_compare)
+
+    listing = commands.add_parser("list", help="Lists the benchmark cases.")
+    listing.set_defaults(func=cmd_list)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import os
+import sys
+import itertools
+import devtools_cli
+import subprocess
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
+from devtools_cli.utils import read_local_config_file, write_local_config_file
+from devtools_cli.commands.license.header import LicenseHeader
+from devtools_cli.commands.license.models import LicenseConfig
+from devtools_cli.commands.version.helpers import digest_directory
+from devtools_cli.commands.log.helpers import read_existing_content, write_new_section
+from devtools_cli.commands.log.models import LogConfig
+from .generators import *
+
+__all__ = ["BenchCase", "CASES", "bench_case"]
+
+Prepare = Callable[[Path, float], Callable[[], Any]]
+
+
+@dataclass(frozen=True)
+class BenchCase:
+    """
+    A benchmark case. The `prepare` function builds the workspace of the case inside
+    the current working directory and returns the callable which is timed. The callable
+    is invoked `number` times per repeat. Cases which modify their workspace in a way
+    that affects the next call, are `fresh` and get a new workspace for every repeat.
+    """
+    name: str
+    prepare: Prepare
+    number: int = 1
+    fresh: bool = False
+    description: str = ''
+
+
+CASES: Dict[str, BenchCase] = dict()
+
+
+def bench_case(name: str, number: int = 1, fresh: bool = False) -> Callable[[Prepare], Prepare]:
+    def decorator(func: Prepare) -> Prepare:
+        doc = (func.__doc__ or '').strip()
+        CASES[name] = BenchCase(name, func, number, fresh, doc)
+        return func
+    return decorator
+
+
+def scaled_tree(scale: float) -> TreeSpec:
+    return TreeSpec(file_count=max(1, int(TreeSpec.file_count * scale)))
+
+
+def scaled_changelog(scale: float) -> ChangelogSpec:
+    return ChangelogSpec(sections=max(1, int(ChangelogSpec.sections * scale)))
+
+
+@bench_case("license.apply", fresh=True)
+def prepare_license_apply(root: Path, scale: float) -> Callable[[], Any]:
+    """Applies the license header to every file of a synthetic tree."""
+    generate_config(root, paths=["src"])
+    files = generate_tree(root / "src", scaled_tree(scale))
+    config: LicenseConfig = read_local_config_file(LicenseConfig)
+    header = LicenseHeader(config.header)
+    return lambda: [header.apply(path) for path in files]
+
+
+@bench_case("version.digest_directory", number=3)
+def prepare_digest_directory(root: Path, scale: float) -> Callable[[], Any]:
+    """Digests every file of a synthetic tree."""
+    generate_tree(root / "src", scaled_tree(scale))
+    return lambda: digest_directory(root / "src", [])
+
+
+@bench_case("config.read", number=200)
+def prepare_config_read(root: Path, _: float) -> Callable[[], Any]:
+    """Finds and parses the log section of the local config file."""
+    generate_config(root, paths=["src"])
+    return lambda: read_local_config_file(LogConfig)
+
+
+@bench_case("config.write", number=100)
+def prepare_config_write(root: Path, _: float) -> Callable[[], Any]:
+    """Merges the log section into the local config file."""
+    generate_config(root, paths=["src"])
+    config = read_local_config_file(LogConfig)
+    return lambda: write_local_config_file(config)
+
+
+@bench_case("log.read_existing_content", number=20)
+def prepare_log_read(root: Path, scale: float) -> Callable[[], Any]:
+    """Reads the sections of a long changelog file."""
+    generate_config(root)
+    generate_changelog(root, scaled_changelog(scale))
+    return lambda: read_existing_content(init_cwd=False)
+
+
+@bench_case("log.write_new_section", number=10)
+def prepare_log_write(root: Path, scale: float) -> Callable[[], Any]:
+    """Writes a new section on top of a long changelog file."""
+    generate_config(root)
+    generate_changelog(root, scaled_changelog(scale))
+    config = read_local_config_file(LogConfig)
+    counter = itertools.count()
+    return lambda: write_new_section(f"9.0.{next(counter)}", ["- Benchmark change"], config)
+
+
+@bench_case("cli.cold_start")
+def prepare_cli_cold_start(root: Path, _: float) -> Callable[[], Any]:
+    """Starts a new interpreter which prints the help of the devtools CLI."""
+    generate_config(root)
+    cmd = [sys.executable, "-m", "devtools_cli.main", "--help"]
+    # Benchmarks the checked-out sources, even if another version is installed.
+    source_root = str(Path(devtools_cli.__file__).parent.parent)
+    env = {**os.environ, "PYTHONPATH": source_root}
+    return lambda: subprocess.run(cmd, cwd=root, env=env, capture_output=True, check=True)
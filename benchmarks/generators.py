@@ -0,0 +1,170 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import orjson
+import random
+from pathlib import Path
+from dataclasses import dataclass
+from typing import List, Literal, Tuple
+from devtools_cli.commands.license.header import LicenseHeader
+from devtools_cli.commands.license.models import LicenseConfigHeader
+from devtools_cli.commands.log.models import Header, LogConfig, CHANGELOG_FILENAME
+from devtools_cli.commands.log.helpers import format_release_link_ref, write_sections
+from devtools_cli.utils import LOCAL_CONFIG_FILE
+
+__all__ = [
+    "TreeSpec",
+    "ChangelogSpec",
+    "BENCH_LICENSE_HEADER",
+    "draw_file_size",
+    "generate_tree",
+    "generate_config",
+    "generate_changelog"
+]
+
+SizeDistribution = Literal['fixed', 'uniform', 'lognormal']
+
+BENCH_LICENSE_HEADER = LicenseConfigHeader(
+    title="MIT License",
+    year="2024",
+    holder="Benchmark Holder",
+    spdx_id="MIT",
+    spaces=3,
+    oss=True
+)
+FILLER_LINE = "value = compute(alpha, beta, gamma)  # synthetic benchmark content\n"
+
+
+@dataclass(frozen=True)
+class TreeSpec:
+    """
+    Parameters of a synthetic source tree.
+
+    Attributes:
+        file_count: The total number of files in the tree.
+        depth: The number of nested directory levels below the tree root.
+        fanout: The number of subdirectories in every directory.
+        mean_size: The mean size of a file in bytes.
+        distribution: The distribution the file sizes are drawn from.
+        header_ratio: The ratio of files which already contain the license header.
+        extensions: The file extensions which are assigned to files in turns.
+        seed: The seed of the random generator, which makes the trees reproducible.
+    """
+    file_count: int = 500
+    depth: int = 3
+    fanout: int = 3
+    mean_size: int = 4096
+    distribution: SizeDistribution = 'lognormal'
+    header_ratio: float = 0.5
+    extensions: Tuple[str, ...] = ('.py', '.js', '.ts', '.sh')
+    seed: int = 1337
+
+
+@dataclass(frozen=True)
+class ChangelogSpec:
+    """
+    Parameters of a synthetic changelog file.
+
+    Attributes:
+        sections: The number of version sections in the changelog.
+        entries: The number of change entries in every section.
+    """
+    sections: int = 500
+    entries: int = 5
+
+
+def draw_file_size(rng: random.Random, spec: TreeSpec) -> int:
+    if spec.distribution == 'fixed':
+        return spec.mean_size
+    elif spec.distribution == 'uniform':
+        return rng.randint(0, 2 * spec.mean_size)
+    # The median of a lognormal distribution with sigma=1 is mean / e^0.5.
+    return int(rng.lognormvariate(0, 1) * spec.mean_size / 1.6487)
+
+
+def iter_tree_dirs(root: Path, depth: int, fanout: int) -> List[Path]:
+    dirs, level = [root], [root]
+    for _ in range(depth):
+        level = [d / f"dir{i}" for d in level for i in range(fanout)]
+        dirs.extend(level)
+    return dirs
+
+
+def generate_tree(root: Path, spec: TreeSpec = TreeSpec()) -> List[Path]:
+    """
+    Generates a synthetic source tree under the root path. The files are distributed
+    evenly over all directories of the tree. A `header_ratio` share of the files
+    already contains the license header of `BENCH_LICENSE_HEADER`.
+
+    Returns:
+        The paths of the generated files.
+    """
+    rng = random.Random(spec.seed)
+    headers = LicenseHeader(BENCH_LICENSE_HEADER).__headers__
+    dirs = iter_tree_dirs(root, spec.depth, spec.fanout)
+    for path in dirs:
+        path.mkdir(parents=True, exist_ok=True)
+
+    files = list()
+    for index in range(spec.file_count):
+        ext = spec.extensions[index % len(spec.extensions)]
+        path = dirs[index % len(dirs)] / f"file{index}{ext}"
+        size = draw_file_size(rng, spec)
+        body = FILLER_LINE * (size // len(FILLER_LINE) + 1)
+        text = body[:size]
+        if rng.random() < spec.header_ratio:
+            header = next(h for h in headers if ext in h.extensions)
+            text = header.text + '\n' + text
+        path.write_text(text)
+        files.append(path)
+    return files
+
+
+def generate_config(root: Path, paths: List[str] = None) -> Path:
+    """
+    Writes a devtools config file with license and log sections into the root path.
+    """
+    data = dict(
+        license_cmd=dict(
+            header=BENCH_LICENSE_HEADER.model_dump(),
+            paths=paths or list(),
+            file_name="MIT.json"
+        ),
+        log_cmd=dict(gh_user="bench", gh_repo="bench")
+    )
+    config_path = root / LOCAL_CONFIG_FILE
+    config_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    return config_path
+
+
+def generate_changelog(root: Path, spec: ChangelogSpec = ChangelogSpec()) -> Path:
+    """
+    Writes a changelog file with `spec.sections` sections into the root path.
+    The versions of the sections are 1.0.0, 1.0.1, ... in descending order.
+
+    Returns:
+        The path of the generated changelog file.
+    """
+    config = LogConfig(log_cmd=dict(gh_user="bench", gh_repo="bench"))
+    versions = [f"1.{i // 100}.{i % 100}" for i in range(spec.sections)][::-1]
+    sections = [
+        [
+            f"### [{version}] - 2024-01-01", '',
+            *[f"- Change {j} of version {version}" for j in range(spec.entries)]
+        ] for version in versions
+    ]
+    refs = [
+        format_release_link_ref(version, versions[min(i + 1, len(versions) - 1)], config)
+        for i, version in enumerate(versions)
+    ]
+    path = root / CHANGELOG_FILENAME
+    write_sections(path, Header(), sections, refs)
+    return path
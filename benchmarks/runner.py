@@ -0,0 +1,172 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import os
+import sys
+import time
+import orjson
+import platform
+import tempfile
+import statistics
+from pathlib import Path
+from datetime import datetime, timezone
+from dataclasses import dataclass
+from typing import Dict, Iterable, List
+from .cases import *
+
+__all__ = [
+    "DEFAULT_TOLERANCE",
+    "Comparison",
+    "run_case",
+    "run_benchmarks",
+    "write_results",
+    "read_results",
+    "compare_results"
+]
+
+DEFAULT_TOLERANCE = 0.10
+HOME_ENV_VARS = ("HOME", "USERPROFILE")
+
+
+@dataclass(frozen=True)
+class Comparison:
+    name: str
+    baseline: float
+    current: float
+    tolerance: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float('inf')
+
+    @property
+    def regressed(self) -> bool:
+        return self.ratio > 1 + self.tolerance
+
+
+class Workspace:
+    """
+    A temporary directory which serves as both the working directory and the home
+    directory of a benchmark case, so that the global data storage of the user is
+    never touched. The previous directory and environment are restored on exit.
+    """
+    def __enter__(self) -> Path:
+        self.tmp = tempfile.TemporaryDirectory(prefix="devtools-bench-")
+        self.root = Path(self.tmp.name).resolve()
+        self.cwd = os.getcwd()
+        self.env = {key: os.environ.get(key) for key in HOME_ENV_VARS}
+        for key in HOME_ENV_VARS:
+            os.environ[key] = str(self.root)
+        os.chdir(self.root)
+        return self.root
+
+    def __exit__(self, *_) -> None:
+        os.chdir(self.cwd)
+        for key, value in self.env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        self.tmp.cleanup()
+
+
+def run_case(case: BenchCase, repeats: int, scale: float) -> Dict[str, float]:
+    """
+    Runs a benchmark case `repeats` times and returns the statistics
+    of the wall time of a single call of the timed callable in seconds.
+    """
+    timings: List[float] = list()
+    workspace, func = None, None
+    try:
+        for _ in range(repeats):
+            if func is None or case.fresh:
+                if workspace is not None:
+                    workspace.__exit__()
+                workspace = Workspace()
+                func = case.prepare(workspace.__enter__(), scale)
+            start = time.perf_counter()
+            for _ in range(case.number):
+                func()
+            timings.append((time.perf_counter() - start) / case.number)
+    finally:
+        if workspace is not None:
+            workspace.__exit__()
+
+    return dict(
+        min=min(timings),
+        median=statistics.median(timings),
+        mean=statistics.fmean(timings),
+        stdev=statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        repeats=repeats,
+        number=case.number
+    )
+
+
+def run_benchmarks(names: Iterable[str], repeats: int, scale: float, verbose: bool = True) -> dict:
+    """
+    Runs the named benchmark cases and returns the results together
+    with the metadata of the environment they were measured in.
+
+    Raises:
+        KeyError: If a benchmark case with a given name does not exist.
+    """
+    results = dict()
+    for name in names:
+        case = CASES[name]
+        results[name] = run_case(case, repeats, scale)
+        if verbose:
+            median = results[name]['median'] * 1000
+            sys.stderr.write(f"{name:<32} {median:>12.3f} ms\n")
+    return dict(
+        meta=dict(
+            timestamp=datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            python=platform.python_version(),
+            implementation=platform.python_implementation(),
+            platform=platform.platform(),
+            cpu_count=os.cpu_count(),
+            repeats=repeats,
+            scale=scale
+        ),
+        results=results
+    )
+
+
+def write_results(path: Path, results: dict) -> None:
+    path.write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+
+
+def read_results(path: Path) -> dict:
+    return orjson.loads(path.read_bytes())
+
+
+def compare_results(
+        current: dict,
+        baseline: dict,
+        tolerance: float = DEFAULT_TOLERANCE,
+        overrides: Dict[str, float] = None
+) -> List[Comparison]:
+    """
+    Compares the median timings of the cases which are present in both results.
+    A case has regressed when its current median exceeds the baseline median
+    by more than the tolerance, which can be overridden per case.
+    """
+    overrides = overrides or dict()
+    comparisons = list()
+    for name, result in current['results'].items():
+        if name not in baseline['results']:
+            continue
+        comparisons.append(Comparison(
+            name=name,
+            baseline=baseline['results'][name]['median'],
+            current=result['median'],
+            tolerance=overrides.get(name, tolerance)
+        ))
+    return comparisons
@@ -0,0 +1,537 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+from pathlib import Path
+from semver import Version
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Literal, Union
+from devtools_cli.errors import *
+from devtools_cli.concurrency import adaptive_map
+from devtools_cli.utils import *
+from devtools_cli.commands.license.header import LicenseHeader, ApplyResult
+from devtools_cli.commands.license.models import LicenseConfig
+from devtools_cli.commands.version.helpers import *
+from devtools_cli.commands.version.cache import *
+from devtools_cli.commands.version.gitrepo import find_git_root
+from devtools_cli.commands.version.models import (
+    HYBRID_SIZE_THRESHOLD,
+    DIGEST_FORMAT,
+    DigestMode,
+    TrackedComponent,
+    VersionConfig
+)
+from devtools_cli.commands.log.archive import read_archived_section
+from devtools_cli.commands.log.helpers import read_changelog_file
+from devtools_cli.commands.log.models import CHANGELOG_FILENAME, ChangelogSection
+
+__all__ = [
+    "DevtoolsError",
+    "ConfigFileNotFound",
+    "ChangelogFileNotFound",
+    "SectionNotFound",
+    "TrackingError",
+    "VersionError",
+    "DigestCacheError",
+    "BumpLevel",
+    "TrackResult",
+    "HeaderResult",
+    "DescriptorResult",
+    "find_config_file",
+    "apply_headers",
+    "component_digests",
+    "update_component_digests",
+    "project_status",
+    "track_component",
+    "project_version",
+    "bump_version",
+    "set_version",
+    "update_descriptors",
+    "export_digest_cache",
+    "import_digest_cache",
+    "changelog_section"
+]
+
+BumpLevel = Literal['major', 'minor', 'patch']
+TrackResult = Literal['created', 'updated', 'unchanged']
+
+
+@dataclass(frozen=True)
+class HeaderResult:
+    path: Path
+    result: ApplyResult
+
+
+@dataclass(frozen=True)
+class DescriptorResult:
+    path: Path
+    old_version: str
+    error: str = ''
+
+
+def find_config_file(root: Path = None) -> Path:
+    """
+    Finds the devtools config file in the root directory or its parents. The functions of
+    this module accept the same `root` argument and use the current working directory, if
+    it is not given. They do not print, prompt or exit, but raise `DevtoolsError` subclasses.
+
+    Raises:
+        ConfigFileNotFound: If there is no devtools config file in or above the root directory.
+    """
+    config_file = find_local_config_file(init_cwd=False, start=root)
+    if config_file is None:
+        raise ConfigFileNotFound(
+            f"Project is not initialized with a devtools config file: '{root or Path.cwd()}'"
+        )
+    return config_file
+
+
+def apply_headers(
+        root: Path = None,
+        config: LicenseConfig = None,
+        *, dry_run: bool = False,
+        files: Iterable[Union[Path, str]] = None
+) -> Iterator[HeaderResult]:
+    """
+    Applies the license header to the files of the license target paths on an autotuned
+    pool of worker threads and yields the results in the order of the files as soon as
+    they have been processed. The yielded paths are relative to the config file directory.
+
+    Args:
+        root: The directory from which the config file is searched.
+        config: The license config to apply, read from the config file if not given.
+        dry_run: If True, the files are not modified, but the results are still reported.
+        files: The candidate files to process instead of walking the target paths, for
+            example the changed files of a git repository. Only the candidates which the
+            walk of the target paths would yield are processed.
+
+    Raises:
+        ConfigFileNotFound: If the project does not have a devtools config file.
+    """
+    # The license helpers import httpx, which the other commands do not need.
+    from devtools_cli.commands.license.helpers import iter_target_files, select_target_files
+
+    config_file = find_config_file(root)
+    if config is None:
+        config = read_config_section(config_file, LicenseConfig)
+
+    conf_dir = config_file.parent
+    header = LicenseHeader(config.header)
+
+    if files is not None:
+        def apply_file(entry: tuple) -> HeaderResult:
+            rel_path, path = entry
+            return HeaderResult(rel_path, header.apply(path, dry_run=dry_run))
+
+        yield from adaptive_map(apply_file, select_target_files(conf_dir, config.paths, files))
+        return
+
+    for target in config.paths:
+        base = conf_dir / target
+
+        def apply(entry: tuple) -> HeaderResult:
+            path, is_file = entry
+            result = header.apply(path, is_file=is_file, dry_run=dry_run)
+            return HeaderResult(Path(target) / path.relative_to(base), result)
+
+        yield from adaptive_map(apply, iter_target_files(base))
+
+
+def component_digests(root: Path = None) -> Dict[str, str]:
+    """
+    Computes the current hash digests of the tracked components without
+    updating the config file.
+
+    Returns:
+        A dictionary of the component names and their current digests.
+
+    Raises:
+        ConfigFileNotFound: If the project does not have a devtools config file.
+    """
+    config_file = find_config_file(root)
+    config = read_config_section(config_file, VersionConfig)
+    digests = digest_components(config_file.parent, config.components)
+    return {
+        comp.name: digest
+        for comp, digest in zip(config.components, digests)
+    }
+
+
+def update_component_digests(root: Path = None) -> Dict[str, str]:
+    """
+    Updates the hash digests of all tracked components in the config file.
+    Does not change the project version.
+
+    Returns:
+        A dictionary of the names of the components whose digests have changed
+        and their new digests.
+
+    Raises:
+        ConfigFileNotFound: If the project does not have a devtools config file.
+    """
+    config_file = find_config_file(root)
+    config = read_config_section(config_file, VersionConfig)
+    changed = dict()
+    digests = stored_and_current_digests(config_file.parent, config.components)
+    for comp, (stored, current) in zip(config.components, digests):
+        if stored != comp.hash:
+            changed[comp.name] = current
+        # The legacy digests are migrated, even if the component has not changed.
+        comp.hash, comp.digest_format = current, DIGEST_FORMAT
+    if config.components:
+        write_config_section(config_file, config)
+    return changed
+
+
+def project_status(root: Path = None) -> dict:
+    """
+    Reports the project version and whether the tracked components have changed since
+    their digests were last updated. The current digest of a component is None, if its
+    target does not exist.
+
+    Returns:
+        A dictionary with the 'version' and 'components' keys.
+
+    Raises:
+        ConfigFileNotFound: If the project does not have a devtools config file.
+    """
+    config_file = find_config_file(root)
+    config = read_config_section(config_file, VersionConfig)
+    existing = [
+        comp for comp in config.components
+        if (config_file.parent / comp.target).exists()
+    ]
+    digests = dict(zip(map(id, existing), stored_and_current_digests(config_file.parent, existing)))
+    components = list()
+    for comp in config.components:
+        stored, current = digests.get(id(comp), (None, None))
+        components.append(dict(
+            name=comp.name,
+            target=comp.target,
+            hash=comp.hash,
+            current=current,
+            changed=stored != comp.hash
+        ))
+    return dict(version=config.app_version, components=components)
+
+
+def track_component(
+        name: str,
+        target: str = '.',
+        ignore: List[str] = None,
+        *, mode: DigestMode = DigestMode.CONTENT,
+        threshold: int = HYBRID_SIZE_THRESHOLD,
+        track_descriptor: bool = False,
+        track_chart: bool = False,
+        root: Path = None
+) -> TrackResult:
+    """
+    Tracks the changes of the target path, relative to the directory of the config file,
+    as a named component and stores its current hash digest into the config file. The
+    digest mode selects whether the files are hashed by their contents, fingerprinted
+    by their metadata, or hashed by their contents if they are smaller than the threshold.
+
+    Returns:
+        Whether the component was created, updated or left unchanged.
+
+    Raises:
+        ConfigFileNotFound: If the project does not have a devtools config file.
+        TrackingError: If the target or the name of the component conflicts with
+            the filesystem, the other tracked components or the tracked versions.
+    """
+    config_file = find_config_file(root)
+    config = read_config_section(config_file, VersionConfig)
+    project_dir = config_file.parent
+    track_path = project_dir / target
+    ignore = list(ignore or [])
+
+    if not track_path.exists():
+        raise TrackingError(f"Cannot track a target path which does not exist: '{track_path}'")
+    elif track_path.is_file() and ignore:
+        raise TrackingError(f"Cannot set ignored paths when target is a file: '{track_path}'")
+
+    index = None
+    for i, entry in enumerate(config.components):
+        if entry.name == name and entry.target != target:
+            raise TrackingError(f"Cannot assign the same name '{name}' to multiple targets!")
+        elif entry.target == target and entry.name != name:
+            raise TrackingError(f"Cannot assign the same target '{target}' to multiple names!")
+        elif (entry.name, entry.target, entry.ignore, entry.mode, entry.threshold) == \
+                (name, target, ignore, mode, threshold):
+            return 'unchanged'
+        elif entry.name == name and entry.target == target:
+            index = i
+
+    comp = TrackedComponent(
+        name=name,
+        target=target,
+        ignore=ignore,
+        hash='',
+        mode=mode,
+        threshold=threshold,
+        digest_format=DIGEST_FORMAT
+    )
+    comp.hash = digest_component(project_dir, comp)
+
+    if track_descriptor:
+        config.app_version = read_descriptor_file_version(project_dir)
+        config.track_descriptor = track_descriptor
+
+    if track_chart:
+        chart_ver, app_ver = read_chart_and_app_version(project_dir)
+        if track_descriptor:
+            if chart_ver and chart_ver != config.app_version:
+                raise TrackingError(
+                    "The 'version' value in the Helm Chart.yaml file must "
+                    "match the version number in the project descriptor file!"
+                )
+            elif app_ver and app_ver != config.app_version:
+                raise TrackingError(
+                    "The 'appVersion' value in the Helm Chart.yaml file must "
+                    "match the version number in the project descriptor file!"
+                )
+        if all(x is not None for x in [chart_ver, app_ver]) and chart_ver != app_ver:
+            raise TrackingError(
+                "Devtools requires the 'version' and 'appVersion' "
+                "values in the Helm Chart.yaml file to be identical!"
+            )
+        config.track_chart = track_chart
+        config.app_version = chart_ver or "0.0.0"
+
+    if index is None:
+        config.components.append(comp)
+    else:
+        config.components[index] = comp
+
+    write_config_section(config_file, config)
+    return 'created' if index is None else 'updated'
+
+
+def project_version(root: Path = None) -> str:
+    """
+    Returns the greater of the version numbers in the config file and the project descriptor file.
+    The first of the pyproject.toml, package.json and Cargo.toml files which defines a version
+    number is the project descriptor file.
+
+    Raises:
+        ConfigFileNotFound: If the project does not have a devtools config file.
+        VersionError: If the version numbers are invalid.
+    """
+    config_file = find_config_file(root)
+    config = read_config_section(config_file, VersionConfig)
+    return resolve_project_version(config, config_file.parent)
+
+
+def bump_version(
+        version: str,
+        level: BumpLevel = 'patch',
+        *, suffix: str = '',
+        downgrade: bool = False,
+        value: int = None
+) -> str:
+    """
+    Computes the next version identifier without writing it anywhere.
+
+    Args:
+        version: The semantic version identifier to bump.
+        level: The version number to bump, either 'major', 'minor' or 'patch'.
+        suffix: A suffix to append to the bumped version, for example 'beta'.
+        downgrade: Whether the version number is decremented instead.
+        value: Explicitly assign this value to the version number of the chosen level.
+
+    Raises:
+        VersionError: If the version or the level is invalid, or a downgrade goes below zero.
+    """
+    levels = ['major', 'minor', 'patch']
+    if level not in levels:
+        raise VersionError(f"Invalid version level: '{level}'")
+    major, minor, patch = [level == x for x in levels]
+
+    try:
+        ver = Version.parse(version)
+        if value:
+            return str(Version(
+                major=value if major else ver.major,
+                minor=value if minor else ver.minor,
+                patch=value if patch else ver.patch
+            ))
+        elif downgrade:
+            return str(Version(
+                major=ver.major - (1 if major else 0),
+                minor=ver.minor - (1 if minor else 0),
+                patch=ver.patch - (1 if patch else 0)
+            ))
+    except ValueError as ex:
+        raise VersionError(str(ex)) from ex
+
+    func = [ver.bump_major, ver.bump_minor, ver.bump_patch][levels.index(level)]
+    return str(func()) + (f"-{suffix}" if suffix else '')
+
+
+def set_version(new_version: str, root: Path = None, config: VersionConfig = None) -> VersionConfig:
+    """
+    Writes the new version into the config file and into the tracked descriptor
+    and Helm chart files, and updates the hash digests of all tracked components.
+    The files are written in a single file transaction, so that a failure does not
+    leave some of them updated.
+
+    Args:
+        new_version: The version to write.
+        root: The directory from which the config file is searched.
+        config: The version config to update, read from the config file if not given.
+
+    Returns:
+        The updated version config.
+
+    Raises:
+        ConfigFileNotFound: If the project does not have a devtools config file.
+    """
+    config_file = find_config_file(root)
+    project_dir = config_file.parent
+    if config is None:
+        config = read_config_section(config_file, VersionConfig)
+
+    with file_transaction():
+        if config.track_descriptor:
+            write_descriptor_file_version(new_version, project_dir)
+        if config.track_chart:
+            write_chart_and_app_version(new_version, project_dir)
+
+        digests = digest_components(project_dir, config.components)
+        for comp, digest in zip(config.components, digests):
+            comp.hash, comp.digest_format = digest, DIGEST_FORMAT
+
+        config.app_version = new_version
+        write_config_section(config_file, config)
+    return config
+
+
+def update_descriptors(new_version: str, root: Path = None) -> List[DescriptorResult]:
+    """
+    Writes the new version into the descriptor files of all packages under the project
+    directory, which are discovered in one pruned walk and written on an autotuned pool
+    of worker threads. The errors of a file are recorded into its result instead of
+    stopping the other files. The descriptor files which do not define a version number
+    are left untouched and reported with an empty old version.
+
+    Returns:
+        The results in the order of the discovered files. The paths are relative
+        to the config file directory.
+
+    Raises:
+        ConfigFileNotFound: If the project does not have a devtools config file.
+    """
+    project_dir = find_config_file(root).parent
+
+    def update(path: Path) -> DescriptorResult:
+        rel_path = path.relative_to(project_dir)
+        try:
+            return DescriptorResult(rel_path, update_descriptor_version(path, new_version))
+        except (OSError, ValueError) as ex:
+            return DescriptorResult(rel_path, '', str(ex) or type(ex).__name__)
+
+    return list(adaptive_map(update, discover_descriptors(project_dir)))
+
+
+def export_digest_cache(path: Path, root: Path = None) -> int:
+    """
+    Writes the content digests of the files of the tracked components into a digest
+    cache file, which can be imported on another checkout of the repository. Only the
+    files which are clean in the git index are exported, keyed by their repository-relative
+    paths, sizes and git blob ids. The digests in the local digest cache are reused.
+
+    Returns:
+        The number of exported file digests.
+
+    Raises:
+        ConfigFileNotFound: If the project does not have a devtools config file.
+        DigestCacheError: If the project is not inside a git repository with a SHA-1 index.
+    """
+    config_file = find_config_file(root)
+    project_dir = config_file.parent
+    config = read_config_section(config_file, VersionConfig)
+    identities = FileIdentities.from_directory(project_dir)
+    if identities is None:
+        raise DigestCacheError(f"Cannot find a git repository with a SHA-1 index: '{project_dir}'")
+    local = open_digest_cache(project_dir)
+
+    def iter_files() -> Iterator[Path]:
+        seen = set()
+        for comp in config.components:
+            if comp.mode == DigestMode.METADATA:
+                continue
+            track_path = project_dir / comp.target
+            files = [track_path] if track_path.is_file() else iter_directory_files(track_path, comp.ignore)
+            for filepath in files:
+                if filepath not in seen:
+                    seen.add(filepath)
+                    yield filepath
+
+    def digest(item: tuple) -> tuple:
+        filepath, key = item
+        cached = local.cache.get(key) if local is not None else None
+        return key, cached or digest_file(filepath)
+
+    cache = DigestCache(dict(adaptive_map(digest, identities.iter_identities(iter_files()))))
+    cache.write(path)
+    return len(cache)
+
+
+def import_digest_cache(path: Path, root: Path = None) -> int:
+    """
+    Replaces the local digest cache of the git repository of the project with the
+    contents of a digest cache file, which was exported from another checkout.
+
+    Returns:
+        The number of imported file digests.
+
+    Raises:
+        ConfigFileNotFound: If the project does not have a devtools config file.
+        DigestCacheError: If the project is not inside a git repository, or the file
+            is not a valid digest cache.
+    """
+    project_dir = find_config_file(root).parent
+    git_root = find_git_root(project_dir)
+    if git_root is None:
+        raise DigestCacheError(f"Cannot find a git repository: '{project_dir}'")
+    try:
+        cache = DigestCache.read(path)
+    except ValueError as ex:
+        raise DigestCacheError(f"{ex} '{path}'") from ex
+    cache.write(get_local_digest_cache_path(git_root))
+    return len(cache)
+
+
+def changelog_section(version: str = None, root: Path = None) -> ChangelogSection:
+    """
+    Returns the section of the given version from the changelog file or its
+    archive, or the latest section of the changelog file if no version is given.
+
+    Raises:
+        ConfigFileNotFound: If the project does not have a devtools config file.
+        ChangelogFileNotFound: If the project does not have a changelog file.
+        SectionNotFound: If the changelog does not contain the requested section.
+    """
+    logfile = find_config_file(root).parent / CHANGELOG_FILENAME
+    if not logfile.is_file():
+        raise ChangelogFileNotFound(f"The changelog file does not exist: '{logfile}'")
+
+    for section in read_changelog_file(logfile).sections:
+        if not version or section.version == version:
+            return section
+
+    found: Union[ChangelogSection, None] = None
+    if version:
+        found = read_archived_section(version, logfile)
+    if found is None:
+        if version:
+            raise SectionNotFound(f"The changelog does not contain any sections for version {version}.")
+        raise SectionNotFound("The changelog does not contain any entries.")
+    return found
@@ -13,9 +13,7 @@ import sys
 import subprocess
 from typer import Typer
 from pathlib import Path
-from rich.panel import Panel
-from rich.prompt import Confirm
-from rich.console import Console
+from devtools_cli.output import LazyConsole
 from devtools_cli.utils import *
 
 app = Typer(
@@ -23,7 +21,7 @@ app = Typer(
     no_args_is_help=True,
     help="Project management configuration."
 )
-console = Console(soft_wrap=True)
+console = LazyConsole(soft_wrap=True)
 
 
 @app.command(name="init", epilog="Example: devtools config init")
@@ -42,6 +40,7 @@ def cmd_init():
         raise SystemExit()
 
     if not config_file:
+        from rich.prompt import Confirm
         if Confirm.ask("Initialize current working directory as project root?"):
             find_local_config_file(init_cwd=True)
             console.print("Devtools initialized!")
@@ -59,6 +58,8 @@ def cmd_edit():
         console.print(f"Config file not found, unable to continue.")
         raise SystemExit()
 
+    from rich.panel import Panel
+    from rich.prompt import Confirm
     warning = "[bold grey78]Waiver of Responsibility"
     console.print(Panel.fit(warning, border_style="red"))
     edit = Confirm.ask(
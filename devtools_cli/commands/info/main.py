@@ -16,7 +16,7 @@ except (ImportError, NameError):
 from typing import List
 from typer import Typer
 from pathlib import Path
-from rich.console import Console
+from devtools_cli.output import is_json_mode, emit_json
 
 app = Typer()
 
@@ -32,6 +32,11 @@ def info() -> None:
     i1, i2 = 2 * ' ', 5 * ' '
 
     pkg = get_package_info()
+    if is_json_mode():
+        emit_json(vars(pkg))
+        return
+
+    from rich.console import Console
     console = Console(soft_wrap=True)
     console.print(f"\n{i1}{title_color}Package Info:")
 
@@ -9,9 +9,12 @@
 #   SPDX-License-Identifier: Apache-2.0
 #
 
+import copy
 from pathlib import Path
 from typing import Literal, Union, List, Tuple
 from dataclasses import dataclass
+from devtools_cli.tracing import *
+from devtools_cli.stats import *
 from .models import LicenseConfigHeader
 
 __all__ = [
@@ -219,7 +222,7 @@ class LicenseHeader:
             )
             self.__headers__.append(data)
 
-    def apply(self, path: Path) -> ApplyResult:
+    def apply(self, path: Path, *, is_file: bool = None, dry_run: bool = False) -> ApplyResult:
         """
         Applies the previously constructed license header to the file at the specified path.
         If the file already has a license header which is identical to the one being applied,
@@ -230,8 +233,14 @@ class LicenseHeader:
 
         Args:
             path: An instance of `pathlib.Path` to which the license header should be applied.
+            is_file: Whether the path is known to be a regular file, for example from the
+                directory entry of a directory walker. The path is stat'ed, if not given.
+            dry_run: If True, the file is not modified, but the result is still reported.
         """
-        if not path or not path.exists() or not path.is_file():
+        if is_file is None:
+            io_counters.files_stat += 1
+            is_file = bool(path) and path.is_file()
+        if not is_file:
             return 'unsupported'
 
         header: Union[HeaderData, None] = None
@@ -243,35 +252,44 @@ class LicenseHeader:
         if not header:
             return 'unsupported'
 
-        content = path.read_text().splitlines()
+        with trace_span("license.read") as span:
+            with path.open('r') as file:
+                content = file.read()
+                # The position of the binary buffer is the number of raw bytes read.
+                span.add(bytes_read=file.buffer.tell(), files=1)
+        io_counters.files_read += 1
+        content = content.splitlines()
 
         shebang_line = ''
         if content and content[0].startswith('#!'):
             shebang_line = content.pop(0) + '\n'
 
         if content:
+            # The alias flag is toggled on a copy, so that the files
+            # can be applied concurrently by the same header object.
+            symbols = copy.copy(header.symbols)
             has_header = False
-            for _ in range(2 if header.symbols.has_alias else 1):
-                has_header = content[0].startswith(header.symbols.first)
-                if not has_header and header.symbols.has_alias:
-                    header.symbols.use_alias = not header.symbols.use_alias
+            for _ in range(2 if symbols.has_alias else 1):
+                has_header = content[0].startswith(symbols.first)
+                if not has_header and symbols.has_alias:
+                    symbols.use_alias = not symbols.use_alias
 
             if has_header:
                 end = 0
-                if header.symbols.identical:
+                if symbols.identical:
                     for i, line in enumerate(content):
-                        if line.startswith(header.symbols.first):
+                        if line.startswith(symbols.first):
                             end += 1
                             continue
                         break
                 else:
                     for i, line in enumerate(content):
-                        if line.startswith(header.symbols.last):
+                        if line.startswith(symbols.last):
                             end += 1
                             break
                         elif (
-                                line.startswith(header.symbols.middle) or
-                                line.startswith(header.symbols.first) or
+                                line.startswith(symbols.middle) or
+                                line.startswith(symbols.first) or
                                 len(line.strip()) == 0
                         ):
                             end += 1
@@ -286,6 +304,13 @@ class LicenseHeader:
         padding = '\n' if content else ''
         content = f"{padding}{'\n'.join(content).lstrip()}{padding}"
         content = shebang_line + header.text + content
-
-        path.write_text(content)
+        if dry_run:
+            return 'applied'
+
+        with trace_span("license.write") as span:
+            with path.open('w') as file:
+                file.write(content)
+                file.flush()
+                span.add(bytes_written=file.buffer.tell(), files=1)
+        io_counters.files_written += 1
         return 'applied'
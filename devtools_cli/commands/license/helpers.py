@@ -9,15 +9,15 @@
 #   SPDX-License-Identifier: Apache-2.0
 #
 
+import os
 import yaml
 import httpx
 import orjson
 import asyncio
 from pathlib import Path
-from rich.tree import Tree
-from rich.panel import Panel
-from rich.console import Console
-from typing import Callable, Iterator, Union, List, Dict, Tuple
+from typing import Callable, Iterable, Iterator, Union, List, Tuple
+from devtools_cli.tracing import *
+from devtools_cli.traversal import walk_tree
 from devtools_cli.utils import *
 from .models import *
 from .header import *
@@ -31,7 +31,8 @@ __all__ = [
     "read_license_metadata",
     "ident_to_license_filepath",
     "write_local_license_file",
-    "print_apply_results"
+    "iter_target_files",
+    "select_target_files"
 ]
 
 GH_API_REPO_TREE_TOP = "https://api.github.com/repos/github/choosealicense.com/git/trees/gh-pages"
@@ -105,7 +106,9 @@ async def fetch_one_license(client: httpx.AsyncClient, index: int, filename: str
     Returns:
         An object containing details about the license.
     """
-    resp = await client.get(GH_RAW_PARTIAL_PATH + filename)
+    with trace_span("license.fetch", filename=filename) as span:
+        resp = await client.get(GH_RAW_PARTIAL_PATH + filename)
+        span.add(bytes_read=len(resp.content), files=1)
     resp = resp.text.split(sep="---")
     spdx = filename.rstrip('.txt')
     data = yaml.safe_load(resp[1])
@@ -271,67 +274,51 @@ def write_local_license_file(config: LicenseConfig) -> None:
         file.write(full_text)
 
 
-def print_apply_results(
-        results: List[Tuple[Path, ApplyResult]],
-        config: LicenseConfig,
-        conf_dir: Path
-) -> None:
-    top_key = str(conf_dir)
-    main_tree = Tree(f"[bold deep_pink3]{top_key}[/]")
-    tree_map: Dict[str, Tree] = dict()
-    tree_map[top_key] = main_tree
+def iter_target_files(target: Path) -> Iterator[Tuple[Path, bool]]:
+    """
+    Yields the same paths as `target.rglob('*.*')` in the fixed order of `walk_tree`,
+    together with whether each path is a regular file. The file-ness is taken from the
+    directory entries, which usually does not require an additional stat call. Each
+    directory is scanned only once, while `rglob` scans every directory twice, and the
+    directories are scanned ahead of time on a thread pool by `walk_tree`.
+
+    Args:
+        target: The directory to walk. Nothing is yielded if it is not a directory.
+
+    Returns:
+        An iterator of tuples of the matching paths and their file-ness.
+    """
+    return walk_tree(target, name_filter=lambda name: '.' in name)
+
 
-    for path, res in results:
-        if res == 'unsupported':
+def select_target_files(
+        conf_dir: Path,
+        targets: List[str],
+        files: Iterable[Union[Path, str]]
+) -> Iterator[Tuple[Path, Path]]:
+    """
+    Selects the files which `iter_target_files` would yield for any of the target paths
+    from the given candidate files, without walking the target directories. Relative
+    candidate paths are resolved against the current working directory. Each selected
+    file is yielded only once, in the order of the candidates, even if the targets overlap.
+
+    Args:
+        conf_dir: The directory against which the target paths are resolved.
+        targets: The target paths of the license config.
+        files: The candidate file paths, for example the changed files of a git repository.
+
+    Returns:
+        An iterator of tuples of the selected paths relative to the config file
+        directory and their absolute paths.
+    """
+    bases = [(Path(target), Path(os.path.abspath(conf_dir / target))) for target in targets]
+    seen = set()
+    for file in files:
+        path = Path(os.path.abspath(file))
+        if '.' not in path.name or path in seen:
             continue
-        # path = path.relative_to(conf_dir)
-        all_parts = [top_key, *path.parts]
-        subtree = main_tree
-
-        for i, part in enumerate(all_parts):
-            key = '/'.join(all_parts[:i + 1])
-            is_file = Path(key).is_file()
-            if i == len(all_parts) - 1 and is_file:
-                a, b = '[italic dark_goldenrod]', '[italic bold green3]'
-                res = res.upper() if res == 'applied' else res
-                part += f" - {a if res == 'skipped' else b}{res}[/]"
-            if key not in tree_map:
-                a, b = '[grey93]', '[deep_sky_blue1]'
-                style = a if is_file else b
-                subtree = subtree.add(f"{style}{part}[/]")
-                tree_map[key] = subtree
-            else:
-                subtree = tree_map[key]
-
-    console = Console()
-    console.print()
-    console.print(Panel.fit(
-        renderable=main_tree,
-        title="Operation Details",
-        subtitle="Operation Details",
-        border_style="deep_sky_blue1",
-    ))
-    console.print("[italic bright_black]Note: unsupported filetypes are omitted from the tree view.[/]")
-    console.print()
-
-    apply_totals = 0
-    skip_totals = 0
-    usp_totals = 0
-    usp_types = set()
-
-    for path, res in results:
-        if res == 'applied':
-            apply_totals += 1
-        elif res == 'skipped':
-            skip_totals += 1
-        elif res == 'unsupported':
-            usp_types.add(path.suffix)
-            usp_totals += 1
-
-    console.print(f"[bold deep_pink3]Operation summary:[/]")
-    console.print(f"Licensed {apply_totals} files under the [chartreuse3]{config.header.title}[/].")
-    console.print(f"Skipped {skip_totals} files which already have the requested license header.")
-    console.print(f"Ignored {usp_totals} files with unsupported [grey85]filetype(s):[/] {list(usp_types)}")
-    console.print()
-    console.print("[italic deep_sky_blue1]Thank you for using devtools![/]")
-    console.print()
+        for target, base in bases:
+            if path != base and path.is_relative_to(base):
+                seen.add(path)
+                yield target / path.relative_to(base), path
+                break
@@ -9,20 +9,25 @@
 #   SPDX-License-Identifier: Apache-2.0
 #
 
+import os
+import sys
 import time
 import asyncio
 import webbrowser
 from pathlib import Path
-from typing import List, Any
-from typer import Typer, Option
+from typing import Iterable, List, Union, Any
+from typer import Typer, Option, Argument
 from typing_extensions import Annotated
-from rich.progress import Progress
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
+from devtools_cli.output import *
+from devtools_cli.workspace import *
+from devtools_cli.api import apply_headers
+from devtools_cli.errors import GitCommandError
+from devtools_cli.commands.version.gitrepo import list_changed_files
 from .helpers import *
+from .reporter import *
 from .header import *
 from .models import *
+from devtools_cli.tracing import *
 from devtools_cli.utils import *
 
 app = Typer(
@@ -30,7 +35,7 @@ app = Typer(
     no_args_is_help=True,
     help="Manages license headers in source code files."
 )
-console = Console(soft_wrap=True)
+console = LazyConsole(soft_wrap=True)
 
 
 PathsOpt = Annotated[List[str], Option(
@@ -120,23 +125,167 @@ VerboseOpt = Annotated[bool, Option(
 )]
 
 
-@app.command(name="apply", epilog="Example: devtools license apply --verbose")
-def cmd_apply(verbose: VerboseOpt = False) -> None:
+FormatOpt = Annotated[ReportFormat, Option(
+    "--format", "-f", show_default=False, help=''
+    "The format of the operation report. The json format writes a summary object and "
+    "the jsonl format writes one JSON object per processed file and a final summary "
+    "object to stdout. Default: text, or json with the global --json option"
+)]
+
+
+def print_workspace_headers(dry_run: bool) -> None:
+    # A dry run reports the files which would be applied as missing the header.
+    key = 'missing' if dry_run else 'applied'
+
+    def apply(root: Path) -> dict:
+        counts = {key: 0, 'skipped': 0, 'unsupported': 0}
+        for item in apply_headers(root, dry_run=dry_run):
+            counts[key if item.result == 'applied' else item.result] += 1
+        return counts
+
+    root = get_workspace_root()
+    projects = discover_projects(root)
+    if not projects:
+        exit_with_error(console, f"Cannot find any devtools projects in the workspace: '{root}'")
+
+    with trace_span("license.apply") as span:
+        results = run_in_projects(apply, projects, root)
+        span.add(files=sum(sum(r.value.values()) for r in results))
+
+    columns = {key: key.capitalize(), 'skipped': "Up to date", 'unsupported': "Unsupported"}
+    totals = {name: sum(r.value.get(name, 0) for r in results) for name in columns}
+    report_workspace(console, results, columns, totals)
+    if totals[key] and dry_run:
+        raise SystemExit(1)
+
+
+FilesArg = Annotated[List[Path], Argument(
+    show_default=False, help=''
+    'The candidate files to process instead of all files of the license target paths, '
+    'for example the {staged_files} of a lefthook pre-commit hook. Only the candidates '
+    'within the target paths are processed.'
+)]
+ChangedOpt = Annotated[bool, Option(
+    "--changed", "-c", show_default=False, help=''
+    "Process only the files which differ from HEAD in the git working tree and the "
+    "untracked files which are not ignored. Default: False"
+)]
+SinceOpt = Annotated[str, Option(
+    "--since", "-s", show_default=False, help=''
+    "Process only the files which have changed since the given git revision. "
+    "Implies the --changed option."
+)]
+StagedOpt = Annotated[bool, Option(
+    "--staged", "-S", show_default=False, help=''
+    "Process only the files with staged changes in the git index. "
+    "Implies the --changed option. Default: False"
+)]
+FilesFromOpt = Annotated[str, Option(
+    "--files-from", "-F", show_default=False, help=''
+    'A file of NUL-separated candidate files to process, as written by "git diff -z '
+    '--name-only". Newline-separated paths are accepted, if the file has no NUL bytes. '
+    'Use "-" to read from stdin.'
+)]
+
+
+def read_files_from(source: str) -> List[str]:
+    data = sys.stdin.buffer.read() if source == '-' else Path(source).read_bytes()
+    sep = b'\0' if b'\0' in data else b'\n'
+    return [os.fsdecode(path) for path in data.split(sep) if path.strip()]
+
+
+def collect_candidate_files(
+        conf_dir: Path,
+        files: List[Path],
+        changed: bool,
+        since: str,
+        staged: bool,
+        files_from: str
+) -> Union[Iterable[Path], None]:
+    changed = changed or staged or bool(since)
+    if sum([changed, bool(files), bool(files_from)]) > 1:
+        exit_with_error(console, "The file arguments and the '--changed' and "
+                                 "'--files-from' options cannot be combined.")
+    try:
+        if changed:
+            return list_changed_files(conf_dir, since, staged)
+        if files_from:
+            return [Path(path) for path in read_files_from(files_from)]
+    except (GitCommandError, OSError) as ex:
+        exit_with_error(console, str(ex))
+    return files or None
+
+
+@app.command(name="apply", epilog="Example: devtools license apply --staged")
+def cmd_apply(
+        files: FilesArg = None,
+        verbose: VerboseOpt = False,
+        fmt: FormatOpt = ReportFormat.TEXT,
+        changed: ChangedOpt = False,
+        since: SinceOpt = None,
+        staged: StagedOpt = False,
+        files_from: FilesFromOpt = None
+) -> None:
     """
     Applies a license header to any applicable files.
     """
+    selective = bool(files or changed or since or staged or files_from)
+    if get_workspace_root() is not None:
+        if selective:
+            exit_with_error(console, "The changed files cannot be selected in a workspace.")
+        return print_workspace_headers(dry_run=False)
+
     config: LicenseConfig = read_local_config_file(LicenseConfig)
     conf_dir: Path = find_local_config_file(init_cwd=True).parent
+    candidates = collect_candidate_files(conf_dir, files, changed, since, staged, files_from)
+
+    if fmt == ReportFormat.TEXT and is_json_mode():
+        fmt = ReportFormat.JSON
 
-    header = LicenseHeader(config.header)
-    results = list()
-    for target in config.paths:
-        for path in Path(target).rglob('**/*.*'):
-            full_path = (conf_dir / path).resolve()
-            if res := header.apply(full_path):
-                results.append((path, res))
-    if verbose:
-        print_apply_results(results, config, conf_dir)
+    with ApplyReporter(config, conf_dir, fmt, verbose) as reporter:
+        with trace_span("license.apply") as span:
+            for item in apply_headers(conf_dir, config, files=candidates):
+                reporter.add(item.path, item.result)
+                span.add(files=1)
+
+
+@app.command(name="check", epilog="Example: devtools license check")
+def cmd_check(verbose: VerboseOpt = False) -> None:
+    """
+    Checks that all applicable files have the license header without modifying them.
+    Exits with status 1 if any file is missing the header or has an outdated header.
+    """
+    if get_workspace_root() is not None:
+        return print_workspace_headers(dry_run=True)
+
+    config: LicenseConfig = read_local_config_file(LicenseConfig)
+    conf_dir: Path = find_local_config_file(init_cwd=True).parent
+
+    checked, missing = 0, list()
+    with trace_span("license.check") as span:
+        for item in apply_headers(conf_dir, config, dry_run=True):
+            if item.result != 'unsupported':
+                checked += 1
+            if item.result == 'applied':
+                missing.append(item.path.as_posix())
+        span.add(files=checked)
+
+    if is_json_mode():
+        emit_json(dict(
+            license=config.header.title,
+            checked=checked,
+            missing=missing,
+            ok=not missing
+        ))
+    elif missing:
+        if verbose:
+            for path in missing:
+                console.print(f"[dark_goldenrod]Missing or outdated license header:[/] {path}")
+        console.print(f"{len(missing)} of {checked} files do not have the requested license header.\n")
+    else:
+        console.print(f"All {checked} files have the requested license header.\n")
+    if missing:
+        raise SystemExit(1)
 
 
 @app.command(name="update", epilog="Example: devtools license update")
@@ -144,6 +293,8 @@ def cmd_update() -> None:
     """
     Updates the available licenses from the https://choosealicense.com website.
     """
+    from rich.progress import Progress
+
     def callback(_: Any = None):
         progress.update(task, advance=1)
         time.sleep(0.01)
@@ -158,11 +309,13 @@ def cmd_update() -> None:
         progress.tasks[0].total = len(filenames)
         progress.start_task(task)
 
-        coro = fetch_license_details(filenames, callback)
-        licenses = asyncio.run(coro)
+        with trace_span("license.download", files=len(filenames)):
+            coro = fetch_license_details(filenames, callback)
+            licenses = asyncio.run(coro)
 
     console.print("Writing licenses to storage... ", style="grey78", end='')
-    write_licenses_to_storage(licenses)
+    with trace_span("license.store"):
+        write_licenses_to_storage(licenses)
 
     time.sleep(0.5)
     console.print(f"Done! Updated {len(filenames)} licenses.\n", style="grey78")
@@ -176,6 +329,14 @@ def cmd_list() -> None:
     """
     meta_data = read_license_metadata()
 
+    if is_json_mode():
+        emit_json(dict(licenses=[
+            dict(index_id='0', spdx_id='none', title='Proprietary License'),
+            *[lic.model_dump() for lic in meta_data.lic_list]
+        ]))
+        return
+
+    from rich.table import Table
     table = Table(title="Available Licenses")
     table.add_column("Index-ID", justify="left", style="sandy_brown", no_wrap=True)
     table.add_column("SPDX-Identifier", style="cyan", no_wrap=True)
@@ -209,6 +370,7 @@ def cmd_read(ident: IdentOpt = None) -> None:
             raise SystemExit()
     else:
         if ident == '0':
+            from rich.panel import Panel
             text = '\n'.join(PrprTemplate.template)
             console.print(Panel.fit(text, border_style="deep_sky_blue1"))
             raise SystemExit()
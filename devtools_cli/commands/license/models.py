@@ -9,6 +9,7 @@
 #   SPDX-License-Identifier: Apache-2.0
 #
 
+from enum import Enum
 from typing import List, Dict
 from pydantic import BaseModel, Field, AliasChoices
 from devtools_cli.models import DefaultModel, ConfigSection
@@ -20,7 +21,8 @@ __all__ = [
     "LicenseMetadata",
     "LicenseDetails",
     "LicenseConfigHeader",
-    "LicenseConfig"
+    "LicenseConfig",
+    "ReportFormat"
 ]
 
 
@@ -122,3 +124,9 @@ class LicenseConfig(ConfigSection):
     @property
     def section(self) -> str:
         return 'license_cmd'
+
+
+class ReportFormat(str, Enum):
+    TEXT = "text"
+    JSON = "json"
+    JSONL = "jsonl"
@@ -0,0 +1,204 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import sys
+import time
+import orjson
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Any, Dict, Set
+from devtools_cli.tracing import *
+from devtools_cli.output import emit_json
+from .header import ApplyResult
+from .models import *
+
+__all__ = ["DirectoryCounts", "ApplyReporter"]
+
+PROGRESS_BATCH = 256
+PROGRESS_INTERVAL = 0.1
+
+
+@dataclass
+class DirectoryCounts:
+    applied: int = 0
+    skipped: int = 0
+
+
+class ApplyReporter:
+    """
+    This class receives the results of the `license apply` command one at a time and keeps
+    only the totals and the per-directory counts of applied and skipped files, so that its
+    memory usage is bounded by the number of directories instead of the number of files.
+    In the JSONL format, every result is written to stdout as soon as it is received.
+    In the JSON format, a single summary object with the per-directory counts is written.
+    In the text format, a collapsed tree of the directories and the operation summary
+    are printed when the reporter is closed, if the verbose flag is set, and a throttled
+    progress bar is shown on the terminal while the reporter is open. Rich is only
+    imported in the text format.
+    """
+    def __init__(
+            self,
+            config: LicenseConfig,
+            conf_dir: Path,
+            fmt: ReportFormat = ReportFormat.TEXT,
+            verbose: bool = False
+    ):
+        self.config = config
+        self.conf_dir = conf_dir
+        self.fmt = fmt
+        self.verbose = verbose
+        self.totals: Dict[str, int] = dict(applied=0, skipped=0, unsupported=0)
+        self.unsupported_types: Set[str] = set()
+        self.directories: Dict[str, DirectoryCounts] = dict()
+        self.progress: Any = None
+        self.pending = 0
+        self.last_update = 0.0
+
+    def __enter__(self) -> "ApplyReporter":
+        if self.fmt != ReportFormat.TEXT:
+            return self
+        from rich.console import Console
+        from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
+        stderr = Console(stderr=True)
+        if stderr.is_terminal:
+            self.progress = Progress(
+                SpinnerColumn(),
+                TextColumn("[deep_sky_blue3]Processing:"),
+                TextColumn("{task.completed} files"),
+                TimeElapsedColumn(),
+                console=stderr,
+                transient=True
+            )
+            self.task = self.progress.add_task("apply", total=None)
+            self.progress.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self.progress is not None:
+            self.progress.stop()
+            self.progress = None
+        if exc_type is None:
+            self.finish()
+
+    def add(self, path: Path, result: ApplyResult) -> None:
+        self.totals[result] += 1
+        if result == 'unsupported':
+            self.unsupported_types.add(path.suffix)
+        else:
+            key = str(path.parent)
+            counts = self.directories.get(key)
+            if counts is None:
+                counts = self.directories[key] = DirectoryCounts()
+            setattr(counts, result, getattr(counts, result) + 1)
+
+        if self.fmt == ReportFormat.JSONL:
+            line = dict(type="file", path=path.as_posix(), result=result)
+            sys.stdout.buffer.write(orjson.dumps(line) + b'\n')
+        elif self.progress is not None:
+            self.advance_progress()
+
+    def advance_progress(self) -> None:
+        self.pending += 1
+        if self.pending >= PROGRESS_BATCH:
+            now = time.monotonic()
+            if now - self.last_update >= PROGRESS_INTERVAL:
+                self.progress.update(self.task, advance=self.pending)
+                self.pending, self.last_update = 0, now
+
+    def finish(self) -> None:
+        with trace_span("license.report"):
+            self.write_report()
+
+    def summary(self) -> Dict[str, Any]:
+        return dict(
+            license=self.config.header.title,
+            unsupported_types=sorted(self.unsupported_types),
+            **self.totals
+        )
+
+    def write_report(self) -> None:
+        if self.fmt == ReportFormat.JSONL:
+            line = dict(type="summary", **self.summary())
+            sys.stdout.buffer.write(orjson.dumps(line) + b'\n')
+            sys.stdout.buffer.flush()
+        elif self.fmt == ReportFormat.JSON:
+            directories = {
+                key: dict(applied=counts.applied, skipped=counts.skipped)
+                for key, counts in self.directories.items()
+            }
+            emit_json(dict(**self.summary(), directories=directories))
+        elif self.verbose:
+            self.print_results()
+
+    def cumulative_counts(self) -> Dict[str, DirectoryCounts]:
+        cumulative: Dict[str, DirectoryCounts] = dict()
+        for key, counts in self.directories.items():
+            parts = Path(key).parts
+            for i in range(len(parts) + 1):
+                prefix = str(Path(*parts[:i])) if i else ''
+                total = cumulative.setdefault(prefix, DirectoryCounts())
+                total.applied += counts.applied
+                total.skipped += counts.skipped
+        return cumulative
+
+    def build_tree(self) -> Any:
+        from rich.tree import Tree
+
+        def label(name: str, counts: DirectoryCounts) -> str:
+            return (
+                f"{name} - [italic bold green3]{counts.applied} APPLIED[/], "
+                f"[italic dark_goldenrod]{counts.skipped} skipped[/]"
+            )
+
+        cumulative = self.cumulative_counts()
+        root_counts = cumulative.pop('', DirectoryCounts())
+        main_tree = Tree(label(f"[bold deep_pink3]{self.conf_dir}[/]", root_counts))
+        nodes: Dict[str, Tree] = {'.': main_tree}
+
+        for key in sorted(cumulative, key=lambda k: Path(k).parts):
+            path = Path(key)
+            parent = nodes.get(str(path.parent), main_tree)
+            nodes[key] = parent.add(label(f"[deep_sky_blue1]{path.name}[/]", cumulative[key]))
+        return main_tree
+
+    def print_results(self) -> None:
+        from rich.panel import Panel
+        from rich.console import Console
+        console = Console()
+        console.print()
+        console.print(Panel.fit(
+            renderable=self.build_tree(),
+            title="Operation Details",
+            subtitle="Operation Details",
+            border_style="deep_sky_blue1",
+        ))
+        console.print(
+            "[italic bright_black]Note: directories without supported "
+            "filetypes are omitted from the tree view.[/]"
+        )
+        console.print()
+
+        console.print("[bold deep_pink3]Operation summary:[/]")
+        console.print(
+            f"Licensed {self.totals['applied']} files under "
+            f"the [chartreuse3]{self.config.header.title}[/]."
+        )
+        console.print(
+            f"Skipped {self.totals['skipped']} files which "
+            f"already have the requested license header."
+        )
+        console.print(
+            f"Ignored {self.totals['unsupported']} files with unsupported "
+            f"[grey85]filetype(s):[/] {sorted(self.unsupported_types)}"
+        )
+        console.print()
+        console.print("[italic deep_sky_blue1]Thank you for using devtools![/]")
+        console.print()
@@ -0,0 +1,201 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import orjson
+from pathlib import Path
+from semver import Version
+from typing import Union, List, Dict, Iterator
+from devtools_cli.stats import *
+from devtools_cli.utils import *
+from .helpers import *
+from .models import *
+
+__all__ = [
+    "get_archive_dir",
+    "get_archive_major",
+    "read_archive_index",
+    "write_archive_index",
+    "archive_sections",
+    "auto_archive_sections",
+    "read_archived_section",
+    "iter_archived_changelogs",
+    "read_sections"
+]
+
+
+def get_archive_dir(logfile: Path) -> Path:
+    return logfile.parent / ARCHIVE_DIRNAME
+
+
+def get_archive_major(version: str) -> str:
+    if Version.is_valid(version):
+        return str(Version.parse(version).major)
+    return version.split('.')[0] or '0'
+
+
+def version_sort_key(version: str) -> Version:
+    return Version.parse(version) if Version.is_valid(version) else Version(0)
+
+
+def read_archive_index(logfile: Path) -> ArchiveIndex:
+    path = get_archive_dir(logfile) / ARCHIVE_INDEX_FILENAME
+    io_counters.files_stat += 1
+    if not path.is_file():
+        return ArchiveIndex()
+    io_counters.files_read += 1
+    return ArchiveIndex(**orjson.loads(path.read_bytes() or b'{}'))
+
+
+def write_archive_index(logfile: Path, index: ArchiveIndex) -> None:
+    path = get_archive_dir(logfile) / ARCHIVE_INDEX_FILENAME
+    with atomic_file_writer(path, 'wb') as file:
+        file.write(orjson.dumps(index.model_dump(), option=orjson.OPT_INDENT_2))
+
+
+def archive_sections(keep: int) -> List[str]:
+    """
+    Moves all sections except the newest `keep` sections from the changelog file into
+    archive files of their major versions and records the moved versions in the archive
+    index. The link refs of the moved sections are moved along with the sections, so
+    that the link refs of every file match the sections of that file. The archive files
+    are written before the changelog file, so that an interrupted run never loses sections.
+
+    Args:
+        keep: The number of the newest sections to keep in the changelog file.
+
+    Returns:
+        The versions of the sections which were moved into the archive files.
+
+    Raises:
+        ConfigFileNotFound: If the project does not have a devtools config file.
+        ChangelogFileNotFound: If the project does not have a changelog file.
+    """
+    logfile = get_logfile_path(init_cwd=False)
+    sections, refs = split_sections(iter_existing_content(init_cwd=False))
+    if len(sections) <= keep:
+        return []
+
+    kept, moved = sections[:keep], sections[keep:]
+    moved_refs = {extract_version_from_ref(line): line for line in refs if is_line_link_ref(line)}
+    groups: Dict[str, List[List[str]]] = dict()
+
+    for section in moved:
+        major = get_archive_major(extract_version_from_label(section[0]))
+        groups.setdefault(major, []).append(section)
+
+    archive_dir = get_archive_dir(logfile)
+    archive_dir.mkdir(exist_ok=True)
+    index = read_archive_index(logfile)
+
+    for major, new_sections in groups.items():
+        path = archive_dir / f"{major}.md"
+        old_sections, old_refs = [], []
+        if path.is_file():
+            old_sections, old_refs = split_sections(iter_section_lines(path))
+
+        merged = {
+            extract_version_from_label(section[0]): section
+            for section in [*old_sections, *new_sections]
+        }
+        merged_refs = {
+            extract_version_from_ref(line): line
+            for line in old_refs if is_line_link_ref(line)
+        }
+        for version in merged:
+            if version in moved_refs:
+                merged_refs[version] = moved_refs[version]
+            index.versions[version] = path.name
+
+        versions = sorted(merged, key=version_sort_key, reverse=True)
+        write_sections(
+            path=path,
+            header=ArchiveHeader(major),
+            sections=[merged[v] for v in versions],
+            refs=[merged_refs[v] for v in versions if v in merged_refs],
+            mark_latest=False
+        )
+
+    write_archive_index(logfile, index)
+
+    moved_versions = {extract_version_from_label(section[0]) for section in moved}
+    kept_refs = [line for line in refs if extract_version_from_ref(line) not in moved_versions]
+    write_sections(logfile, Header(), kept, kept_refs)
+
+    return [extract_version_from_label(section[0]) for section in moved]
+
+
+def auto_archive_sections(config: LogConfig) -> List[str]:
+    """
+    Archives the older sections of the changelog file when the number of sections
+    exceeds the archive threshold of the log config. Keeps `archive_keep` sections
+    or `archive_threshold` sections, if the former is not set.
+    """
+    threshold = config.archive_threshold
+    if threshold <= 0:
+        return []
+    count = sum(
+        1 for line in iter_existing_content(init_cwd=False)
+        if line.startswith(SECTION_LEVEL)
+    )
+    if count <= threshold:
+        return []
+    keep = config.archive_keep if 0 < config.archive_keep < threshold else threshold
+    return archive_sections(keep)
+
+
+def read_archived_section(version: str, logfile: Path = None) -> Union[ChangelogSection, None]:
+    logfile = logfile or get_logfile_path(init_cwd=False)
+    filename = read_archive_index(logfile).versions.get(version)
+    if filename is None:
+        return None
+    path = get_archive_dir(logfile) / filename
+    if not path.is_file():
+        return None
+    for section in read_changelog_file(path).sections:
+        if section.version == version:
+            return section
+
+
+def iter_archived_changelogs() -> Iterator[Changelog]:
+    logfile = get_logfile_path(init_cwd=False)
+    filenames = set(read_archive_index(logfile).versions.values())
+    paths = [get_archive_dir(logfile) / name for name in filenames]
+    paths.sort(key=lambda p: version_sort_key(f"{p.stem}.0.0"), reverse=True)
+    for path in paths:
+        if path.is_file():
+            yield read_changelog_file(path)
+
+
+def read_sections(from_ver: str = None, to_ver: str = None) -> List[ChangelogSection]:
+    """
+    Reads the sections of the changelog file and its archive files within the inclusive
+    range of the given versions, or all sections if no versions are given. The archive
+    files are only read if the range extends below the oldest section of the changelog.
+
+    Raises:
+        ValueError: If either of the given versions is not a valid semantic version.
+    """
+    def select(sections: List[ChangelogSection]) -> List[ChangelogSection]:
+        if from_ver or to_ver:
+            return filter_sections(sections, from_ver, to_ver)
+        return list(sections)
+
+    hot_sections = read_changelog(init_cwd=False).sections
+    selected = select(hot_sections)
+
+    oldest = hot_sections[-1].version if hot_sections else ''
+    if from_ver and Version.is_valid(oldest):
+        if Version.parse(from_ver) >= Version.parse(oldest):
+            return selected
+
+    for changelog in iter_archived_changelogs():
+        selected.extend(select(changelog.sections))
+    return selected
@@ -9,9 +9,4 @@
 #   SPDX-License-Identifier: Apache-2.0
 #
 
-class ConfigFileNotFound(FileNotFoundError):
-    pass
-
-
-class ChangelogFileNotFound(FileNotFoundError):
-    pass
+from devtools_cli.errors import ConfigFileNotFound, ChangelogFileNotFound, VersionError
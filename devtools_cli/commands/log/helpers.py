@@ -9,13 +9,25 @@
 #   SPDX-License-Identifier: Apache-2.0
 #
 
+import os
 import re
-from typing import Union, List
+import yaml
+import orjson
+import shutil
+import hashlib
+import subprocess
 from pathlib import Path
+from semver import Version
 from datetime import date
+from contextlib import contextmanager
+from pydantic import ValidationError
+from typing import Union, List, Dict, Iterable, Iterator, Tuple, TextIO
+from devtools_cli.tracing import *
+from devtools_cli.stats import *
 from devtools_cli.utils import *
 from .models import *
 from .errors import *
+from .index import *
 
 
 __all__ = [
@@ -24,14 +36,37 @@ __all__ = [
     "extract_version_from_label",
     "conform_changes",
     "get_logfile_path",
+    "iter_existing_content",
     "read_existing_content",
     "write_new_section",
     "update_latest_section",
     "validate_unique_version",
+    "format_release_link_ref",
     "add_release_link_ref",
-    "is_line_link_ref"
+    "is_line_link_ref",
+    "split_sections",
+    "load_release_records",
+    "read_git_release_records",
+    "merge_release_records",
+    "write_sections",
+    "iter_section_lines",
+    "extract_version_from_ref",
+    "parse_section_label",
+    "iter_changelog_sections",
+    "parse_changelog",
+    "read_changelog",
+    "read_changelog_file",
+    "filter_sections"
 ]
 
+LATEST_SUFFIX = '- _latest_'
+COPY_BUFSIZE = 64 * 1024
+CACHE_DATA_SUBDIR = "changelogs"
+LINK_REF_PATTERN = re.compile(
+    r"^\[(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)"
+    r"(?:-[0-9A-Za-z.-]+)?(?:\+[0-9A-Za-z.-]+)?\]:"
+)
+
 
 def get_section_label(version: str) -> str:
     return " - ".join([
@@ -41,12 +76,16 @@ def get_section_label(version: str) -> str:
     ])
 
 
+def strip_latest_label(line: str) -> str:
+    stripped = line.strip()
+    if stripped.endswith(LATEST_SUFFIX):
+        return stripped.rstrip(LATEST_SUFFIX).strip()
+    return line
+
+
 def remove_latest_label(arr: List[str]) -> None:
     if len(arr) >= 1:
-        suffix = '- _latest_'
-        line = arr[0].strip()
-        if line.endswith(suffix):
-            arr[0] = line.rstrip(suffix).strip()
+        arr[0] = strip_latest_label(arr[0])
 
 
 def extract_version_from_label(line: str) -> str:
@@ -68,6 +107,7 @@ def get_logfile_path(*, init_cwd: bool) -> Path:
     if config_file is None and not init_cwd:
         raise ConfigFileNotFound()
     logfile = config_file.parent / CHANGELOG_FILENAME
+    io_counters.files_stat += 1
     if not logfile.exists():
         if not init_cwd:
             raise ChangelogFileNotFound()
@@ -76,57 +116,108 @@ def get_logfile_path(*, init_cwd: bool) -> Path:
     return logfile
 
 
-def read_existing_content(*, init_cwd: bool) -> List[str]:
+def skip_header_lines(file: TextIO) -> None:
+    for _ in range(Header.line_count + 1):
+        file.readline()
+
+
+def iter_existing_content(*, init_cwd: bool) -> Iterator[str]:
     logfile = get_logfile_path(init_cwd=init_cwd)
+    io_counters.files_read += 1
     with logfile.open('r') as file:
-        lines = file.read().splitlines()
-    skip = Header.line_count + 1
-    return lines[skip:]
+        skip_header_lines(file)
+        for line in file:
+            yield line.rstrip('\n')
 
 
-def write_new_section(version: str, changes: Union[str, List[str]], existing: List[str]) -> None:
-    existing = add_release_link_ref(version, existing)
+def read_existing_content(*, init_cwd: bool) -> List[str]:
+    return list(iter_existing_content(init_cwd=init_cwd))
+
+
+@contextmanager
+def rewrite_logfile(logfile: Path) -> Iterator[Tuple[TextIO, TextIO]]:
+    """
+    Opens the changelog file for reading and a temporary file for writing, which
+    replaces the changelog file when the context exits. The source file is positioned
+    after the header and the header is already written into the destination file.
+    Every line written after the header must be prefixed with a newline character.
+    """
+    with trace_span("log.write", path=logfile.name) as span:
+        io_counters.files_read += 1
+        with logfile.open('r') as src, atomic_file_writer(logfile) as dst:
+            skip_header_lines(src)
+            dst.write(Header())
+            yield src, dst
+            span.add(bytes_read=os.fstat(src.fileno()).st_size, bytes_written=dst.tell(), files=1)
+
+
+def copy_remainder(src: TextIO, dst: TextIO, last_line: str) -> None:
+    if not last_line.endswith('\n'):
+        return
+    chunk = src.read(COPY_BUFSIZE)
+    if chunk:
+        dst.write('\n' + chunk)
+        shutil.copyfileobj(src, dst, COPY_BUFSIZE)
+
+
+def write_new_section(version: str, changes: Union[str, List[str]], config: LogConfig = None) -> None:
+    config = config or read_local_config_file(LogConfig)
     conformed = conform_changes(changes)
     label = get_section_label(version)
-    remove_latest_label(existing)
-
     logfile = get_logfile_path(init_cwd=False)
-    with logfile.open('w') as file:
-        file.write('\n'.join([
-            Header(), '',
-            label, '',
-            *conformed, '',
-            *existing
-        ]))
-
-
-def update_latest_section(changes: Union[str, List[str]], existing: List[str]) -> None:
-    latest, remainder = [], []
-    for i in range(1, len(existing)):
-        if existing[i].startswith(SECTION_LEVEL) or is_line_link_ref(existing[i]):
-            latest = existing[:i]
-            remainder = existing[i:]
-            break
+    identity = get_file_identity(logfile)
+
+    with rewrite_logfile(logfile) as (src, dst):
+        for line in ['', label, '', *conformed, '']:
+            dst.write('\n' + line)
+
+        for index, raw_line in enumerate(iter(src.readline, '')):
+            line = raw_line.rstrip('\n')
+            if index == 0:
+                line = strip_latest_label(line)
+            if is_line_link_ref(line):
+                prev_ver = extract_version_from_label(line)
+                dst.write('\n' + format_release_link_ref(version, prev_ver, config))
+                dst.write('\n' + line)
+                copy_remainder(src, dst, raw_line)
+                break
+            dst.write('\n' + line)
+        else:
+            dst.write('\n' + format_release_link_ref(version, version, config))
 
-    if not latest:
-        latest = existing
+    sections = iter_changelog_sections([label, *conformed])
+    update_search_index(logfile, list(sections), identity)
 
-    if latest and latest[-1] == '':
-        latest.pop(-1)
 
+def update_latest_section(changes: Union[str, List[str]]) -> None:
     conformed = conform_changes(changes)
-    latest.extend(conformed)
-
     logfile = get_logfile_path(init_cwd=False)
-    with logfile.open('w') as file:
-        file.write('\n'.join([
-            Header(), '',
-            *latest, '',
-            *remainder
-        ]))
+    identity = get_file_identity(logfile)
+
+    with rewrite_logfile(logfile) as (src, dst):
+        latest, boundary = [], ''
+        for raw_line in iter(src.readline, ''):
+            line = raw_line.rstrip('\n')
+            if latest and (line.startswith(SECTION_LEVEL) or is_line_link_ref(line)):
+                boundary = raw_line
+                break
+            latest.append(line)
+
+        if latest and latest[-1] == '':
+            latest.pop(-1)
+
+        for line in ['', *latest, *conformed, '']:
+            dst.write('\n' + line)
+
+        if boundary:
+            dst.write('\n' + boundary.rstrip('\n'))
+            copy_remainder(src, dst, boundary)
 
+    sections = iter_changelog_sections([*latest, *conformed])
+    update_search_index(logfile, list(sections), identity)
 
-def validate_unique_version(version: str, existing: list) -> bool:
+
+def validate_unique_version(version: str, existing: Iterable[str]) -> bool:
     for line in existing:
         if line.startswith(SECTION_LEVEL):
             ex_ver = extract_version_from_label(line)
@@ -136,11 +227,21 @@ def validate_unique_version(version: str, existing: list) -> bool:
 
 
 def is_line_link_ref(line: str) -> bool:
-    pattern = r"^\[(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)\]"
-    return True if re.match(pattern, line) else False
+    return LINK_REF_PATTERN.match(line) is not None
+
+
+def format_release_link_ref(curr_ver: str, prev_ver: str, config: LogConfig) -> str:
+    url = "{base}/{user}/{repo}/compare/{prev}...{curr}".format(
+        base=GITHUB_URL,
+        user=config.gh_user,
+        repo=config.gh_repo,
+        prev=prev_ver,
+        curr=curr_ver
+    )
+    return f"[{curr_ver}]: {url}"
 
 
-def add_release_link_ref(curr_ver: str, changelist: list) -> list:
+def add_release_link_ref(curr_ver: str, changelist: list, config: LogConfig = None) -> list:
     prev_ver = curr_ver
     log = changelist
     refs = []
@@ -152,13 +253,328 @@ def add_release_link_ref(curr_ver: str, changelist: list) -> list:
             prev_ver = extract_version_from_label(line)
             break
 
-    config: LogConfig = read_local_config_file(LogConfig)
-    url = "{base}/{user}/{repo}/compare/{prev}...{curr}".format(
-        base=GITHUB_URL,
-        user=config.gh_user,
-        repo=config.gh_repo,
-        prev=prev_ver,
-        curr=curr_ver
-    )
-    refs = [f"[{curr_ver}]: {url}", *refs]
+    config = config or read_local_config_file(LogConfig)
+    refs = [format_release_link_ref(curr_ver, prev_ver, config), *refs]
     return log + refs
+
+
+def split_sections(lines: Iterable[str]) -> Tuple[List[List[str]], List[str]]:
+    sections, refs = [], []
+    for line in lines:
+        if refs or is_line_link_ref(line):
+            refs.append(line)
+        elif line.startswith(SECTION_LEVEL) or not sections:
+            sections.append([line])
+        else:
+            sections[-1].append(line)
+    return sections, refs
+
+
+@error_printer
+def load_release_records(data: bytes) -> List[ReleaseRecord]:
+    """
+    Parses a stream of release records, which can be either a JSON document,
+    JSON lines or one or more YAML documents, into a list of `ReleaseRecord` objects.
+
+    Args:
+        data: The raw contents of the release records stream.
+
+    Returns:
+        A list of release records in the order they appeared in the stream.
+
+    Raises:
+        YAMLError: If the data is neither valid JSON, JSON lines nor YAML.
+        ValidationError: If a record fails Pydantic model validation.
+    """
+    try:
+        items = orjson.loads(data)
+    except orjson.JSONDecodeError:
+        try:
+            items = [orjson.loads(line) for line in data.splitlines() if line.strip()]
+        except orjson.JSONDecodeError:
+            items = []
+            for doc in yaml.safe_load_all(data):
+                items.extend(doc if isinstance(doc, list) else [doc])
+
+    if isinstance(items, dict):
+        items = [items]
+    return [ReleaseRecord(**item) for item in items if item]
+
+
+def read_git_release_records(repo_path: Path) -> List[ReleaseRecord]:
+    """
+    Derives release records from the local git history in a single pass: every commit
+    tagged with a semantic version starts a new release, and the subjects of that commit
+    and of all older commits up to the next release tag become the changes of the release.
+    Commits newer than the latest release tag are considered unreleased and ignored.
+
+    Args:
+        repo_path: A path inside the git repository.
+
+    Returns:
+        A list of release records, ordered from the newest to the oldest release.
+
+    Raises:
+        CalledProcessError: If the git command fails.
+    """
+    result = subprocess.run([
+        "git", "log", "--topo-order", "--date=short",
+        "--decorate-refs=refs/tags/", "--format=%x1e%D%x1f%cd%x1f%s"
+    ], cwd=repo_path, capture_output=True, text=True, check=True)
+
+    records: List[ReleaseRecord] = []
+    current: Union[ReleaseRecord, None] = None
+
+    for entry in result.stdout.split('\x1e'):
+        if not entry.strip():
+            continue
+        refs, day, subject = entry.rstrip('\n').split('\x1f', 2)
+        tags = [ref.removeprefix('tag: ') for ref in refs.split(', ')]
+        versions = [tag for tag in tags if Version.is_valid(tag.removeprefix('v'))]
+        if versions:
+            current = ReleaseRecord(version=versions[0], date=day)
+            records.append(current)
+        if current is not None and subject:
+            current.changes.append(subject)
+
+    return records
+
+
+def merge_release_records(
+        records: List[ReleaseRecord],
+        config: LogConfig,
+        archived: Iterable[str] = ()
+) -> Tuple[List[str], List[str]]:
+    """
+    Merges release records into the changelog file with one read and one write.
+    All sections are ordered by their semantic versions, the latest label is moved
+    to the newest section and the release link refs are regenerated for all sections.
+    Records with invalid versions or versions that already exist are skipped.
+
+    Args:
+        records: The release records to merge into the changelog file.
+        config: The log config which provides the GitHub project attributes.
+        archived: The versions of the sections which have been archived.
+
+    Returns:
+        A tuple of the imported versions and the skipped versions.
+
+    Raises:
+        VersionError: If the label of an existing section is not a semantic version,
+            in which case the changelog file is left untouched.
+    """
+    sections, _ = split_sections(iter_existing_content(init_cwd=True))
+    known = {extract_version_from_label(section[0]): section for section in sections}
+    archived = set(archived)
+    imported, skipped = [], []
+
+    for record in records:
+        version = record.version
+        if version in known or version in archived or not Version.is_valid(version):
+            skipped.append(version)
+            continue
+        label = f"{SECTION_LEVEL} [{version}] - {record.date}"
+        known[version] = [label, '', *conform_changes(record.changes)]
+        imported.append(version)
+
+    if not imported:
+        return imported, skipped
+
+    invalid = [version for version in known if not Version.is_valid(version)]
+    if invalid:
+        raise VersionError(
+            "Cannot order the changelog sections, because these section labels "
+            f"are not semantic versions: {', '.join(invalid)}"
+        )
+    versions = sorted(known, key=Version.parse, reverse=True)
+    refs = [
+        format_release_link_ref(version, versions[min(index + 1, len(versions) - 1)], config)
+        for index, version in enumerate(versions)
+    ]
+    logfile = get_logfile_path(init_cwd=False)
+    write_sections(logfile, Header(), [known[v] for v in versions], refs)
+    return imported, skipped
+
+
+def write_sections(
+        path: Path,
+        header: str,
+        sections: List[List[str]],
+        refs: List[str],
+        mark_latest: bool = True
+) -> None:
+    with trace_span("log.write", path=path.name) as span, atomic_file_writer(path) as file:
+        file.write(header + '\n')
+        for index, (label, *body) in enumerate(sections):
+            label = strip_latest_label(label)
+            if mark_latest and index == 0:
+                label = f"{label} - _latest_"
+            while body and body[-1] == '':
+                body.pop(-1)
+            for line in [label, *body, '']:
+                file.write('\n' + line)
+        for line in refs:
+            file.write('\n' + line)
+        span.add(bytes_written=file.tell(), files=1)
+
+
+def iter_section_lines(path: Path) -> Iterator[str]:
+    io_counters.files_read += 1
+    with path.open('r') as file:
+        started = False
+        for line in file:
+            line = line.rstrip('\n')
+            started = started or line.startswith(SECTION_LEVEL) or is_line_link_ref(line)
+            if started:
+                yield line
+
+
+def extract_version_from_ref(line: str) -> str:
+    return extract_version_from_label(line.split(':')[0])
+
+
+def parse_section_label(line: str) -> Tuple[str, str, bool]:
+    parts = [part.strip() for part in line.split(' - ')]
+    latest = len(parts) > 1 and parts[-1] == '_latest_'
+    if latest:
+        parts.pop(-1)
+    version = extract_version_from_label(parts[0])
+    day = parts[1] if len(parts) > 1 else ''
+    return version, day, latest
+
+
+def iter_changelog_sections(
+        lines: Iterable[str],
+        refs: Dict[str, str] = None
+) -> Iterator[ChangelogSection]:
+    """
+    Lazily parses changelog lines into `ChangelogSection` objects, yielding each section
+    as soon as the next section or the link refs begin. Lines before the first section,
+    such as the changelog header, are ignored. Because the link refs are located at the
+    end of the changelog, they are collected into the `refs` dict instead of the sections.
+
+    Args:
+        lines: The lines of a changelog file without trailing newline characters.
+        refs: An optional dict which is populated with the version to URL mapping
+            of the link refs after the sections have been consumed.
+
+    Returns:
+        An iterator yielding the sections in the order they appear in the changelog.
+    """
+    section: Union[ChangelogSection, None] = None
+    for line in lines:
+        if is_line_link_ref(line):
+            if section is not None:
+                yield section
+                section = None
+            if refs is not None:
+                refs[extract_version_from_ref(line)] = line.split(':', 1)[-1].strip()
+        elif line.startswith(SECTION_LEVEL):
+            if section is not None:
+                yield section
+            version, day, latest = parse_section_label(line)
+            section = ChangelogSection(version=version, date=day, latest=latest)
+        elif section is not None and line.strip():
+            if line.startswith('  ') and section.entries:
+                section.entries[-1] += '\n' + line[2:]
+            else:
+                section.entries.append(line.removeprefix('- '))
+    if section is not None:
+        yield section
+
+
+def parse_changelog(logfile: Path) -> Changelog:
+    refs: Dict[str, str] = dict()
+    io_counters.files_read += 1
+    with logfile.open('r') as file:
+        lines = (line.rstrip('\n') for line in file)
+        sections = list(iter_changelog_sections(lines, refs))
+    for section in sections:
+        section.url = refs.get(section.version, '')
+    return Changelog(sections=sections)
+
+
+def get_changelog_cache_path(logfile: Path) -> Path:
+    key = hashlib.blake2b(str(logfile.resolve()).encode('utf-8'), digest_size=16)
+    return get_data_storage_path(CACHE_DATA_SUBDIR, create=True) / f"{key.hexdigest()}.json"
+
+
+def read_changelog(*, init_cwd: bool) -> Changelog:
+    """
+    Reads the parsed changelog model of the project.
+
+    Raises:
+        ConfigFileNotFound: If the project does not have a devtools config file.
+        ChangelogFileNotFound: If the project does not have a changelog file.
+    """
+    return read_changelog_file(get_logfile_path(init_cwd=init_cwd))
+
+
+def read_changelog_file(logfile: Path) -> Changelog:
+    """
+    Reads the parsed changelog model of a changelog file. The parsed model is cached in
+    the global data directory and reused for as long as the changelog file is not modified.
+
+    Args:
+        logfile: The path to a changelog file or a changelog archive file.
+
+    Returns:
+        The parsed changelog model.
+    """
+    with trace_span("log.read", path=logfile.name) as span:
+        cache_path = get_changelog_cache_path(logfile)
+        stat = logfile.stat()
+        io_counters.files_stat += 1
+        identity = dict(
+            path=str(logfile.resolve()),
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            inode=stat.st_ino
+        )
+        try:
+            data = cache_path.read_bytes()
+            io_counters.files_read += 1
+            cache = ChangelogCache(**orjson.loads(data))
+            if cache.model_dump(exclude={'changelog'}) == identity:
+                span.add(bytes_read=len(data), files=1)
+                span.set(cached=True)
+                return cache.changelog
+        except (OSError, ValueError, ValidationError):
+            pass
+
+        changelog = parse_changelog(logfile)
+        cache = ChangelogCache(changelog=changelog, **identity)
+        data = orjson.dumps(cache.model_dump())
+        with atomic_file_writer(cache_path, 'wb') as file:
+            file.write(data)
+        span.add(bytes_read=stat.st_size, bytes_written=len(data), files=1)
+        span.set(cached=False)
+        return changelog
+
+
+def filter_sections(
+        sections: List[ChangelogSection],
+        from_ver: str = None,
+        to_ver: str = None
+) -> List[ChangelogSection]:
+    """
+    Selects the sections whose versions are within the inclusive range of the given
+    versions. A missing bound leaves the range open on that side. Sections with
+    versions which are not valid semantic versions are never selected.
+
+    Raises:
+        ValueError: If either of the given versions is not a valid semantic version.
+    """
+    lower = Version.parse(from_ver) if from_ver else None
+    upper = Version.parse(to_ver) if to_ver else None
+    selected = []
+    for section in sections:
+        if not Version.is_valid(section.version):
+            continue
+        version = Version.parse(section.version)
+        if lower is not None and version < lower:
+            continue
+        if upper is not None and version > upper:
+            continue
+        selected.append(section)
+    return selected
@@ -0,0 +1,152 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import re
+import math
+import orjson
+from pathlib import Path
+from collections import Counter
+from pydantic import ValidationError
+from typing import Union, List, Tuple
+from devtools_cli.stats import *
+from devtools_cli.utils import *
+from .models import *
+
+__all__ = [
+    "tokenize",
+    "get_file_identity",
+    "get_search_index_path",
+    "read_search_index",
+    "write_search_index",
+    "remove_indexed_section",
+    "remove_indexed_source",
+    "add_indexed_section",
+    "update_search_index",
+    "rank_sections"
+]
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def get_file_identity(path: Path) -> List[int]:
+    stat = path.stat()
+    io_counters.files_stat += 1
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+
+def get_search_index_path(logfile: Path) -> Path:
+    return logfile.parent / SEARCH_INDEX_FILENAME
+
+
+def read_search_index(logfile: Path) -> Union[SearchIndex, None]:
+    path = get_search_index_path(logfile)
+    try:
+        data = path.read_bytes()
+        io_counters.files_read += 1
+        return SearchIndex(**orjson.loads(data))
+    except (OSError, ValueError, ValidationError):
+        return None
+
+
+def write_search_index(logfile: Path, index: SearchIndex) -> None:
+    path = get_search_index_path(logfile)
+    with atomic_file_writer(path, 'wb') as file:
+        file.write(orjson.dumps(index.model_dump()))
+
+
+def remove_indexed_section(index: SearchIndex, version: str) -> None:
+    indexed = index.sections.pop(version, None)
+    if indexed is None:
+        return
+    for term in indexed.terms:
+        postings = index.postings.get(term, {})
+        postings.pop(version, None)
+        if not postings:
+            index.postings.pop(term, None)
+
+
+def remove_indexed_source(index: SearchIndex, source: str) -> None:
+    versions = [v for v, s in index.sections.items() if s.source == source]
+    for version in versions:
+        remove_indexed_section(index, version)
+    index.sources.pop(source, None)
+
+
+def add_indexed_section(index: SearchIndex, section: ChangelogSection, source: str) -> None:
+    remove_indexed_section(index, section.version)
+    counts: Counter = Counter()
+    for entry in section.entries:
+        counts.update(tokenize(entry))
+    for term, count in counts.items():
+        index.postings.setdefault(term, {})[section.version] = count
+    index.sections[section.version] = IndexedSection(
+        source=source,
+        date=section.date,
+        length=sum(counts.values()),
+        terms=list(counts)
+    )
+
+
+def update_search_index(
+        logfile: Path,
+        sections: List[ChangelogSection],
+        prev_identity: List[int]
+) -> None:
+    """
+    Incrementally updates the search index after the changelog file has been rewritten
+    with the given new or modified sections. The index is only updated if it exists and
+    was up-to-date with the changelog file before it was rewritten, otherwise it is left
+    for the next search to synchronize.
+
+    Args:
+        logfile: The path to the changelog file.
+        sections: The sections which were added to or modified in the changelog file.
+        prev_identity: The file identity of the changelog file before it was rewritten.
+    """
+    index = read_search_index(logfile)
+    if index is None or index.sources.get(logfile.name) != prev_identity:
+        return
+    for section in sections:
+        add_indexed_section(index, section, logfile.name)
+    index.sources[logfile.name] = get_file_identity(logfile)
+    write_search_index(logfile, index)
+
+
+def rank_sections(index: SearchIndex, terms: List[str]) -> List[Tuple[str, float]]:
+    """
+    Ranks the indexed sections by their Okapi BM25 relevance to the given query terms.
+
+    Returns:
+        A list of (version, score) tuples of the matching sections, best match first.
+    """
+    total = len(index.sections)
+    if total == 0:
+        return []
+    avg_length = sum(s.length for s in index.sections.values()) / total or 1.0
+    scores: Counter = Counter()
+
+    for term in set(terms):
+        postings = index.postings.get(term, {})
+        if not postings:
+            continue
+        idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+        for version, count in postings.items():
+            length = index.sections[version].length
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+            scores[version] += idf * count * (BM25_K1 + 1) / (count + norm)
+
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
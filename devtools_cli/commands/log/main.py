@@ -9,14 +9,22 @@
 #   SPDX-License-Identifier: Apache-2.0
 #
 
+import sys
+import orjson
+import subprocess
+from typing import List
+from pathlib import Path
 from semver import Version
-from rich.prompt import Prompt
-from rich.console import Console
-from typer import Typer, Option
+from typer import Typer, Option, Argument
 from typing_extensions import Annotated
 from devtools_cli.commands.version.models import VersionConfig
+from devtools_cli.output import *
+from devtools_cli.api import changelog_section, SectionNotFound
 from devtools_cli.utils import *
 from .helpers import *
+from .archive import *
+from .search import *
+from .index import tokenize
 from .models import *
 from .errors import *
 
@@ -26,7 +34,7 @@ app = Typer(
     no_args_is_help=True,
     help="Manages project changelog file."
 )
-console = Console(soft_wrap=True)
+console = LazyConsole(soft_wrap=True)
 
 
 UserOpt = Annotated[str, Option(
@@ -71,17 +79,18 @@ def cmd_add():
         raise SystemExit()
 
     ver_conf: VersionConfig = read_local_config_file(VersionConfig)
-    existing = read_existing_content(init_cwd=True)
+    latest_line = next(iter_existing_content(init_cwd=True), None)
     new_section = True
 
-    if len(existing) >= 1:
-        prev_ver_str = extract_version_from_label(existing[0])
+    if latest_line is not None:
+        prev_ver_str = extract_version_from_label(latest_line)
         curr_ver = Version.parse(ver_conf.app_version)
         prev_ver = Version.parse(prev_ver_str)
 
         if curr_ver == prev_ver:
             new_section = False
 
+    from rich.prompt import Prompt
     console.print("Please provide the changelog contents: (Press Enter on empty prompt to apply.)")
 
     changes = []
@@ -94,10 +103,11 @@ def cmd_add():
     if not changes:
         msg = "Did not alter the changelog file.\n"
     elif new_section:
-        write_new_section(ver_conf.app_version, changes, existing)
+        write_new_section(ver_conf.app_version, changes, log_conf)
+        auto_archive_sections(log_conf)
         msg = "Added the changes into a new section of the changelog file.\n"
     else:
-        update_latest_section(changes, existing)
+        update_latest_section(changes)
         msg = "Added the changes into the latest section of the changelog file.\n"
     console.print(msg)
 
@@ -120,60 +130,228 @@ def cmd_insert(changes: ChangesOpt = ''):
         raise SystemExit()
 
     ver_conf: VersionConfig = read_local_config_file(VersionConfig)
-    existing = read_existing_content(init_cwd=True)
+    is_empty = next(iter_existing_content(init_cwd=True), None) is None
+    archive_index = read_archive_index(get_logfile_path(init_cwd=False))
     version = ver_conf.app_version
 
-    if not validate_unique_version(version, existing):
+    is_unique = validate_unique_version(version, iter_existing_content(init_cwd=False))
+    if not is_unique or version in archive_index.versions:
         console.print("ERROR! Cannot insert a duplicate version section into the changelog file.\n")
         raise SystemExit()
 
-    write_new_section(version, changes, existing)
+    write_new_section(version, changes, log_conf)
+    auto_archive_sections(log_conf)
 
-    verb = "updated" if existing else "created"
+    verb = "created" if is_empty else "updated"
     console.print(f"Successfully {verb} the changelog file.")
 
 
+FileOpt = Annotated[str, Option(
+    '--file', '-f', show_default=False, help=''
+    'A JSON, JSON lines or YAML file of release records to import. Use "-" to read from stdin.'
+)]
+GitOpt = Annotated[bool, Option(
+    '--git', '-g', show_default=False, help=''
+    'Derive the release records from the tags and commit messages of the local git repository.'
+)]
+
+
+@app.command(name="import", epilog="Example: devtools log import --file releases.json")
+def cmd_import(file: FileOpt = '', git: GitOpt = False):
+    """
+    Imports many release records into the changelog file at once, either from
+    a stream of {version, date, changes} records or from the local git history.
+    All records are merged into the changelog file with a single write.
+    """
+    log_conf: LogConfig = read_local_config_file(LogConfig)
+    if log_conf.is_default:
+        console.print("ERROR! Cannot import changes to the changelog without first initializing the log config.\n")
+        raise SystemExit()
+    if bool(file) == git:
+        console.print("ERROR! Exactly one of the '--file' or '--git' options must be provided.\n")
+        raise SystemExit()
+
+    if git:
+        config_file = find_local_config_file(init_cwd=False)
+        try:
+            records = read_git_release_records(config_file.parent)
+        except (OSError, subprocess.CalledProcessError):
+            console.print("ERROR! Unable to read the release history from the local git repository.\n")
+            raise SystemExit()
+    else:
+        try:
+            data = sys.stdin.buffer.read() if file == '-' else Path(file).read_bytes()
+        except OSError as ex:
+            exit_with_error(console, f"Unable to read the release records file: {ex}")
+        records = load_release_records(data)
+
+    archive_index = read_archive_index(get_logfile_path(init_cwd=True))
+    try:
+        imported, skipped = merge_release_records(records, log_conf, archive_index.versions)
+    except VersionError as ex:
+        exit_with_error(console, str(ex))
+    auto_archive_sections(log_conf)
+    console.print(f"Imported {len(imported)} version sections into the changelog file.")
+    if skipped:
+        console.print(f"Skipped {len(skipped)} duplicate or invalid versions: {', '.join(skipped)}")
+    console.print()
+
+
 VersionOpt = Annotated[str, Option(
     '--version', '-v', show_default=False, help=''
     'A semantic version identifier of a section in the changelog file.'
 )]
+FromVerOpt = Annotated[str, Option(
+    '--from', '-f', show_default=False, help=''
+    'The lowest semantic version identifier of the range of sections, inclusive.'
+)]
+ToVerOpt = Annotated[str, Option(
+    '--to', '-t', show_default=False, help=''
+    'The highest semantic version identifier of the range of sections, inclusive.'
+)]
+FormatOpt = Annotated[ExportFormat, Option(
+    '--format', '-F', show_default=False, help=''
+    'The format of the exported changelog data. Default: json'
+)]
+
+
+def read_changelog_or_exit() -> Changelog:
+    try:
+        changelog = read_changelog(init_cwd=False)
+    except ConfigFileNotFound:
+        exit_with_error(console, "Project is not initialized with a devtools config file.")
+    except ChangelogFileNotFound:
+        exit_with_error(console, "Cannot view sections of a non-existent CHANGELOG.md file.")
+    if not changelog.sections:
+        exit_with_error(console, "The changelog does not contain any entries.")
+    return changelog
+
+
+def read_sections_or_exit(from_ver: str, to_ver: str) -> List[ChangelogSection]:
+    try:
+        return read_sections(from_ver, to_ver)
+    except ValueError:
+        exit_with_error(console, "The range bounds must be valid semantic version identifiers.")
 
 
 @app.command(name="view", epilog="Example: devtools log view --version 1.2.3")
-def cmd_view(version: VersionOpt = None):
+def cmd_view(version: VersionOpt = None, from_ver: FromVerOpt = None, to_ver: ToVerOpt = None):
+    """
+    Prints the latest section of the changelog file, the section of the specified
+    version or all sections within the specified inclusive range of versions.
+    Sections which have been moved into the changelog archive are included.
+    """
+    if from_ver or to_ver:
+        read_changelog_or_exit()
+        sections = read_sections_or_exit(from_ver, to_ver)
+        if is_json_mode():
+            emit_json(dict(sections=[section.model_dump() for section in sections]))
+            return
+        if not sections:
+            console.print("The changelog does not contain any sections in the specified range.")
+        for section in sections:
+            print(f"Version {section.version} changelog:")
+            for line in [*section.render(), '']:
+                print(line)
+        return
+
     try:
-        existing = read_existing_content(init_cwd=False)
-        if not existing:
-            console.print("ERROR! The changelog does not contain any entries.\n")
-            raise SystemExit()
+        found = changelog_section(version)
+    except ConfigFileNotFound:
+        exit_with_error(console, "Project is not initialized with a devtools config file.")
+    except ChangelogFileNotFound:
+        exit_with_error(console, "Cannot view sections of a non-existent CHANGELOG.md file.")
+    except SectionNotFound as ex:
+        if not version:
+            exit_with_error(console, str(ex))
+        found = None
+
+    if is_json_mode():
+        emit_json(dict(sections=[found.model_dump()] if found else []))
+        return
+
+    if found is None:
+        console.print(f"The changelog does not contain any sections for version {version}.")
+        return
+
+    ver_type = 'Version' if version else "Latest version"
+    print(f"{ver_type} {found.version} changelog:")
+    for line in [*found.render(), '']:
+        print(line)
+
+
+@app.command(name="export", epilog="Example: devtools log export --format json")
+def cmd_export(fmt: FormatOpt = ExportFormat.JSON, from_ver: FromVerOpt = None, to_ver: ToVerOpt = None):
+    """
+    Exports the parsed sections of the changelog file and its archive in a
+    machine-readable format to stdout, optionally limited to an inclusive range of versions.
+    """
+    read_changelog_or_exit()
+    sections = read_sections_or_exit(from_ver, to_ver)
+    if fmt == ExportFormat.JSON:
+        data = Changelog(sections=sections).model_dump()
+        sys.stdout.buffer.write(orjson.dumps(data) + b'\n')
+
+
+KeepOpt = Annotated[int, Option(
+    '--keep', '-k', show_default=False, help=''
+    'The number of the newest sections to keep in the changelog file.'
+)]
+
+
+@app.command(name="archive", epilog="Example: devtools log archive --keep 10")
+def cmd_archive(keep: KeepOpt):
+    """
+    Moves all sections except the newest ones from the changelog file into
+    archive files of their major versions in the CHANGELOG-archive directory.
+    """
+    if keep < 1:
+        console.print("ERROR! The changelog file must keep at least one section.\n")
+        raise SystemExit()
+    try:
+        archived = archive_sections(keep)
     except ConfigFileNotFound:
         console.print("ERROR! Project is not initialized with a devtools config file.\n")
         raise SystemExit()
     except ChangelogFileNotFound:
-        console.print("ERROR! Cannot view sections of a non-existent CHANGELOG.md file.\n")
+        console.print("ERROR! Cannot archive sections of a non-existent CHANGELOG.md file.\n")
         raise SystemExit()
+    console.print(f"Archived {len(archived)} sections of the changelog file.\n")
 
-    label = SECTION_LEVEL
-    if version:
-        label += f" [{version}]"
-
-    line: str
-    for i, line in enumerate(existing):
-        if line.startswith(label):
-            end = len(existing)
-            for j in range(i + 1, end):
-                end_1 = existing[j].startswith(f"{SECTION_LEVEL}")
-                end_2 = is_line_link_ref(existing[j])
-                if end_1 or end_2:
-                    end = j
-                    break
-
-            ver_type = 'Version' if version else "Latest version"
-            ver_ident = extract_version_from_label(line)
-            print(f"{ver_type} {ver_ident} changelog:")
-
-            for c in existing[i + 2:end]:
-                print(c)
-            return
 
-    console.print(f"The changelog does not contain any sections for version {version}.")
+TermsArg = Annotated[List[str], Argument(
+    show_default=False, help=''
+    'The terms to search for in the changelog file and its archive.'
+)]
+LimitOpt = Annotated[int, Option(
+    '--limit', '-l', show_default=False, help=''
+    'The maximum number of sections to print. Default: 10'
+)]
+
+
+@app.command(name="search", epilog="Example: devtools log search memory leak")
+def cmd_search(terms: TermsArg, limit: LimitOpt = 10):
+    """
+    Searches the changelog file and its archive for the sections which
+    contain the given terms and prints them ordered by their relevance.
+    """
+    try:
+        results = search_sections(terms, limit)
+    except ConfigFileNotFound:
+        console.print("ERROR! Project is not initialized with a devtools config file.\n")
+        raise SystemExit()
+    except ChangelogFileNotFound:
+        console.print("ERROR! Cannot search sections of a non-existent CHANGELOG.md file.\n")
+        raise SystemExit()
+
+    if not results:
+        console.print("The changelog does not contain any sections which match the search terms.")
+        return
+
+    tokens = {token for term in terms for token in tokenize(term)}
+    for section, score in results:
+        print(f"Version {section.version} ({section.date}), score {score:.2f}:")
+        for entry in section.entries:
+            if tokens.intersection(tokenize(entry)):
+                print(f"- {entry}")
+        print()
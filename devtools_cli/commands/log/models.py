@@ -9,18 +9,37 @@
 #   SPDX-License-Identifier: Apache-2.0
 #
 
+from enum import Enum
+from typing import List, Dict, Union
+from datetime import date as Date
+from pydantic import BaseModel, Field, field_validator
 from devtools_cli.models import ConfigSection
 
 __all__ = [
     "GITHUB_URL",
     "CHANGELOG_FILENAME",
+    "ARCHIVE_DIRNAME",
+    "ARCHIVE_INDEX_FILENAME",
+    "SEARCH_INDEX_FILENAME",
     "SECTION_LEVEL",
     "Header",
-    "LogConfig"
+    "ArchiveHeader",
+    "LogConfig",
+    "ReleaseRecord",
+    "ExportFormat",
+    "ChangelogSection",
+    "Changelog",
+    "ChangelogCache",
+    "ArchiveIndex",
+    "IndexedSection",
+    "SearchIndex"
 ]
 
 GITHUB_URL = "https://github.com"
 CHANGELOG_FILENAME = "CHANGELOG.md"
+ARCHIVE_DIRNAME = "CHANGELOG-archive"
+ARCHIVE_INDEX_FILENAME = "index.json"
+SEARCH_INDEX_FILENAME = ".changelog-index.json"
 SECTION_LEVEL = '###'
 
 
@@ -42,17 +61,106 @@ class Header(str):
         return super().__new__(cls, header)
 
 
+class ArchiveHeader(str):
+    __template__ = [
+        "# Changelog Archive",
+        "",
+        "Archived sections of the major version {major} of the [changelog](../CHANGELOG.md).  ",
+        "_NOTE: This changelog archive is generated and managed by [devtools-cli]"  # <--- Line continuation!
+        "(https://pypi.org/project/devtools-cli/), **do not edit manually**._",
+        ""
+    ]
+
+    def __new__(cls, major: str) -> str:
+        header = '\n'.join(cls.__template__).format(major=major)
+        return super().__new__(cls, header)
+
+
 class LogConfig(ConfigSection):
     gh_user: str
     gh_repo: str
+    archive_threshold: int = 0
+    archive_keep: int = 0
 
     @staticmethod
     def __defaults__() -> dict:
         return {
             "gh_user": "",
-            "gh_repo": ""
+            "gh_repo": "",
+            "archive_threshold": 0,
+            "archive_keep": 0
         }
 
     @property
     def section(self) -> str:
         return 'log_cmd'
+
+
+class ReleaseRecord(BaseModel):
+    version: str
+    date: str = Field(default_factory=lambda: Date.today().isoformat())
+    changes: List[str] = Field(default_factory=list)
+
+    @field_validator("version", mode="before")
+    @classmethod
+    def strip_version_prefix(cls, value: str) -> str:
+        return value.strip().removeprefix('v') if isinstance(value, str) else value
+
+    @field_validator("date", mode="before")
+    @classmethod
+    def stringify_date(cls, value: Union[str, Date]) -> str:
+        return value.isoformat() if isinstance(value, Date) else value
+
+    @field_validator("changes", mode="before")
+    @classmethod
+    def split_changes(cls, value: Union[str, List[str]]) -> List[str]:
+        return value.splitlines() if isinstance(value, str) else value
+
+
+class ExportFormat(str, Enum):
+    JSON = 'json'
+
+
+class ChangelogSection(BaseModel):
+    version: str
+    date: str = ''
+    latest: bool = False
+    entries: List[str] = Field(default_factory=list)
+    url: str = ''
+
+    def render(self) -> List[str]:
+        lines = []
+        for entry in self.entries:
+            first, *rest = entry.split('\n')
+            lines.append(f"- {first}")
+            lines.extend(f"  {line}" for line in rest)
+        return lines
+
+
+class Changelog(BaseModel):
+    sections: List[ChangelogSection] = Field(default_factory=list)
+
+
+class ChangelogCache(BaseModel):
+    path: str
+    size: int
+    mtime_ns: int
+    inode: int
+    changelog: Changelog
+
+
+class ArchiveIndex(BaseModel):
+    versions: Dict[str, str] = Field(default_factory=dict)
+
+
+class IndexedSection(BaseModel):
+    source: str
+    date: str = ''
+    length: int = 0
+    terms: List[str] = Field(default_factory=list)
+
+
+class SearchIndex(BaseModel):
+    sources: Dict[str, List[int]] = Field(default_factory=dict)
+    sections: Dict[str, IndexedSection] = Field(default_factory=dict)
+    postings: Dict[str, Dict[str, int]] = Field(default_factory=dict)
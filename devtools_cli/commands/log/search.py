@@ -0,0 +1,85 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+from pathlib import Path
+from typing import List, Dict, Tuple
+from .helpers import *
+from .archive import *
+from .models import *
+from .index import *
+
+__all__ = [
+    "sync_search_index",
+    "search_sections"
+]
+
+
+def sync_search_index() -> SearchIndex:
+    """
+    Synchronizes the search index with the changelog file and its archive files.
+    Only the files which have changed since they were last indexed are re-indexed,
+    and the index file is only rewritten if anything changed.
+
+    Returns:
+        The up-to-date search index.
+
+    Raises:
+        ConfigFileNotFound: If the project does not have a devtools config file.
+        ChangelogFileNotFound: If the project does not have a changelog file.
+    """
+    logfile = get_logfile_path(init_cwd=False)
+    index = read_search_index(logfile) or SearchIndex()
+    archive_dir = get_archive_dir(logfile)
+
+    current: Dict[str, Path] = {logfile.name: logfile}
+    for filename in set(read_archive_index(logfile).versions.values()):
+        path = archive_dir / filename
+        if path.is_file():
+            current[path.relative_to(logfile.parent).as_posix()] = path
+
+    changed = False
+    for source in list(index.sources):
+        if source not in current:
+            remove_indexed_source(index, source)
+            changed = True
+
+    for source, path in current.items():
+        identity = get_file_identity(path)
+        if index.sources.get(source) == identity:
+            continue
+        remove_indexed_source(index, source)
+        for section in read_changelog_file(path).sections:
+            add_indexed_section(index, section, source)
+        index.sources[source] = identity
+        changed = True
+
+    if changed:
+        write_search_index(logfile, index)
+    return index
+
+
+def search_sections(terms: List[str], limit: int) -> List[Tuple[ChangelogSection, float]]:
+    """
+    Searches the sections of the changelog file and its archive files for the given
+    terms and returns the best matching sections along with their relevance scores.
+    """
+    logfile = get_logfile_path(init_cwd=False)
+    index = sync_search_index()
+    tokens = [token for term in terms for token in tokenize(term)]
+
+    results = []
+    for version, score in rank_sections(index, tokens)[:limit]:
+        path = logfile.parent / index.sections[version].source
+        for section in read_changelog_file(path).sections:
+            if section.version == version:
+                results.append((section, score))
+                break
+    return results
@@ -0,0 +1,132 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import os
+from pathlib import Path
+from typer import Typer, Option
+from typing_extensions import Annotated
+from devtools_cli.models import GitHubFile
+from devtools_cli.api import bump_version, set_version
+from devtools_cli.errors import *
+from devtools_cli.output import *
+from devtools_cli.utils import *
+from devtools_cli.commands.version.helpers import resolve_project_version
+from devtools_cli.commands.version.models import VersionConfig
+from devtools_cli.commands.version.main import (
+    MajorBumpOpt,
+    MinorBumpOpt,
+    PatchBumpOpt,
+    SuffixOpt,
+    ValueOpt
+)
+from devtools_cli.commands.log.archive import read_archive_index, auto_archive_sections
+from devtools_cli.commands.log.helpers import (
+    iter_existing_content,
+    validate_unique_version,
+    write_new_section
+)
+from devtools_cli.commands.log.models import CHANGELOG_FILENAME, LogConfig
+
+app = Typer()
+console = LazyConsole(soft_wrap=True)
+
+
+ChangesOpt = Annotated[str, Option(
+    '--changes', '-c', show_default=False, help=''
+    'Changes to be added into the new version section of the changelog file.'
+)]
+GitHubOutPrefixOpt = Annotated[str, Option(
+    '--ghout-prefix', '-P', show_default=False, help=''
+    'Insert the new version and the component hashes into the GitHub Action outputs file, '
+    'named by this prefix followed by "version" or the component name.'
+)]
+
+
+@app.command(name="release", epilog="Example: devtools release --minor --changes \"changes\"")
+def cmd_release(
+        major: MajorBumpOpt = False,
+        minor: MinorBumpOpt = False,
+        patch: PatchBumpOpt = False,
+        suffix: SuffixOpt = '',
+        value: ValueOpt = None,
+        changes: ChangesOpt = '',
+        ghout_prefix: GitHubOutPrefixOpt = ''
+) -> None:
+    """
+    Cuts a release in one step: bumps the project version, inserts a new version section
+    into the changelog file, if the log config is initialized, regenerates the hashes of
+    the tracked components and writes the GitHub Action outputs. The config file
+    is read once and all file changes are rolled back if any of the steps fails.
+    """
+    if sum([major, minor, patch]) > 1:
+        exit_with_error(console, "Cannot bump multiple version numbers at the same time!")
+    if not any([major, minor, patch]):
+        patch = True
+    level = ['major', 'minor', 'patch'][[major, minor, patch].index(True)]
+
+    config_file = find_local_config_file(init_cwd=False)
+    if config_file is None:
+        exit_with_error(console, "Project is not initialized with a devtools config file.")
+    project_dir = config_file.parent
+    ver_conf, log_conf = read_config_sections(config_file, VersionConfig, LogConfig)
+
+    update_log = not log_conf.is_default
+    if changes and not update_log:
+        exit_with_error(console, "Cannot add changes to the changelog without first initializing the log config.")
+
+    try:
+        old_version = resolve_project_version(ver_conf, project_dir)
+        new_version = bump_version(old_version, level, suffix=suffix, value=value)
+    except VersionError as ex:
+        exit_with_error(console, str(ex))
+
+    logfile = project_dir / CHANGELOG_FILENAME
+    if update_log and logfile.is_file():
+        archive_index = read_archive_index(logfile)
+        is_unique = validate_unique_version(new_version, iter_existing_content(init_cwd=False))
+        if not is_unique or new_version in archive_index.versions:
+            exit_with_error(console, "Cannot insert a duplicate version section into the changelog file.")
+
+    try:
+        with file_transaction() as transaction:
+            # The changelog is written first, so that the component hashes include it.
+            if update_log:
+                if not logfile.is_file():
+                    with atomic_file_writer(logfile):
+                        pass
+                write_new_section(new_version, changes, log_conf)
+                auto_archive_sections(log_conf)
+            set_version(new_version, project_dir, ver_conf)
+            paths = transaction.paths
+    except (DevtoolsError, OSError, ValueError) as ex:
+        exit_with_error(console, f"The release was rolled back, because it failed: {ex}")
+
+    written = [Path(os.path.relpath(path, project_dir)).as_posix() for path in paths]
+    hashes = {comp.name: comp.hash for comp in ver_conf.components}
+    if ghout_prefix:
+        variables = [(f"{ghout_prefix}version", new_version)]
+        variables += [(f"{ghout_prefix}{key}", value) for key, value in hashes.items()]
+        write_github_variables(variables, GitHubFile.OUT)
+
+    if is_json_mode():
+        emit_json(dict(
+            version=new_version,
+            previous=old_version,
+            components=hashes,
+            changelog=update_log,
+            files=written
+        ))
+    else:
+        console.print(
+            f"[bold]Released version [chartreuse3]{new_version}[/] of "
+            f"[light_goldenrod3]'{project_dir.name}'[/] from [light_slate_blue]{old_version}[/].[/]"
+        )
+        console.print(f"Updated {len(written)} files: {', '.join(written)}\n")
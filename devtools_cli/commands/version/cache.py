@@ -0,0 +1,207 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import os
+import zlib
+import struct
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterator, Tuple, Union
+from devtools_cli.utils import *
+from devtools_cli.stats import *
+from .gitrepo import *
+
+__all__ = [
+    "CacheKey",
+    "DigestCache",
+    "FileIdentities",
+    "CachedDigests",
+    "get_local_digest_cache_path",
+    "open_digest_cache"
+]
+
+# The repository-relative path, the size and the git blob id of a file.
+CacheKey = Tuple[str, int, bytes]
+
+DIGEST_CACHE_SUBDIR = "digests"
+CACHE_MAGIC = b'DTDC'
+CACHE_FORMAT_VERSION = 1
+CACHE_HEADER_STRUCT = struct.Struct('<4sBI')
+CACHE_ENTRY_STRUCT = struct.Struct('<HQB')
+DIGEST_BYTES = 16
+
+
+class DigestCache:
+    """
+    This class maps the content-independent identities of files to their digests.
+    It is serialized into a compact binary format, which is a fixed header followed
+    by zlib-compressed entries of the path, the size, the blob id and the raw digest.
+    """
+    def __init__(self, entries: Dict[CacheKey, str] = None):
+        self.entries: Dict[CacheKey, str] = entries or dict()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: CacheKey) -> Union[str, None]:
+        return self.entries.get(key)
+
+    def add(self, key: CacheKey, digest: str) -> None:
+        self.entries[key] = digest
+
+    def dumps(self) -> bytes:
+        body = bytearray()
+        for (path, size, blob_id), digest in sorted(self.entries.items()):
+            raw_path = path.encode('utf-8', 'surrogateescape')
+            body += CACHE_ENTRY_STRUCT.pack(len(raw_path), size, len(blob_id))
+            body += raw_path + blob_id + bytes.fromhex(digest)
+        header = CACHE_HEADER_STRUCT.pack(CACHE_MAGIC, CACHE_FORMAT_VERSION, len(self.entries))
+        return header + zlib.compress(bytes(body))
+
+    @classmethod
+    def loads(cls, data: bytes) -> "DigestCache":
+        """
+        Raises:
+            ValueError: If the data is not a digest cache of a supported format version.
+        """
+        try:
+            magic, version, count = CACHE_HEADER_STRUCT.unpack_from(data, 0)
+            if magic != CACHE_MAGIC or version != CACHE_FORMAT_VERSION:
+                raise ValueError()
+            body = zlib.decompress(data[CACHE_HEADER_STRUCT.size:])
+            entries, pos = dict(), 0
+            for _ in range(count):
+                path_len, size, id_len = CACHE_ENTRY_STRUCT.unpack_from(body, pos)
+                pos += CACHE_ENTRY_STRUCT.size
+                path = body[pos:pos + path_len].decode('utf-8', 'surrogateescape')
+                pos += path_len
+                blob_id = body[pos:pos + id_len]
+                pos += id_len
+                digest = body[pos:pos + DIGEST_BYTES].hex()
+                pos += DIGEST_BYTES
+                if len(digest) != DIGEST_BYTES * 2:
+                    raise ValueError()
+                entries[(path, size, blob_id)] = digest
+        except (struct.error, zlib.error, ValueError):
+            raise ValueError("The file is not a valid devtools digest cache.") from None
+        return cls(entries)
+
+    @classmethod
+    def read(cls, path: Path) -> "DigestCache":
+        data = path.read_bytes()
+        io_counters.files_read += 1
+        return cls.loads(data)
+
+    def write(self, path: Path) -> None:
+        with atomic_file_writer(path, 'wb') as file:
+            file.write(self.dumps())
+
+
+class FileIdentities:
+    """
+    This class identifies files by their paths relative to the git working tree, their
+    sizes and their git blob ids, without reading their contents. The blob id of a file
+    is taken from the git index only if the size and the modification time of the file
+    still match its index entry, and the entry is not racily clean, i.e. the file was
+    not modified in the same instant as the index was written.
+    """
+    def __init__(self, root: Path, index: Dict[str, IndexEntry], index_mtime_ns: int):
+        self.root = root
+        self.index = index
+        self.index_mtime_ns = index_mtime_ns
+
+    @classmethod
+    def from_directory(cls, start: Path) -> Union["FileIdentities", None]:
+        root, git_dir = find_git_root(start), find_git_dir(start)
+        if root is None or git_dir is None or is_sha256_repository(git_dir):
+            return None
+        index_path = git_dir / 'index'
+        try:
+            index_mtime_ns = index_path.stat().st_mtime_ns
+        except OSError:
+            return None
+        return cls(root, read_git_index(index_path), index_mtime_ns)
+
+    def relative_path(self, filepath: Path) -> str:
+        return Path(os.path.relpath(filepath, self.root)).as_posix()
+
+    def identify(self, filepath: Path) -> Union[CacheKey, None]:
+        rel_path = self.relative_path(filepath)
+        entry = self.index.get(rel_path)
+        if entry is None:
+            return None
+        mtime_ns, size, blob_id = entry
+        if mtime_ns >= self.index_mtime_ns:
+            return None
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        io_counters.files_stat += 1
+        if stat.st_mtime_ns != mtime_ns or stat.st_size & 0xffffffff != size:
+            return None
+        return rel_path, stat.st_size, blob_id
+
+    def iter_identities(self, filepaths: Iterator[Path]) -> Iterator[Tuple[Path, CacheKey]]:
+        for filepath in filepaths:
+            key = self.identify(filepath)
+            if key is not None:
+                yield filepath, key
+
+
+class CachedDigests:
+    """
+    Looks up the digests of files from a digest cache by their identities.
+    """
+    def __init__(self, cache: DigestCache, identities: FileIdentities):
+        self.cache = cache
+        self.identities = identities
+
+    def lookup(self, filepath: Path) -> Union[str, None]:
+        key = self.identities.identify(filepath)
+        return None if key is None else self.cache.get(key)
+
+
+def is_sha256_repository(git_dir: Path) -> bool:
+    try:
+        config = (git_dir / 'config').read_text()
+    except OSError:
+        return False
+    return 'objectformat = sha256' in config.lower().replace('\t', ' ')
+
+
+def get_local_digest_cache_path(git_root: Path, create: bool = True) -> Path:
+    key = hashlib.blake2b(str(git_root.resolve()).encode('utf-8'), digest_size=16)
+    return get_data_storage_path(DIGEST_CACHE_SUBDIR, create=create) / f"{key.hexdigest()}.bin"
+
+
+def open_digest_cache(start: Path) -> Union[CachedDigests, None]:
+    """
+    Opens the local digest cache of the git repository which contains the start directory.
+    The git index is only read if a digest cache has been imported for the repository.
+
+    Returns:
+        The cached digests, or None if there is no usable digest cache.
+    """
+    git_root = find_git_root(start)
+    if git_root is None:
+        return None
+    path = get_local_digest_cache_path(git_root, create=False)
+    if not path.is_file():
+        return None
+    try:
+        cache = DigestCache.read(path)
+    except (OSError, ValueError):
+        return None
+    identities = FileIdentities.from_directory(git_root)
+    if identities is None or not cache:
+        return None
+    return CachedDigests(cache, identities)
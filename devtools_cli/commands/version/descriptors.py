@@ -9,60 +9,253 @@
 #   SPDX-License-Identifier: Apache-2.0
 #
 
-import orjson
+import re
 from pathlib import Path
-from typing import Literal
+from typing import Callable, Dict, List, Literal, Union
+from devtools_cli.utils import atomic_file_writer
 
 __all__ = [
+    "DescriptorEditor",
+    "stream_version",
     "rw_pyproject_toml_version",
     "rw_package_json_version",
-    "SupportedDescriptors"
+    "rw_cargo_toml_version",
+    "rw_pom_xml_version",
+    "rw_setup_cfg_version",
+    "rw_chart_yaml_version",
+    "rw_version_txt_version",
+    "register_descriptor",
+    "SupportedDescriptors",
+    "PrimaryDescriptors"
 ]
 
 Operation = Literal['read', 'write']
+DescriptorEditor = Callable[..., str]
+ValueMatcher = Callable[[str], Union[re.Match, None]]
 
+TOML_VERSION_RE = re.compile(r'''^\s*version\s*=\s*(?P<q>["'])(?P<value>[^"'\n]*)(?P=q)''')
+JSON_VERSION_RE = re.compile(r'"version"\s*:\s*"(?P<value>[^"\\\n]*)"')
+XML_TAG_RE = re.compile(r'<(/?)([\w.:-]+)')
+XML_VERSION_RE = re.compile(r'<version>\s*(?P<value>[^<\s]+)\s*</version>')
+CFG_VERSION_RE = re.compile(r'^\s*version\s*[=:]\s*(?!attr:|file:)(?P<value>[^\s#;]+)')
+CHART_VERSION_RE = re.compile(r'''^version:[ \t]*(?P<q>["']?)(?P<value>[^"'\s#]+)(?P=q)''')
+YAML_VERSION_RE = re.compile(r'''^(?:version|appVersion):[ \t]*(?P<q>["']?)(?P<value>[^"'\s#]+)(?P=q)''')
+TXT_VERSION_RE = re.compile(r'^\s*(?P<value>\S+)')
 
-def rw_pyproject_toml_version(op: Operation, filepath: Path, new_version: str = '0.0.0') -> str:
-    with open(filepath, 'r') as f:
-        lines = f.readlines()
-    searching_for_version = False
-    for index, line in enumerate(lines):
-        line = line.strip()
-        if line in ['[tool.poetry]', '[project]']:
-            searching_for_version = True
-            continue
-        if searching_for_version and line.startswith('['):
-            break
-        if searching_for_version and line.startswith('version'):
+
+def stream_version(op: Operation, filepath: Path, new_version: str, matcher: ValueMatcher) -> str:
+    """
+    Reads or writes the version value of a descriptor file line by line, so that
+    only the value itself is replaced and the formatting, comments and line endings
+    of the file are preserved. Reading stops at the first match. Writing replaces the
+    values of all matching lines and leaves the file untouched if nothing matched.
+
+    Args:
+        op: Whether to read or write the version value.
+        filepath: The path of the descriptor file.
+        new_version: The version to write, or the default to return if reading finds nothing.
+        matcher: A stateful predicate, which is called for every line in order and returns
+            a match of the line whose 'value' group spans the version value.
+
+    Returns:
+        The version value that was read, or the new version.
+    """
+    with open(filepath, 'rb') as src:
+        prefix: List[bytes] = list()
+        for raw in src:
+            line = raw.decode('utf-8', 'surrogateescape')
+            match = matcher(line)
+            if match is None:
+                prefix.append(raw)
+                continue
             if op == 'read':
-                keyval: list = line.split('=')
-                if len(keyval) == 2:
-                    return keyval[-1].strip().strip('"').strip("'")
-                return new_version
-            elif op == 'write':
-                lines[index] = f'version = "{new_version}"\n'
-                with open(filepath, 'w') as f:
-                    f.writelines(lines)
-                    break
+                return match.group('value')
+            if match.group('value') == new_version:
+                prefix.append(raw)
+                continue
+            with atomic_file_writer(filepath, 'wb') as dst:
+                dst.writelines(prefix)
+                dst.write(replace_value(line, match, new_version))
+                for raw_rest in src:
+                    line = raw_rest.decode('utf-8', 'surrogateescape')
+                    match = matcher(line)
+                    dst.write(raw_rest if match is None else replace_value(line, match, new_version))
+            break
     return new_version
 
 
+def replace_value(line: str, match: re.Match, new_version: str) -> bytes:
+    line = line[:match.start('value')] + new_version + line[match.end('value'):]
+    return line.encode('utf-8', 'surrogateescape')
+
+
+def toml_section_matcher(*sections: str) -> ValueMatcher:
+    active = False
+
+    def match(line: str) -> Union[re.Match, None]:
+        nonlocal active
+        stripped = line.strip()
+        if stripped.startswith('['):
+            active = stripped.split('#')[0].strip() in sections
+            return None
+        return TOML_VERSION_RE.match(line) if active else None
+
+    return match
+
+
+def json_matcher() -> ValueMatcher:
+    depth, found = 0, False
+
+    def match(line: str) -> Union[re.Match, None]:
+        nonlocal depth, found
+        index, length = 0, len(line)
+        while index < length and not found:
+            char = line[index]
+            if char in '{[':
+                depth += 1
+            elif char in '}]':
+                depth -= 1
+            elif char == '"':
+                if depth == 1:
+                    result = JSON_VERSION_RE.match(line, index)
+                    if result:
+                        found = True
+                        return result
+                index += 1
+                while index < length and line[index] != '"':
+                    index += 2 if line[index] == '\\' else 1
+            index += 1
+        return None
+
+    return match
+
+
+def pom_matcher() -> ValueMatcher:
+    stack: List[str] = list()
+    in_comment, found = False, False
+
+    def mask_comments(line: str) -> str:
+        nonlocal in_comment
+        parts, index = [], 0
+        while index < len(line):
+            if in_comment:
+                end = line.find('-->', index)
+                if end < 0:
+                    parts.append(' ' * (len(line) - index))
+                    break
+                parts.append(' ' * (end + 3 - index))
+                in_comment, index = False, end + 3
+            else:
+                start = line.find('<!--', index)
+                if start < 0:
+                    parts.append(line[index:])
+                    break
+                parts.append(line[index:start])
+                in_comment, index = True, start
+        return ''.join(parts)
+
+    def match(line: str) -> Union[re.Match, None]:
+        nonlocal found
+        if found:
+            return None
+        line = mask_comments(line)
+        for tag in XML_TAG_RE.finditer(line):
+            closing, name = tag.groups()
+            if closing:
+                if stack:
+                    stack.pop()
+                continue
+            if name == 'version' and stack == ['project']:
+                found = True
+                return XML_VERSION_RE.match(line, tag.start())
+            end = line.find('>', tag.end())
+            if end < 0 or line[end - 1] != '/':
+                stack.append(name)
+        return None
+
+    return match
+
+
+def section_matcher(section: str, pattern: re.Pattern) -> ValueMatcher:
+    active = False
+
+    def match(line: str) -> Union[re.Match, None]:
+        nonlocal active
+        stripped = line.strip()
+        if stripped.startswith('['):
+            active = stripped == section
+            return None
+        return pattern.match(line) if active else None
+
+    return match
+
+
+def first_line_matcher(pattern: re.Pattern) -> ValueMatcher:
+    found = False
+
+    def match(line: str) -> Union[re.Match, None]:
+        nonlocal found
+        if found or not line.strip():
+            return None
+        found = True
+        return pattern.match(line)
+
+    return match
+
+
+def rw_pyproject_toml_version(op: Operation, filepath: Path, new_version: str = '0.0.0') -> str:
+    matcher = toml_section_matcher('[project]', '[tool.poetry]')
+    return stream_version(op, filepath, new_version, matcher)
+
+
 def rw_package_json_version(op: Operation, filepath: Path, new_version: str = '0.0.0') -> str:
-    with open(filepath, 'rb') as f:
-        text = f.read() or b'{}'
-    data = orjson.loads(text)
-    if isinstance(data, dict):
-        if op == 'read':
-            return data.get('version', new_version)
-        elif op == 'write':
-            data['version'] = new_version
-            with open(filepath, 'wb') as f:
-                text = orjson.dumps(data, option=orjson.OPT_INDENT_2)
-                f.write(text)
-    return new_version
+    return stream_version(op, filepath, new_version, json_matcher())
+
 
+def rw_cargo_toml_version(op: Operation, filepath: Path, new_version: str = '0.0.0') -> str:
+    matcher = toml_section_matcher('[package]', '[workspace.package]')
+    return stream_version(op, filepath, new_version, matcher)
 
-SupportedDescriptors = {
+
+def rw_pom_xml_version(op: Operation, filepath: Path, new_version: str = '0.0.0') -> str:
+    return stream_version(op, filepath, new_version, pom_matcher())
+
+
+def rw_setup_cfg_version(op: Operation, filepath: Path, new_version: str = '0.0.0') -> str:
+    matcher = section_matcher('[metadata]', CFG_VERSION_RE)
+    return stream_version(op, filepath, new_version, matcher)
+
+
+def rw_chart_yaml_version(op: Operation, filepath: Path, new_version: str = '0.0.0') -> str:
+    pattern = CHART_VERSION_RE if op == 'read' else YAML_VERSION_RE
+    return stream_version(op, filepath, new_version, pattern.match)
+
+
+def rw_version_txt_version(op: Operation, filepath: Path, new_version: str = '0.0.0') -> str:
+    return stream_version(op, filepath, new_version, first_line_matcher(TXT_VERSION_RE))
+
+
+# Go modules are versioned by their git tags, so go.mod files have no version to edit.
+SupportedDescriptors: Dict[str, DescriptorEditor] = {
     'pyproject.toml': rw_pyproject_toml_version,
-    'package.json': rw_package_json_version
+    'package.json': rw_package_json_version,
+    'Cargo.toml': rw_cargo_toml_version,
+    'pom.xml': rw_pom_xml_version,
+    'setup.cfg': rw_setup_cfg_version,
+    'Chart.yaml': rw_chart_yaml_version,
+    'version.txt': rw_version_txt_version,
+    'VERSION': rw_version_txt_version
 }
+
+# The descriptors which define the version of a single-package project, in the order
+# of precedence. The other descriptors are only updated by the monorepo-wide bump.
+PrimaryDescriptors: List[str] = ['pyproject.toml', 'package.json', 'Cargo.toml']
+
+
+def register_descriptor(filename: str, editor: DescriptorEditor) -> None:
+    """
+    Registers an editor for the descriptor files of the given name, or replaces
+    the editor of a supported descriptor. The editor is called as
+    `editor(op, filepath, new_version)` like the built-in editors.
+    """
+    SupportedDescriptors[filename] = editor
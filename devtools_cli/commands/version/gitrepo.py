@@ -0,0 +1,216 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import os
+import struct
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+from devtools_cli.errors import GitCommandError
+from devtools_cli.stats import *
+
+__all__ = [
+    "IndexEntry",
+    "find_git_root",
+    "find_git_dir",
+    "read_git_tags",
+    "read_git_index",
+    "run_git_paths",
+    "list_changed_files"
+]
+
+# The modification time in nanoseconds, the size truncated to 32 bits and the blob id.
+IndexEntry = Tuple[int, int, bytes]
+
+INDEX_SIGNATURE = b'DIRC'
+INDEX_ENTRY_STRUCT = struct.Struct('>10I20sH')
+REGULAR_FILE_TYPE = 0o100000
+FILE_TYPE_MASK = 0o170000
+
+
+def find_git_root(start: Path) -> Union[Path, None]:
+    """
+    Finds the root directory of the git working tree which contains the start directory.
+    """
+    current = start.absolute()
+    for directory in [current, *current.parents]:
+        if (directory / '.git').exists():
+            return directory
+    return None
+
+
+def find_git_dir(start: Path) -> Union[Path, None]:
+    """
+    Finds the git directory of the repository which contains the start directory.
+    Supports the '.git' files of worktrees and submodules, which point to the git directory.
+    """
+    root = find_git_root(start)
+    if root is None:
+        return None
+    dot_git = root / '.git'
+    if dot_git.is_dir():
+        return dot_git
+    text = dot_git.read_text().strip()
+    if text.startswith('gitdir:'):
+        return (root / text[7:].strip()).resolve()
+    return None
+
+
+def read_git_tags(git_dir: Path) -> List[str]:
+    """
+    Reads the names of the tags of a git repository directly from the 'packed-refs'
+    file and the loose refs under 'refs/tags', without spawning a git process.
+    Worktrees share the tags of the common git directory.
+
+    Returns:
+        The unique tag names in an unspecified order.
+    """
+    common = git_dir / 'commondir'
+    if common.is_file():
+        git_dir = (git_dir / common.read_text().strip()).resolve()
+
+    tags = set()
+    prefix = 'refs/tags/'
+    try:
+        with open(git_dir / 'packed-refs', 'r') as file:
+            for line in file:
+                if line.startswith(('#', '^')):
+                    continue
+                parts = line.split()
+                if len(parts) == 2 and parts[1].startswith(prefix):
+                    tags.add(parts[1][len(prefix):])
+        io_counters.files_read += 1
+    except OSError:
+        pass
+
+    tags_dir = git_dir / 'refs' / 'tags'
+    for dirpath, _, filenames in os.walk(tags_dir):
+        rel_dir = Path(dirpath).relative_to(tags_dir).as_posix()
+        for name in filenames:
+            tags.add(name if rel_dir == '.' else f"{rel_dir}/{name}")
+    return list(tags)
+
+
+def read_offset_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    byte = data[pos]
+    value = byte & 0x7f
+    pos += 1
+    while byte & 0x80:
+        byte = data[pos]
+        value = ((value + 1) << 7) | (byte & 0x7f)
+        pos += 1
+    return value, pos
+
+
+def read_git_index(index_path: Path) -> Dict[str, IndexEntry]:
+    """
+    Reads the entries of the regular files at stage zero from a git index file of
+    version 2, 3 or 4 with SHA-1 object ids, without spawning a git process.
+
+    Returns:
+        A dictionary of the repository-relative paths and their index entries,
+        which is empty if the index file does not exist or cannot be parsed.
+    """
+    try:
+        data = index_path.read_bytes()
+        io_counters.files_read += 1
+    except OSError:
+        return dict()
+    if len(data) < 12 or data[:4] != INDEX_SIGNATURE:
+        return dict()
+    version, count = struct.unpack_from('>II', data, 4)
+    if version not in (2, 3, 4):
+        return dict()
+
+    entries: Dict[str, IndexEntry] = dict()
+    pos, prev_name = 12, b''
+    try:
+        for _ in range(count):
+            start = pos
+            fields = INDEX_ENTRY_STRUCT.unpack_from(data, pos)
+            _, _, mtime_s, mtime_ns, _, _, mode, _, _, size, blob_id, flags = fields
+            pos += INDEX_ENTRY_STRUCT.size
+            if version >= 3 and flags & 0x4000:
+                pos += 2
+            if version == 4:
+                strip, pos = read_offset_varint(data, pos)
+                end = data.index(b'\0', pos)
+                name = prev_name[:len(prev_name) - strip] + data[pos:end]
+                pos = end + 1
+            else:
+                end = data.index(b'\0', pos)
+                name = data[pos:end]
+                pos = start + ((end - start + 8) & ~7)
+            prev_name = name
+            stage = (flags >> 12) & 0x3
+            if stage == 0 and mode & FILE_TYPE_MASK == REGULAR_FILE_TYPE:
+                path = name.decode('utf-8', 'surrogateescape')
+                entries[path] = (mtime_s * 1_000_000_000 + mtime_ns, size, blob_id)
+    except (struct.error, ValueError, IndexError):
+        return dict()
+    return entries
+
+
+def run_git_paths(args: List[str], cwd: Path) -> List[str]:
+    """
+    Runs a git command which writes NUL-separated paths to stdout and returns the paths.
+
+    Raises:
+        GitCommandError: If git is not installed or the command fails.
+    """
+    try:
+        result = subprocess.run(["git", *args], cwd=cwd, capture_output=True, check=True)
+    except FileNotFoundError:
+        raise GitCommandError("Git is not installed or not on the PATH.")
+    except subprocess.CalledProcessError as ex:
+        message = ex.stderr.decode(errors='replace').strip()
+        raise GitCommandError(message or f"The git command failed: git {' '.join(args)}")
+    return [path for path in os.fsdecode(result.stdout).split('\0') if path]
+
+
+def list_changed_files(start: Path, since: str = None, staged: bool = False) -> List[Path]:
+    """
+    Lists the added, copied, modified and renamed files of the git repository which
+    contains the start directory. Deleted files are never listed. By default, the files
+    which differ between HEAD and the working tree and the untracked files which are not
+    ignored are listed. The revision to compare against can be changed with `since`.
+    If `staged` is True, only the staged changes are listed, which are the files that a
+    pre-commit hook would see, and the untracked files are not listed.
+
+    Args:
+        start: A directory in the git working tree.
+        since: The revision to compare against, HEAD by default.
+        staged: If only the staged changes should be listed.
+
+    Returns:
+        The absolute paths of the changed files in the order of git's output.
+
+    Raises:
+        GitCommandError: If the start directory is not in a git working tree,
+            git is not installed or the revision is not valid.
+    """
+    root = find_git_root(start)
+    if root is None:
+        raise GitCommandError(f"Not a git working tree: '{start}'")
+
+    diff = ["diff", "--name-only", "-z", "--diff-filter=ACMR"]
+    if staged:
+        diff.append("--cached")
+    if since or not staged:
+        diff.append(since or "HEAD")
+    paths = run_git_paths([*diff, "--"], root)
+
+    if not staged:
+        paths.extend(run_git_paths([
+            "ls-files", "-z", "--full-name", "--others", "--exclude-standard"
+        ], root))
+
+    return [root / path for path in dict.fromkeys(paths)]
@@ -9,27 +9,54 @@
 #   SPDX-License-Identifier: Apache-2.0
 #
 
+import os
 import yaml
 import hashlib
 from pathlib import Path
+from functools import lru_cache
+from semver import Version
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+from devtools_cli.concurrency import adaptive_map
+from devtools_cli.errors import VersionError
+from devtools_cli.traversal import walk_tree
+from devtools_cli.tracing import *
+from devtools_cli.stats import *
 from devtools_cli.utils import *
 from .descriptors import *
+from .gitrepo import *
+from .cache import *
+from .models import *
 
 __all__ = [
     "validate_version",
     "validate_digest",
     "is_in_ignored_path",
     "digest_file",
+    "iter_directory_files",
+    "iter_legacy_directory_files",
+    "fold_digests",
     "digest_directory",
+    "digest_component",
+    "digest_components",
+    "stored_and_current_digests",
+    "parse_tag_version",
+    "compare_versions",
     "count_descriptors",
+    "read_descriptor_versions",
     "read_descriptor_file_version",
+    "resolve_project_version",
     "write_descriptor_file_version",
+    "discover_descriptors",
+    "update_descriptor_version",
     "read_chart_and_app_version",
     "write_chart_and_app_version"
 ]
 
 DIGEST_LENGTH = 32
 
+# Directories which only contain build outputs or copies of the descriptor files.
+DESCRIPTOR_PRUNED_DIRNAMES = frozenset({"node_modules", "__pycache__", "target", "venv"})
+
 
 def validate_version(value: str) -> None:
     parts = value.split('.')
@@ -43,10 +70,14 @@ def validate_digest(value: str) -> None:
         raise ValueError(f"Invalid devtools version hash digest: {value}")
 
 
+def is_ignored_name(name: str) -> bool:
+    return name.startswith('.') or name.startswith('_')
+
+
 def is_in_ignored_path(filepath: Path, target: Path, ignored_paths: set) -> bool:
     rel_path = filepath.relative_to(target)
     for part in rel_path.parts:
-        if part.startswith('.') or part.startswith('_'):
+        if is_ignored_name(part):
             return True
     for ignored_path in ignored_paths:
         if filepath.resolve().is_relative_to(ignored_path.resolve()):
@@ -56,14 +87,40 @@ def is_in_ignored_path(filepath: Path, target: Path, ignored_paths: set) -> bool
 
 def digest_file(filepath: Path) -> str:
     blake_hash = hashlib.blake2b()
-    with filepath.open('rb') as f:
-        for byte_block in iter(lambda: f.read(4096), b''):
-            blake_hash.update(byte_block)
+    with trace_span("version.digest_file") as span:
+        with filepath.open('rb') as f:
+            for byte_block in iter(lambda: f.read(4096), b''):
+                blake_hash.update(byte_block)
+            span.add(bytes_read=f.tell(), files=1)
+    io_counters.files_read += 1
     return blake_hash.hexdigest()[:DIGEST_LENGTH]
 
 
-def digest_directory(target: Path, ignore_paths: list) -> str:
-    blake_hash = hashlib.blake2b()
+def iter_directory_files(target: Path, ignore_paths: list) -> Iterator[Path]:
+    """
+    Yields the files of the target directory which are hashed into its digest,
+    in the order in which their digests are folded into the directory digest,
+    which is the order of their relative paths on every Python version.
+    """
+    ignores = {
+        (target / path).resolve()
+        for path in ignore_paths
+    }
+    # The hidden and private directories are ignored as a whole, so they are not walked.
+    files = list()
+    for filepath, is_file in walk_tree(target, prune=is_ignored_name):
+        # The file-ness is taken from the directory entries, so it is not counted as a stat.
+        if is_file and not is_in_ignored_path(filepath, target, ignores):
+            files.append(filepath)
+    yield from sorted(files, key=lambda path: path.parts)
+
+
+def iter_legacy_directory_files(target: Path, ignore_paths: list) -> Iterator[Path]:
+    """
+    Yields the files of the target directory in the order of the legacy digest format,
+    which is the order of `target.rglob('*')` on the running interpreter. Only used to
+    verify the legacy digests of the components until their digests are updated.
+    """
     ignores = {
         (target / path).resolve()
         for path in ignore_paths
@@ -71,41 +128,313 @@ def digest_directory(target: Path, ignore_paths: list) -> str:
     for filepath in target.rglob('*'):
         if is_in_ignored_path(filepath, target, ignores):
             continue
-        elif filepath.is_file():
-            file_hash = digest_file(filepath)
-            blake_hash.update(file_hash.encode('utf-8'))
+        io_counters.files_stat += 1
+        if filepath.is_file():
+            yield filepath
 
+
+def fold_digests(file_hashes: Iterable[str]) -> str:
+    blake_hash = hashlib.blake2b()
+    for file_hash in file_hashes:
+        blake_hash.update(file_hash.encode('utf-8'))
     return blake_hash.hexdigest()[:DIGEST_LENGTH]
 
 
-def count_descriptors() -> int:
-    config_file = find_local_config_file(init_cwd=True)
+def fingerprint_file(rel_path: str, stat: os.stat_result) -> str:
+    data = f"{rel_path}\0{stat.st_size}\0{stat.st_mtime_ns}".encode('utf-8', 'surrogateescape')
+    return hashlib.blake2b(data).hexdigest()[:DIGEST_LENGTH]
+
+
+def digest_file_by_mode(
+        filepath: Path,
+        rel_path: str,
+        mode: DigestMode = DigestMode.CONTENT,
+        threshold: int = HYBRID_SIZE_THRESHOLD
+) -> str:
+    """
+    Computes the digest of a file of a component in the digest mode of the component.
+    The content mode hashes the contents of the file, the metadata mode fingerprints
+    its relative path, size and modification time from a single stat call, and the
+    hybrid mode hashes the contents of the files smaller than the threshold and
+    fingerprints the larger ones.
+    """
+    if mode == DigestMode.CONTENT:
+        return digest_file(filepath)
+    stat = filepath.stat()
+    io_counters.files_stat += 1
+    if mode == DigestMode.HYBRID and stat.st_size < threshold:
+        return digest_file(filepath)
+    return fingerprint_file(rel_path, stat)
+
+
+def digest_directory(
+        target: Path,
+        ignore_paths: list,
+        mode: DigestMode = DigestMode.CONTENT,
+        threshold: int = HYBRID_SIZE_THRESHOLD,
+        digest_format: int = DIGEST_FORMAT
+) -> str:
+    def digest(filepath: Path) -> str:
+        rel_path = filepath.relative_to(target).as_posix()
+        return digest_file_by_mode(filepath, rel_path, mode, threshold)
+
+    with trace_span("version.digest_directory", target=str(target)) as span:
+        def counted(file_hashes: Iterable[str]) -> Iterator[str]:
+            for file_hash in file_hashes:
+                span.add(files=1)
+                yield file_hash
+
+        if digest_format == LEGACY_DIGEST_FORMAT:
+            files = iter_legacy_directory_files(target, ignore_paths)
+        else:
+            files = iter_directory_files(target, ignore_paths)
+        return fold_digests(counted(adaptive_map(digest, files)))
+
+
+def digest_component(root: Path, comp: TrackedComponent, digest_format: int = DIGEST_FORMAT) -> str:
+    track_path = root / comp.target
+    if track_path.is_file():
+        return digest_file_by_mode(track_path, track_path.name, comp.mode, comp.threshold)
+    return digest_directory(track_path, comp.ignore, comp.mode, comp.threshold, digest_format)
+
+
+def digest_components(
+        root: Path,
+        components: List[TrackedComponent],
+        digest_formats: List[int] = None
+) -> List[str]:
+    """
+    Computes the hash digests of the components in one planned pass, in which every
+    file is read and hashed exactly once, even if it belongs to several overlapping
+    components. The targets are walked in turn and the files seen for the first time
+    are streamed into one pool of hashing threads. The file digests are then folded
+    into the digest of each component in the order of its own walk, so the results
+    are identical to those of `digest_component`. The metadata fingerprints depend
+    on the target of the component, so they are computed for each component. If a
+    digest cache has been imported for the repository, the content digests of the
+    files which are clean in the git index are taken from the cache.
+
+    Args:
+        root: The directory against which the targets of the components are resolved.
+        components: The components to digest.
+        digest_formats: The digest formats of the components, the current one by default.
+
+    Returns:
+        The digests in the order of the components.
+    """
+    digest_formats = digest_formats or [DIGEST_FORMAT] * len(components)
+    keys: List[tuple] = list()
+    targets: Dict[tuple, TrackedComponent] = dict()
+    for comp, digest_format in zip(components, digest_formats):
+        threshold = comp.threshold if comp.mode == DigestMode.HYBRID else 0
+        track_path = os.path.abspath(root / comp.target)
+        key = (track_path, tuple(sorted(comp.ignore)), comp.mode, threshold, digest_format)
+        keys.append(key)
+        targets.setdefault(key, comp)
+
+    plans: Dict[tuple, List[tuple]] = dict()
+    file_targets, seen = set(), set()
+
+    def iter_unique_work() -> Iterator[tuple]:
+        for key, comp in targets.items():
+            track_path, _, mode, threshold, digest_format = key
+            if os.path.isfile(track_path):
+                file_targets.add(key)
+                files = [(track_path, Path(track_path).name)]
+            else:
+                if digest_format == LEGACY_DIGEST_FORMAT:
+                    paths = iter_legacy_directory_files(Path(track_path), comp.ignore)
+                else:
+                    paths = iter_directory_files(Path(track_path), comp.ignore)
+                files = [
+                    (os.path.abspath(p), p.relative_to(track_path).as_posix())
+                    for p in paths
+                ]
+            # The content digests do not depend on the component, so they are shared.
+            work = [
+                (path, '' if mode == DigestMode.CONTENT else rel_path, mode, threshold)
+                for path, rel_path in files
+            ]
+            plans[key] = work
+            for item in work:
+                if item not in seen:
+                    seen.add(item)
+                    yield item
+
+    cache = open_digest_cache(root)
+
+    def digest(item: tuple) -> tuple:
+        path, rel_path, mode, threshold = item
+        if cache is not None and mode == DigestMode.CONTENT:
+            cached = cache.lookup(Path(path))
+            if cached is not None:
+                return item, cached
+        return item, digest_file_by_mode(Path(path), rel_path, mode, threshold)
+
+    with trace_span("version.digest_components", components=len(components)) as span:
+        file_hashes = dict(adaptive_map(digest, iter_unique_work()))
+        span.add(files=len(file_hashes))
+
+    results = list()
+    for key in keys:
+        work = plans[key]
+        if key in file_targets:
+            results.append(file_hashes[work[0]])
+        else:
+            results.append(fold_digests(file_hashes[item] for item in work))
+    return results
+
+
+def stored_and_current_digests(root: Path, components: List[TrackedComponent]) -> List[Tuple[str, str]]:
+    """
+    Computes the digest of each component in its stored digest format, which is to be
+    compared with its stored hash, and in the current digest format, which is to be
+    stored. The components with legacy digests are digested in both formats in the
+    same planned pass, so that their files are still read and hashed only once.
+
+    Returns:
+        Tuples of the stored format and the current format digests in the order of the components.
+    """
+    legacy = [comp for comp in components if comp.digest_format == LEGACY_DIGEST_FORMAT]
+    digests = digest_components(
+        root, [*components, *legacy],
+        [DIGEST_FORMAT] * len(components) + [LEGACY_DIGEST_FORMAT] * len(legacy)
+    )
+    current, legacy_digests = digests[:len(components)], iter(digests[len(components):])
+    return [
+        (next(legacy_digests) if comp.digest_format == LEGACY_DIGEST_FORMAT else digest, digest)
+        for comp, digest in zip(components, current)
+    ]
+
+
+@lru_cache(maxsize=4096)
+def parse_tag_version(tag: str) -> Union[Version, None]:
+    """
+    Parses a semantic version identifier, optionally prefixed with 'v', as it is common
+    in git tags. The parsed versions are cached, because the batch commands parse the
+    same identifiers many times.
+
+    Returns:
+        The parsed version, or None if the identifier is not a valid semantic version.
+    """
+    text = tag[1:] if tag[:1] in ('v', 'V') else tag
+    try:
+        return Version.parse(text)
+    except (ValueError, TypeError):
+        return None
+
+
+def compare_versions(base: Version, head: Version) -> str:
+    if head < base:
+        return "lt"
+    elif head > base:
+        return "gt"
+    return "eq"
+
+
+def get_project_dir(root: Path = None) -> Path:
+    return root or find_local_config_file(init_cwd=True).parent
+
+
+def count_descriptors(root: Path = None) -> int:
+    project_dir = get_project_dir(root)
     return sum([
-        1 for file in config_file.parent.glob('*.*')
-        if file.name in SupportedDescriptors
+        1 for file in PrimaryDescriptors
+        if (project_dir / file).is_file()
     ])
 
 
-def read_descriptor_file_version() -> str:
-    config_file = find_local_config_file(init_cwd=True)
-    for file, func in SupportedDescriptors.items():
-        path = config_file.parent / file
-        if path.exists() and path.is_file():
-            return func('read', path)
-    return '0.0.0'
+def read_descriptor_versions(root: Path = None) -> Dict[str, str]:
+    """
+    Reads the version numbers of the primary descriptor files in the project directory.
+    The descriptor files which do not define a version number are omitted.
+
+    Returns:
+        A dictionary of the descriptor file names and their version numbers
+        in the order of precedence.
+    """
+    project_dir = get_project_dir(root)
+    versions: Dict[str, str] = dict()
+    for file in PrimaryDescriptors:
+        func = SupportedDescriptors[file]
+        path = project_dir / file
+        io_counters.files_stat += 1
+        if path.is_file():
+            io_counters.files_read += 1
+            version = func('read', path, '')
+            if version:
+                versions[file] = version
+    return versions
+
+
+def read_descriptor_file_version(root: Path = None) -> str:
+    versions = read_descriptor_versions(root)
+    return next(iter(versions.values()), '0.0.0')
+
+
+def resolve_project_version(config: VersionConfig, root: Path = None) -> str:
+    """
+    Returns the greater of the version numbers in the version config and the
+    primary descriptor file of the project directory.
+
+    Raises:
+        VersionError: If the version numbers are invalid.
+    """
+    try:
+        desc_ver = Version.parse(read_descriptor_file_version(root))
+        conf_ver = Version.parse(config.app_version)
+    except ValueError as ex:
+        raise VersionError(str(ex)) from ex
+    return str(desc_ver if desc_ver > conf_ver else conf_ver)
+
+
+def write_descriptor_file_version(new_version: str, root: Path = None) -> None:
+    project_dir = get_project_dir(root)
+    for file in PrimaryDescriptors:
+        path = project_dir / file
+        io_counters.files_stat += 1
+        if path.is_file():
+            update_descriptor_version(path, new_version)
+
+
+def is_pruned_descriptor_dir(name: str) -> bool:
+    return name.startswith('.') or name in DESCRIPTOR_PRUNED_DIRNAMES
+
+
+def discover_descriptors(root: Path) -> Iterator[Path]:
+    """
+    Finds the descriptor files of all packages under the root directory in one pruned
+    walk, which does not descend into hidden directories or build output directories.
+
+    Returns:
+        An iterator of the paths of the descriptor files.
+    """
+    def is_descriptor(name: str) -> bool:
+        return name in SupportedDescriptors
+
+    for path, is_file in walk_tree(root, is_descriptor, prune=is_pruned_descriptor_dir):
+        if is_file:
+            yield path
+
 
+def update_descriptor_version(path: Path, new_version: str) -> str:
+    """
+    Writes the new version into the descriptor file, unless the file does
+    not define a version number or already has the new version.
 
-def write_descriptor_file_version(new_version: str) -> None:
-    config_file = find_local_config_file(init_cwd=True)
-    for file, func in SupportedDescriptors.items():
-        path = config_file.parent / file
-        if path.exists() and path.is_file():
-            func('write', path, new_version)
+    Returns:
+        The previous version number of the descriptor file, or an empty string.
+    """
+    func = SupportedDescriptors[path.name]
+    io_counters.files_read += 1
+    old_version = func('read', path, '')
+    if old_version and old_version != new_version:
+        func('write', path, new_version)
+    return old_version
 
 
-def read_chart_and_app_version() -> tuple:
-    config_file = find_local_config_file(init_cwd=True)
-    chart_path = config_file.parent / 'chart/Chart.yaml'
+def read_chart_and_app_version(root: Path = None) -> tuple:
+    chart_path = get_project_dir(root) / 'chart/Chart.yaml'
     if chart_path.exists() and chart_path.is_file():
         with open(chart_path, 'r') as file:
             chart_yaml = yaml.safe_load(file)
@@ -115,15 +444,14 @@ def read_chart_and_app_version() -> tuple:
     return None, None
 
 
-def write_chart_and_app_version(new_version: str) -> None:
-    config_file = find_local_config_file(init_cwd=True)
-    chart_path = config_file.parent / 'chart/Chart.yaml'
+def write_chart_and_app_version(new_version: str, root: Path = None) -> None:
+    chart_path = get_project_dir(root) / 'chart/Chart.yaml'
 
     if chart_path.exists() and chart_path.is_file():
         with open(chart_path, 'r') as file:
             lines = file.readlines()
 
-        with open(chart_path, 'w') as file:
+        with atomic_file_writer(chart_path) as file:
             for line in lines:
                 if line.startswith('version:'):
                     file.write(f'version: {new_version}\n')
@@ -9,16 +9,19 @@
 #   SPDX-License-Identifier: Apache-2.0
 #
 
+import sys
+import orjson
 from typing import List
 from pathlib import Path
-from semver import Version
-from rich.prompt import Confirm
-from rich.console import Console
 from typing_extensions import Annotated
-from typer import Typer, Option
+from typer import Typer, Option, Argument
 from devtools_cli.models import *
+from devtools_cli.api import *
+from devtools_cli.output import *
+from devtools_cli.workspace import *
 from devtools_cli.utils import *
 from .helpers import *
+from .gitrepo import *
 from .models import *
 
 
@@ -27,7 +30,13 @@ app = Typer(
     no_args_is_help=True,
     help="Manages project version number and tracks filesystem changes."
 )
-console = Console(soft_wrap=True)
+cache_app = Typer(
+    name="cache",
+    no_args_is_help=True,
+    help="Exports and imports the file digest cache of the repository."
+)
+app.add_typer(cache_app)
+console = LazyConsole(soft_wrap=True)
 
 
 NameOpt = Annotated[str, Option(
@@ -52,6 +61,17 @@ TrackChartOpt = Annotated[bool, Option(
                                                     'Whether devtools should bump the version number in the Helm Chart.yaml file. '
                                                     'False by default.'
 )]
+DigestModeOpt = Annotated[DigestMode, Option(
+    '--mode', '-m', show_default=False, help=''
+                                              'How the files of the component are hashed: "content" hashes their contents, '
+                                              '"metadata" fingerprints their paths, sizes and modification times, and "hybrid" '
+                                              'hashes the contents of the files smaller than the threshold. Defaults to content.'
+)]
+ThresholdOpt = Annotated[int, Option(
+    '--threshold', '-T', min=0, show_default=False, help=''
+                                                   'The size in bytes from which the hybrid mode fingerprints files instead of '
+                                                   'hashing their contents. Defaults to 1 MiB.'
+)]
 
 
 @app.command(name="track", epilog="Example: devtools version track --name app")
@@ -60,85 +80,32 @@ def cmd_track(
         target: TargetOpt = '.',
         ignore: IgnoreOpt = None,
         track_descriptor: TrackDescriptorOpt = False,
-        track_chart: TrackChartOpt = False
+        track_chart: TrackChartOpt = False,
+        mode: DigestModeOpt = DigestMode.CONTENT,
+        threshold: ThresholdOpt = HYBRID_SIZE_THRESHOLD
 ) -> None:
     """
     Tracks changes inside the specified target path using file hashing.
     Defaults to the .devtools config directory if called without 'target' option.
     """
-    config_file: Path = find_local_config_file(init_cwd=True)
-    config: VersionConfig = read_local_config_file(VersionConfig)
-    track_path = config_file.parent / target
-
-    if not track_path.exists():
-        console.print(f"ERROR! Cannot track a target path which does not exist: '{track_path}'\n")
-        raise SystemExit()
-    elif track_path.is_file() and ignore:
-        console.print(f"ERROR! Cannot set ignored paths when target is a file: '{track_path}'\n")
-        raise SystemExit()
-
-    index = None
-    for i, entry in enumerate(config.components):
-        if entry.name == name and entry.target != target:
-            console.print(f"ERROR! Cannot assign the same name '{name}' to multiple targets!\n")
-            raise SystemExit()
-        elif entry.target == target and entry.name != name:
-            console.print(f"ERROR! Cannot assign the same target '{target}' to multiple names!\n")
-            raise SystemExit()
-        elif entry.name == name and entry.target == target and entry.ignore == ignore:
-            console.print(f"Nothing to update in the tracked component.\n")
-            raise SystemExit()
-        elif entry.name == name and entry.target == target:
-            index = i
-
-    if track_path.is_file():
-        track_hash = digest_file(track_path)
-    else:
-        track_hash = digest_directory(track_path, ignore)
-
-    if track_descriptor:
-        config.app_version = read_descriptor_file_version()
-        config.track_descriptor = track_descriptor
-
-    if track_chart:
-        chart_ver, app_ver = read_chart_and_app_version()
-        if track_descriptor:
-            if chart_ver and chart_ver != config.app_version:
-                console.print(
-                    f"ERROR! The 'version' value in the Helm Chart.yaml file must "
-                    f"match the version number in the project descriptor file!"
-                )
-                raise SystemExit()
-            elif app_ver and app_ver != config.app_version:
-                console.print(
-                    f"ERROR! The 'appVersion' value in the Helm Chart.yaml file must "
-                    f"match the version number in the project descriptor file!"
-                )
-                raise SystemExit()
-        if all(x is not None for x in [chart_ver, app_ver]) and chart_ver != app_ver:
-            console.print(
-                f"ERROR! Devtools requires the 'version' and 'appVersion' "
-                f"values in the Helm Chart.yaml file to be identical!"
-            )
-            raise SystemExit()
-        config.track_chart = track_chart
-        config.app_version = chart_ver or "0.0.0"
-
-    comp = TrackedComponent(
-        hash=track_hash,
-        target=target,
-        ignore=ignore,
-        name=name
-    )
-    if index is None:
-        config.components.append(comp)
-        msg = f"Successfully tracked component: '{name}'.\n"
+    find_local_config_file(init_cwd=True)
+    try:
+        result = track_component(
+            name, target, ignore,
+            mode=mode,
+            threshold=threshold,
+            track_descriptor=track_descriptor,
+            track_chart=track_chart
+        )
+    except TrackingError as ex:
+        exit_with_error(console, str(ex))
+
+    if result == 'unchanged':
+        console.print("Nothing to update in the tracked component.\n")
+    elif result == 'created':
+        console.print(f"Successfully tracked component: '{name}'.\n")
     else:
-        config.components[index] = comp
-        msg = f"Successfully updated the component '{name}'.\n"
-
-    write_local_config_file(config)
-    console.print(msg)
+        console.print(f"Successfully updated the component '{name}'.\n")
 
 
 @app.command(name="untrack", epilog="Example: devtools version untrack --name app")
@@ -188,6 +155,10 @@ ValueOpt = Annotated[int, Option(
     '--value', '-V', show_default=False, help=""
                                               "Explicitly assign this value to the chosen version number level."
 )]
+MonorepoOpt = Annotated[bool, Option(
+    '--monorepo', '-R', show_default=False, help=""
+                                                 "Also write the new version into the descriptor files of all packages under the project directory."
+)]
 
 
 @app.command(name="bump", epilog="Example: devtools version bump --minor")
@@ -197,7 +168,8 @@ def cmd_bump(
         patch: PatchBumpOpt = False,
         suffix: SuffixOpt = '',
         downgrade: DowngradeOpt = False,
-        value: ValueOpt = None
+        value: ValueOpt = None,
+        monorepo: MonorepoOpt = False
 ) -> None:
     """
     Increments the version identifier of the project.
@@ -209,35 +181,21 @@ def cmd_bump(
     if not any([major, minor, patch]):
         patch = True
 
-    if count_descriptors() > 1:
-        console.print("ERROR! Cannot have multiple language descriptor files in the project directory!\n")
-        raise SystemExit()
-
     config_file = find_local_config_file(init_cwd=True)
     config: VersionConfig = read_local_config_file(VersionConfig)
-    descriptor_ver = read_descriptor_file_version()
-
-    desc_ver = Version.parse(descriptor_ver)
-    conf_ver = Version.parse(config.app_version)
-    ver = desc_ver if desc_ver > conf_ver else conf_ver
-
-    if value:
-        new_version = str(Version(
-            major=value if major else ver.major,
-            minor=value if minor else ver.minor,
-            patch=value if patch else ver.patch
-        ))
-    elif downgrade:
-        new_version = str(Version(
-            major=ver.major - (1 if major else 0),
-            minor=ver.minor - (1 if minor else 0),
-            patch=ver.patch - (1 if patch else 0)
-        ))
-    else:
-        index = [major, minor, patch].index(True)
-        func = [ver.bump_major, ver.bump_minor, ver.bump_patch][index]
-        new_version = str(func()) + (f"-{suffix}" if suffix else '')
-
+    level = ['major', 'minor', 'patch'][[major, minor, patch].index(True)]
+    try:
+        new_version = bump_version(
+            project_version(),
+            level,
+            suffix=suffix,
+            downgrade=downgrade,
+            value=value
+        )
+    except VersionError as ex:
+        exit_with_error(console, str(ex))
+
+    from rich.prompt import Confirm
     verb = "Downgrade" if downgrade else "Bump"
     do_action = Confirm.ask(
         f"{verb} the version of [light_goldenrod3]'{config_file.parent.name}'[/] from "
@@ -247,23 +205,50 @@ def cmd_bump(
         console.print(f"[bold]Did not {verb.lower()} the project version.\n")
         raise SystemExit()
 
-    if config.track_descriptor:
-        write_descriptor_file_version(new_version)
-    if config.track_chart:
-        write_chart_and_app_version(new_version)
+    verb = "downgraded" if downgrade else "bumped"
+    results: List[DescriptorResult] = list()
+    try:
+        with file_transaction():
+            # The descriptors are written first, so that the component hashes include them.
+            if monorepo:
+                results = update_descriptors(new_version)
+                failed = [f"'{r.path.as_posix()}': {r.error}" for r in results if r.error]
+                if failed:
+                    raise VersionError(f"Cannot write the descriptor files {', '.join(failed)}")
+            set_version(new_version)
+    except (DevtoolsError, OSError, ValueError) as ex:
+        exit_with_error(console, f"The project version was not {verb}, because the update failed: {ex}")
 
-    for comp in config.components:
-        track_path = config_file.parent / comp.target
-        if track_path.is_file():
-            track_hash = digest_file(track_path)
+    console.print(f"[bold]Successfully {verb} the project version.\n")
+    if monorepo:
+        print_descriptor_updates(results, new_version)
+
+
+def print_descriptor_updates(results: List[DescriptorResult], new_version: str) -> None:
+    from rich.table import Table
+    table = Table(title="Descriptor files")
+    table.add_column("Path", style="cyan", no_wrap=True)
+    table.add_column("Old version")
+    table.add_column("Status")
+
+    counts = dict(updated=0, unchanged=0, skipped=0, failed=0)
+    for result in results:
+        if result.error:
+            status, cell = 'failed', f"[bold red]{result.error}[/]"
+        elif not result.old_version:
+            status, cell = 'skipped', "no version"
+        elif result.old_version == new_version:
+            status, cell = 'unchanged', "unchanged"
         else:
-            track_hash = digest_directory(track_path, comp.ignore)
-        comp.hash = track_hash
+            status, cell = 'updated', "[chartreuse3]updated[/]"
+        counts[status] += 1
+        table.add_row(result.path.as_posix(), result.old_version or '-', cell)
 
-    config.app_version = new_version
-    write_local_config_file(config)
-    verb = "downgraded" if downgrade else "bumped"
-    console.print(f"[bold]Successfully {verb} the project version.\n")
+    console.print(table)
+    summary = ', '.join(f"{value} {key}" for key, value in counts.items())
+    console.print(f"Processed {len(results)} descriptor files: {summary}\n")
+    if counts['failed']:
+        raise SystemExit(1)
 
 
 GitHubEnvOpt = Annotated[str, Option(
@@ -276,34 +261,144 @@ GitHubOutOpt = Annotated[str, Option(
 )]
 
 
+AllOpt = Annotated[bool, Option(
+    '--all', '-a', show_default=False, help=''
+                                             'Echo the project version and the hashes of all components at once.'
+)]
+GitHubOutPrefixOpt = Annotated[str, Option(
+    '--ghout-prefix', '-P', show_default=False, help=''
+                                                     'With --all, insert every echoed value into the GitHub Action outputs file, '
+                                                     'named by this prefix followed by "version", "matrix" or the component name.'
+)]
+MatrixOpt = Annotated[bool, Option(
+    '--matrix', '-x', show_default=False, help=''
+                                                'With --all, also echo a GitHub Actions strategy matrix of the components '
+                                                'which have changed since their hashes were last updated.'
+)]
+
+
 @app.command(name="echo", epilog="Example: devtools version echo")
-def cmd_echo(name: NameOpt = '', ghenv: GitHubEnvOpt = '', ghout: GitHubOutOpt = ''):
+def cmd_echo(
+        name: NameOpt = '',
+        ghenv: GitHubEnvOpt = '',
+        ghout: GitHubOutOpt = '',
+        echo_all: AllOpt = False,
+        ghout_prefix: GitHubOutPrefixOpt = '',
+        matrix: MatrixOpt = False
+):
     """
     Echoes project version or component hashes to stdout, optionally
     inserts echoed data into GitHub Action files if applicable.
     """
     config: VersionConfig = read_local_config_file(VersionConfig)
+    if echo_all:
+        if name or ghenv or ghout:
+            exit_with_error(console, "The --all option cannot be combined with --name, --ghenv or --ghout.")
+        return echo_all_versions(config, ghout_prefix, matrix)
+    elif ghout_prefix or matrix:
+        exit_with_error(console, "The --ghout-prefix and --matrix options require the --all option.")
+
     var_map = [(ghenv, GitHubFile.ENV), (ghout, GitHubFile.OUT)]
     if not name:
         validate_version(config.app_version)
-        console.print(config.app_version)
+        if is_json_mode():
+            emit_json(dict(version=config.app_version))
+        else:
+            console.print(config.app_version)
         [
             write_to_github_file(key, config.app_version, file)
             for key, file in var_map if key
         ]
         return
+
+    entry = next((c for c in config.components if c.name == name), None)
+    if entry is None:
+        exit_with_error(console, "Cannot access the hash of a non-existent component!")
+    validate_digest(entry.hash)
+    if is_json_mode():
+        emit_json(dict(name=entry.name, hash=entry.hash))
     else:
-        for entry in config.components:
-            validate_digest(entry.hash)
-            if entry.name == name:
-                console.print(entry.hash)
-                [
-                    write_to_github_file(key, entry.hash, file)
-                    for key, file in var_map if key
-                ]
-                return
-        console.print("ERROR! Cannot access the hash of a non-existent component!\n")
-        raise SystemExit()
+        console.print(entry.hash)
+    [
+        write_to_github_file(key, entry.hash, file)
+        for key, file in var_map if key
+    ]
+
+
+def echo_all_versions(config: VersionConfig, ghout_prefix: str, matrix: bool) -> None:
+    validate_version(config.app_version)
+    hashes = dict()
+    for entry in config.components:
+        validate_digest(entry.hash)
+        hashes[entry.name] = entry.hash
+
+    include = None
+    if matrix:
+        try:
+            status = project_status()
+        except ConfigFileNotFound as ex:
+            exit_with_error(console, str(ex))
+        include = [
+            dict(name=comp['name'], target=comp['target'], hash=comp['current'])
+            for comp in status['components']
+            if comp['changed'] and comp['current'] is not None
+        ]
+
+    if is_json_mode():
+        data = dict(version=config.app_version, components=hashes)
+        if include is not None:
+            data['matrix'] = dict(include=include)
+        emit_json(data)
+    else:
+        print(f"version={config.app_version}")
+        for key, value in hashes.items():
+            print(f"{key}={value}")
+        if include is not None:
+            print(f"matrix={orjson.dumps(dict(include=include)).decode()}")
+
+    if ghout_prefix:
+        variables = [(f"{ghout_prefix}version", config.app_version)]
+        variables += [(f"{ghout_prefix}{key}", value) for key, value in hashes.items()]
+        if include is not None:
+            variables.append((f"{ghout_prefix}matrix", orjson.dumps(dict(include=include)).decode()))
+        write_github_variables(variables, GitHubFile.OUT)
+
+
+def find_workspace_projects() -> List[Path]:
+    projects = discover_projects(get_workspace_root())
+    if not projects:
+        exit_with_error(console, f"Cannot find any devtools projects in the workspace: '{get_workspace_root()}'")
+    return projects
+
+
+def print_workspace_regen() -> None:
+    def regen(root: Path) -> dict:
+        return dict(updated=sorted(update_component_digests(root)))
+
+    root = get_workspace_root()
+    results = run_in_projects(regen, find_workspace_projects(), root)
+    report_workspace(console, results, dict(updated="Updated components"))
+
+
+def print_workspace_status() -> None:
+    def status(root: Path) -> dict:
+        data = project_status(root)
+        comps = data['components']
+        return dict(
+            version=data['version'],
+            components=len(comps),
+            changed=[c['name'] for c in comps if c['changed'] and c['current'] is not None],
+            missing=[c['name'] for c in comps if c['current'] is None]
+        )
+
+    root = get_workspace_root()
+    results = run_in_projects(status, find_workspace_projects(), root)
+    report_workspace(console, results, dict(
+        version="Version",
+        components="Components",
+        changed="Changed",
+        missing="Missing"
+    ))
 
 
 @app.command(name="regen", epilog="Example: devtools version regen")
@@ -312,6 +407,9 @@ def cmd_regen():
     Regenerates the hashes of all tracked components and updates
     the config file. Does not change the project version.
     """
+    if get_workspace_root() is not None:
+        return print_workspace_regen()
+
     config_file = find_local_config_file(init_cwd=False)
     config: VersionConfig = read_local_config_file(VersionConfig)
 
@@ -319,16 +417,43 @@ def cmd_regen():
         console.print("No component hashes to update.\n")
         raise SystemExit()
 
-    for comp in config.components:
-        track_path = config_file.parent / comp.target
-        if track_path.is_file():
-            track_hash = digest_file(track_path)
+    update_component_digests()
+    console.print("[bold]Successfully updated component hashes.\n")
+
+
+@app.command(name="status", epilog="Example: devtools version status")
+def cmd_status():
+    """
+    Prints the project version and whether the tracked components have changed
+    since their hashes were last updated. Does not change the config file.
+    """
+    if get_workspace_root() is not None:
+        return print_workspace_status()
+    try:
+        status = project_status()
+    except ConfigFileNotFound as ex:
+        exit_with_error(console, str(ex))
+
+    if is_json_mode():
+        emit_json(status)
+        return
+
+    from rich.table import Table
+    table = Table(title=f"Project version: {status['version']}")
+    table.add_column("Component", style="cyan", no_wrap=True)
+    table.add_column("Target", style="orchid", no_wrap=True)
+    table.add_column("Status", no_wrap=True)
+    for comp in status['components']:
+        if comp['current'] is None:
+            status = "[bold red]missing[/]"
+        elif comp['changed']:
+            status = "[dark_goldenrod]changed[/]"
         else:
-            track_hash = digest_directory(track_path, comp.ignore)
-        comp.hash = track_hash
+            status = "[green3]unchanged[/]"
+        table.add_row(comp['name'], comp['target'], status)
 
-    write_local_config_file(config)
-    console.print("[bold]Successfully updated component hashes.\n")
+    console.print('')
+    console.print(table)
 
 
 BaseVerOpt = Annotated[str, Option(
@@ -339,27 +464,192 @@ HeadVerOpt = Annotated[str, Option(
     "--head", "-h", show_default=False, help=''
                                              'The head version identifier to compare against.'
 )]
+StdinOpt = Annotated[bool, Option(
+    "--stdin", "-S", show_default=False, help=''
+                                              'Read whitespace-separated pairs of base and head version identifiers from stdin, '
+                                              'one pair per line, and write one result per line.'
+)]
 
 
 @app.command(name="cmp", epilog="Example: devtools version cmp --base 1.0.0 --head 1.0.1")
-def cmd_cmp(base: BaseVerOpt, head: HeadVerOpt, ghenv: GitHubEnvOpt = '', ghout: GitHubOutOpt = ''):
+def cmd_cmp(
+        base: BaseVerOpt = '',
+        head: HeadVerOpt = '',
+        stdin: StdinOpt = False,
+        ghenv: GitHubEnvOpt = '',
+        ghout: GitHubOutOpt = ''
+):
     """
     Returns either "lt", "gt" or "eq" which represents the
     logical relationship between the two version identifiers.
     The comparison is made as: head <operand> base.
     """
-    base_ver = Version.parse(base)
-    head_ver = Version.parse(head)
+    if stdin:
+        if base or head or ghenv or ghout:
+            exit_with_error(console, "The '--stdin' option cannot be combined with other options.")
+        compare_version_stream()
+        return
+    if not (base and head):
+        exit_with_error(console, "Both the '--base' and '--head' options must be provided.")
+
+    base_ver = parse_tag_version(base)
+    head_ver = parse_tag_version(head)
+    if base_ver is None or head_ver is None:
+        invalid = base if base_ver is None else head
+        exit_with_error(console, f"{invalid} is not valid SemVer string")
 
-    result = "eq"
-    if head_ver < base_ver:
-        result = "lt"
-    elif head_ver > base_ver:
-        result = "gt"
+    result = compare_versions(base_ver, head_ver)
 
     var_map = [(ghenv, GitHubFile.ENV), (ghout, GitHubFile.OUT)]
     [
         write_to_github_file(key, result, file)
         for key, file in var_map if key
     ]
-    console.print(result)
+    if is_json_mode():
+        emit_json(dict(base=base, head=head, result=result))
+    else:
+        console.print(result)
+
+
+def compare_version_stream() -> None:
+    """
+    Compares the pairs of version identifiers read from stdin and writes one result
+    per input line, so that the results can be zipped with the input. Blank lines are
+    skipped, and malformed lines produce the "invalid" result instead of aborting the batch.
+    """
+    json_mode = is_json_mode()
+    out = sys.stdout
+    for line in sys.stdin:
+        parts = line.split()
+        if not parts:
+            continue
+        result = "invalid"
+        if len(parts) == 2:
+            base_ver = parse_tag_version(parts[0])
+            head_ver = parse_tag_version(parts[1])
+            if base_ver is not None and head_ver is not None:
+                result = compare_versions(base_ver, head_ver)
+        if json_mode:
+            base, head = (parts + ['', ''])[:2]
+            out.write(orjson.dumps(dict(base=base, head=head, result=result)).decode() + '\n')
+        else:
+            out.write(result + '\n')
+    out.flush()
+
+
+SortStdinOpt = Annotated[bool, Option(
+    "--stdin", "-S", show_default=False, help=''
+                                              'Read the version identifiers to sort from stdin, one per line.'
+)]
+SortGitOpt = Annotated[bool, Option(
+    "--git", "-g", show_default=False, help=''
+                                            'Sort the tags of the local git repository.'
+)]
+LatestOpt = Annotated[bool, Option(
+    "--latest", "-l", show_default=False, help=''
+                                               'Output only the latest version identifier.'
+)]
+ReverseOpt = Annotated[bool, Option(
+    "--reverse", "-r", show_default=False, help=''
+                                                'Sort the version identifiers in descending order.'
+)]
+PrereleasePolicyOpt = Annotated[PrereleasePolicy, Option(
+    "--prerelease-policy", "-p", show_default=False, help=''
+                                                          'Whether to include, exclude or only output prerelease versions. '
+                                                          'Defaults to include.'
+)]
+
+
+@app.command(name="sort", epilog="Example: devtools version sort --git --latest")
+def cmd_sort(
+        stdin: SortStdinOpt = False,
+        git: SortGitOpt = False,
+        latest: LatestOpt = False,
+        reverse: ReverseOpt = False,
+        policy: PrereleasePolicyOpt = PrereleasePolicy.INCLUDE
+):
+    """
+    Sorts version identifiers by semantic version precedence, in ascending order
+    by default. The identifiers may have a leading 'v' as it is common in git tags.
+    Malformed identifiers are skipped and reported instead of aborting the command.
+    """
+    if stdin == git:
+        exit_with_error(console, "Exactly one of the '--stdin' or '--git' options must be provided.")
+
+    if git:
+        git_dir = find_git_dir(Path.cwd())
+        if git_dir is None:
+            exit_with_error(console, "Unable to find a git repository in the current or parent directories.")
+        tags = read_git_tags(git_dir)
+    else:
+        tags = [line.strip() for line in sys.stdin]
+
+    valid, invalid = [], []
+    for tag in tags:
+        if not tag:
+            continue
+        version = parse_tag_version(tag)
+        if version is None:
+            invalid.append(tag)
+            continue
+        is_prerelease = version.prerelease is not None
+        if policy == PrereleasePolicy.EXCLUDE and is_prerelease:
+            continue
+        if policy == PrereleasePolicy.ONLY and not is_prerelease:
+            continue
+        valid.append((version, tag))
+
+    valid.sort(reverse=reverse)
+    ordered = [tag for _, tag in valid]
+
+    if latest:
+        result = max(valid)[1] if valid else None
+        if is_json_mode():
+            emit_json(dict(latest=result, invalid=invalid))
+        elif result is not None:
+            sys.stdout.write(result + '\n')
+    elif is_json_mode():
+        emit_json(dict(versions=ordered, invalid=invalid))
+    else:
+        sys.stdout.write(''.join(tag + '\n' for tag in ordered))
+    sys.stdout.flush()
+
+    if invalid and not is_json_mode():
+        sys.stderr.write(f"Skipped {len(invalid)} invalid version identifiers: {', '.join(invalid)}\n")
+
+
+CacheFileArg = Annotated[Path, Argument(
+    show_default=False, help='The path of the digest cache file.'
+)]
+
+
+@cache_app.command(name="export", epilog="Example: devtools version cache export digests.bin")
+def cmd_cache_export(file: CacheFileArg):
+    """
+    Exports the content digests of the files of the tracked components, which are
+    clean in the git index, into a digest cache file to be imported on another checkout.
+    """
+    try:
+        count = export_digest_cache(file)
+    except (ConfigFileNotFound, DigestCacheError) as ex:
+        exit_with_error(console, str(ex))
+    if is_json_mode():
+        emit_json(dict(file=str(file), digests=count))
+    else:
+        console.print(f"Exported {count} file digests into '{file}'.\n")
+
+
+@cache_app.command(name="import", epilog="Example: devtools version cache import digests.bin")
+def cmd_cache_import(file: CacheFileArg):
+    """
+    Imports a digest cache file, so that the digests of the files, which are unchanged
+    since the export, are not computed again by the version commands.
+    """
+    try:
+        count = import_digest_cache(file)
+    except (ConfigFileNotFound, DigestCacheError, FileNotFoundError) as ex:
+        exit_with_error(console, str(ex))
+    if is_json_mode():
+        emit_json(dict(file=str(file), digests=count))
+    else:
+        console.print(f"Imported {count} file digests from '{file}'.\n")
@@ -9,20 +9,44 @@
 #   SPDX-License-Identifier: Apache-2.0
 #
 
+from enum import Enum
 from typing import List
 from devtools_cli.models import DefaultModel, ConfigSection
 
 __all__ = [
+    "HYBRID_SIZE_THRESHOLD",
+    "LEGACY_DIGEST_FORMAT",
+    "DIGEST_FORMAT",
+    "DigestMode",
     "TrackedComponent",
-    "VersionConfig"
+    "VersionConfig",
+    "PrereleasePolicy"
 ]
 
 
+HYBRID_SIZE_THRESHOLD = 1024 * 1024
+
+# The legacy digests fold the file digests in the order of the `rglob` of the interpreter,
+# which differs between the Python versions. The current digests fold them in the order
+# of the relative file paths. The components without a digest format have legacy digests.
+LEGACY_DIGEST_FORMAT = 1
+DIGEST_FORMAT = 2
+
+
+class DigestMode(str, Enum):
+    CONTENT = "content"
+    METADATA = "metadata"
+    HYBRID = "hybrid"
+
+
 class TrackedComponent(DefaultModel):
     name: str
     target: str
     ignore: List[str]
     hash: str
+    mode: DigestMode = DigestMode.CONTENT
+    threshold: int = HYBRID_SIZE_THRESHOLD
+    digest_format: int = LEGACY_DIGEST_FORMAT
 
     @staticmethod
     def __defaults__() -> dict:
@@ -30,7 +54,10 @@ class TrackedComponent(DefaultModel):
             "name": "",
             "target": "",
             "ignore": list(),
-            "hash": ""
+            "hash": "",
+            "mode": DigestMode.CONTENT,
+            "threshold": HYBRID_SIZE_THRESHOLD,
+            "digest_format": LEGACY_DIGEST_FORMAT
         }
 
 
@@ -52,3 +79,9 @@ class VersionConfig(ConfigSection):
     @property
     def section(self) -> str:
         return 'version_cmd'
+
+
+class PrereleasePolicy(str, Enum):
+    INCLUDE = "include"
+    EXCLUDE = "exclude"
+    ONLY = "only"
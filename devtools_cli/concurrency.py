@@ -0,0 +1,230 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import os
+import math
+import time
+import threading
+import contextvars
+from pathlib import Path
+from collections import deque
+from itertools import chain, islice
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, TypeVar, Union
+from devtools_cli.stats import concurrency_stats
+from devtools_cli.output import JOBS_OPTION
+
+__all__ = [
+    "JOBS_OPTION",
+    "set_jobs",
+    "get_jobs",
+    "read_cgroup_cpu_limit",
+    "available_cpus",
+    "is_worker_thread",
+    "Autotuner",
+    "adaptive_map"
+]
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+MAX_WORKERS = 32
+IO_OVERSUBSCRIPTION = 4
+BATCH_PER_WORKER = 32
+MIN_PARALLEL_ITEMS = 32
+IOWAIT_THRESHOLD = 10.0
+MIN_SPEEDUP = 1.1
+CPU_SATURATION = 0.9
+
+_jobs: Union[int, None] = None
+_worker_state = threading.local()
+
+
+def set_jobs(jobs: Union[int, None]) -> None:
+    global _jobs
+    _jobs = jobs
+
+
+def get_jobs() -> Union[int, None]:
+    return _jobs
+
+
+def read_cgroup_cpu_limit(root: Path = CGROUP_ROOT) -> Union[float, None]:
+    """
+    Reads the CPU quota of the cgroup of the process from the cgroup v2 'cpu.max'
+    file or the cgroup v1 CFS quota and period files.
+
+    Returns:
+        The number of CPUs the quota amounts to, or None if the quota is not limited.
+    """
+    try:
+        quota, period = (root / "cpu.max").read_text().split()[:2]
+        if quota == "max":
+            return None
+        return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    for subdir in ["cpu", "cpu,cpuacct"]:
+        try:
+            quota = int((root / subdir / "cpu.cfs_quota_us").read_text())
+            period = int((root / subdir / "cpu.cfs_period_us").read_text())
+        except (OSError, ValueError):
+            continue
+        return quota / period if quota > 0 and period > 0 else None
+    return None
+
+
+def available_cpus() -> int:
+    """
+    Returns the number of CPUs the process can actually use, which is the smaller
+    of the CPU affinity of the process and the cgroup CPU quota, rounded up.
+    """
+    try:
+        count = len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover
+        count = os.cpu_count() or 1
+    limit = read_cgroup_cpu_limit()
+    if limit is not None:
+        count = min(count, max(1, math.ceil(limit)))
+    return max(1, count)
+
+
+class Autotuner:
+    """
+    This class chooses the number of worker threads for file processing. It starts with
+    one worker per available CPU and, after each batch, probes a larger pool for as long
+    as the throughput keeps improving and the CPUs are not saturated. The pool grows
+    faster when the system is waiting for I/O, which is typical for network file systems.
+    Once a larger pool does not pay off, the previous size is kept for the rest of the run.
+    """
+    def __init__(self, jobs: int = None):
+        self.cpus = available_cpus()
+        self.fixed = jobs is not None
+        self.workers = jobs if self.fixed else self.cpus
+        self.max_workers = jobs if self.fixed else min(MAX_WORKERS, self.cpus * IO_OVERSUBSCRIPTION)
+        self.settled = self.fixed or self.workers >= self.max_workers
+        self.previous: Union[tuple, None] = None
+        self.history: List[dict] = list()
+        self._start = self._cpu_start = 0.0
+        self._psutil = None
+
+    @property
+    def batch_size(self) -> int:
+        return self.workers * BATCH_PER_WORKER
+
+    def read_iowait(self) -> Union[float, None]:
+        if self._psutil is None:
+            try:
+                import psutil
+            except ImportError:  # pragma: no cover
+                return None
+            self._psutil = psutil
+        return getattr(self._psutil.cpu_times_percent(interval=None), 'iowait', None)
+
+    def begin_batch(self) -> None:
+        if self.settled:
+            return
+        self.read_iowait()
+        self._cpu_start = time.process_time()
+        self._start = time.perf_counter()
+
+    def end_batch(self, count: int) -> None:
+        if self.settled:
+            return
+        elapsed = max(time.perf_counter() - self._start, 1e-9)
+        throughput = count / elapsed
+        cpu_busy = (time.process_time() - self._cpu_start) / elapsed
+        iowait = self.read_iowait() or 0.0
+        self.history.append(dict(
+            workers=self.workers,
+            throughput=round(throughput, 2),
+            cpu_busy=round(cpu_busy, 2),
+            iowait=iowait
+        ))
+
+        if self.previous and throughput < self.previous[1] * MIN_SPEEDUP:
+            self.workers = self.previous[0]
+            self.settled = True
+        elif cpu_busy >= self.cpus * CPU_SATURATION:
+            self.settled = True
+        else:
+            self.previous = (self.workers, throughput)
+            step = self.workers if iowait >= IOWAIT_THRESHOLD else max(1, self.workers // 2)
+            self.workers = min(self.max_workers, self.workers + step)
+            self.settled = self.workers == self.previous[0]
+
+    def record(self) -> None:
+        concurrency_stats.update(self.cpus, self.workers, max(
+            [self.workers, *[entry['workers'] for entry in self.history]]
+        ))
+
+
+def is_worker_thread() -> bool:
+    return getattr(_worker_state, 'active', False)
+
+
+def mark_worker_thread() -> None:
+    _worker_state.active = True
+
+
+def adaptive_map(
+        func: Callable[[T], R],
+        items: Iterable[T],
+        jobs: int = None,
+        min_items: int = MIN_PARALLEL_ITEMS
+) -> Iterator[R]:
+    """
+    Applies the function to the items on a pool of worker threads, which is sized by
+    an `Autotuner`, and yields the results in the order of the items. The items are
+    consumed lazily in batches. Small inputs and the calls from the worker threads of
+    another pool are processed sequentially in the calling thread. The worker threads
+    run each item in a copy of the context of the calling thread.
+
+    Args:
+        func: The function to apply to each item.
+        items: The items, which may be a lazy iterator.
+        jobs: A fixed number of worker threads. Defaults to the global '--jobs' option.
+        min_items: The smallest number of items which is processed in parallel.
+
+    Returns:
+        An iterator of the results in the order of the items.
+    """
+    jobs = jobs or get_jobs()
+    if jobs == 1 or is_worker_thread():
+        yield from map(func, items)
+        return
+
+    iterator = iter(items)
+    head = list(islice(iterator, min_items))
+    if len(head) < min_items:
+        yield from map(func, head)
+        return
+
+    tuner = Autotuner(jobs)
+    iterator = chain(head, iterator)
+    with ThreadPoolExecutor(tuner.max_workers, "devtools", mark_worker_thread) as executor:
+        while batch := list(islice(iterator, tuner.batch_size)):
+            tuner.begin_batch()
+            if tuner.workers == 1:
+                yield from map(func, batch)
+                tuner.end_batch(len(batch))
+                continue
+            pending = deque()
+            for item in batch:
+                if len(pending) >= tuner.workers:
+                    yield pending.popleft().result()
+                # The context variables, such as the active file transaction, are copied into the task.
+                pending.append(executor.submit(contextvars.copy_context().run, func, item))
+            while pending:
+                yield pending.popleft().result()
+            tuner.end_batch(len(batch))
+    tuner.record()
@@ -0,0 +1,41 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+class DevtoolsError(Exception):
+    pass
+
+
+class ConfigFileNotFound(DevtoolsError, FileNotFoundError):
+    pass
+
+
+class ChangelogFileNotFound(DevtoolsError, FileNotFoundError):
+    pass
+
+
+class SectionNotFound(DevtoolsError, LookupError):
+    pass
+
+
+class TrackingError(DevtoolsError, ValueError):
+    pass
+
+
+class VersionError(DevtoolsError, ValueError):
+    pass
+
+
+class DigestCacheError(DevtoolsError, ValueError):
+    pass
+
+
+class GitCommandError(DevtoolsError, RuntimeError):
+    pass
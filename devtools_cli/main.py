@@ -9,24 +9,33 @@
 #   SPDX-License-Identifier: Apache-2.0
 #
 
-import inspect
+import sys
 import importlib
-from typer import Typer
 from pathlib import Path
-
-app = Typer(no_args_is_help=True)
+from typing import Callable
+from devtools_cli.profiling import *
+from devtools_cli.tracing import *
+from devtools_cli.stats import *
+from devtools_cli.output import *
 
 package_path = Path(__file__).parent
 import_dir = package_path / "commands"
 
-for filepath in import_dir.rglob("*.py"):
-    relative_path = filepath.relative_to(package_path)
-    module_path = '.'.join(relative_path.with_suffix('').parts)
-    module = importlib.import_module(
-        package=package_path.name,
-        name=f'.{module_path}'
-    )
-    for _, obj in inspect.getmembers(module):
+def create_app() -> Callable:
+    from typer import Typer
+
+    app = Typer(no_args_is_help=True)
+
+    for filepath in import_dir.rglob("*.py"):
+        relative_path = filepath.relative_to(package_path)
+        module_path = '.'.join(relative_path.with_suffix('').parts)
+        module = importlib.import_module(
+            package=package_path.name,
+            name=f'.{module_path}'
+        )
+        # Only the 'app' of a module is registered, because the nested
+        # sub-apps are added to their parent apps by the modules themselves.
+        obj = getattr(module, 'app', None)
         if isinstance(obj, Typer):
             name = obj.info.name
             if isinstance(name, str) and len(name) > 0:
@@ -36,4 +45,134 @@ for filepath in import_dir.rglob("*.py"):
                     *obj.registered_commands
                 ])
 
-    importlib.invalidate_caches()
+        importlib.invalidate_caches()
+
+    return app
+
+
+def __getattr__(name: str) -> Callable:
+    # The app is created lazily, so that the global options
+    # can observe the cost of importing the command modules.
+    if name == 'app':
+        app = create_app()
+        globals()['app'] = app
+        return app
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+def load_command_app(command: str) -> Callable[[], Callable]:
+    def loader() -> Callable:
+        module = importlib.import_module(f"{package_path.name}.commands.{command}.main")
+        return getattr(module, 'app')
+    return loader
+
+
+def run_profiled(loader: Callable[[], Callable], profile_path: str) -> None:
+    profiler = Profiler(profile_path)
+    add_trace_sink(profiler.record_trace_span)
+    profiler.enable()
+    try:
+        with trace_span("import"):
+            app = loader()
+        with trace_span("command", argv=' '.join(sys.argv[1:])):
+            app()
+    finally:
+        profiler.disable()
+        remove_trace_sink(profiler.record_trace_span)
+        profiler.write()
+        profiler.print_summary()
+
+
+def run_cli(loader: Callable[[], Callable]) -> None:
+    """
+    Runs a devtools entry point with the global options applied. The global options are
+    removed from the command line arguments before they are parsed by the command app.
+
+    Global options:
+        --profile[=path]: Profiles the import and the execution of the command with
+            cProfile, writes the results into `path.pstats` and `path.trace.json`
+            and prints a summary of the slowest functions to stderr.
+        --memprofile[=dir]: Traces the memory allocations with tracemalloc and prints
+            the current and peak memory and the top allocation sites at every phase
+            boundary of the command. The snapshots are dumped into `dir`, if given.
+        --stats[=path]: Reports the wall time, CPU time, peak RSS, I/O bytes, open
+            file handles, the counts of files stat'ed, read and written and the
+            concurrency chosen by the worker pools into stderr, or as JSON into
+            the file at the given path.
+        --jobs <count>: Fixes the number of worker threads of the parallel file work,
+            which is otherwise autotuned from the cgroup CPU quota and the throughput.
+        --workspace <root>: Runs the `license apply`, `license check`, `version regen`
+            and `version status` commands in every project under the root directory
+            on a pool of worker threads and prints one merged report.
+        --json: Makes the commands which support it write compact JSON into stdout
+            instead of rendering rich output. Errors are written as {"error": msg}
+            and exit with status 1.
+
+    Environment variables:
+        DEVTOOLS_TRACE: Appends one JSON line per traced span of the hot paths
+            into the file at the given path.
+    """
+    install_env_trace_sink()
+    profile_path = pop_global_option(sys.argv, PROFILE_OPTION, DEFAULT_PROFILE_PATH)
+    memprofile_dir = pop_global_option(sys.argv, MEMPROFILE_OPTION, '')
+    stats_path = pop_global_option(sys.argv, STATS_OPTION, STATS_TO_STDERR)
+    if pop_global_option(sys.argv, JSON_OPTION, JSON_OPTION) is not None:
+        set_json_mode(True)
+    workspace = pop_global_option(sys.argv, WORKSPACE_OPTION, '.', takes_arg=True)
+    jobs = pop_global_option(sys.argv, JOBS_OPTION, '', takes_arg=True)
+    if jobs is not None and (not jobs.isdecimal() or int(jobs) < 1):
+        sys.stderr.write(f"ERROR! The {JOBS_OPTION} option must be a positive integer.\n")
+        raise SystemExit(2)
+
+    def load_app() -> Callable:
+        # The modules of the settings are imported in the import phase,
+        # so that their import cost is observed by the global options.
+        if workspace is not None:
+            from devtools_cli.workspace import set_workspace_root
+            set_workspace_root(Path(workspace))
+        if jobs is not None:
+            from devtools_cli.concurrency import set_jobs
+            set_jobs(int(jobs))
+        return loader()
+
+    monitor = ResourceMonitor() if stats_path is not None else None
+    memprofiler = MemoryProfiler(memprofile_dir) if memprofile_dir is not None else None
+    if memprofiler is not None:
+        memprofiler.start()
+    try:
+        if profile_path is None:
+            with trace_span("import"):
+                app = load_app()
+            app()
+        else:
+            run_profiled(load_app, profile_path)
+    finally:
+        if memprofiler is not None:
+            memprofiler.stop()
+            memprofiler.print_summary()
+        if monitor is not None:
+            monitor.write_report(stats_path)
+
+
+def main() -> None:
+    run_cli(create_app)
+
+
+def dtconf() -> None:
+    run_cli(load_command_app("config"))
+
+
+def dtlic() -> None:
+    run_cli(load_command_app("license"))
+
+
+def dtver() -> None:
+    run_cli(load_command_app("version"))
+
+
+def dtlog() -> None:
+    run_cli(load_command_app("log"))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,82 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import sys
+import orjson
+from typing import Any, NoReturn
+
+__all__ = [
+    "JSON_OPTION",
+    "WORKSPACE_OPTION",
+    "JOBS_OPTION",
+    "set_json_mode",
+    "is_json_mode",
+    "emit_json",
+    "exit_with_error",
+    "LazyConsole"
+]
+
+JSON_OPTION = "--json"
+
+# The names of the global options of the workspace and concurrency modules are defined
+# here, so that the entry point can parse them without importing those modules.
+WORKSPACE_OPTION = "--workspace"
+JOBS_OPTION = "--jobs"
+
+_json_mode = False
+
+
+def set_json_mode(enabled: bool) -> None:
+    global _json_mode
+    _json_mode = enabled
+
+
+def is_json_mode() -> bool:
+    return _json_mode
+
+
+def emit_json(data: Any) -> None:
+    """
+    Writes the data as a single line of compact JSON into stdout.
+    Pydantic models must be dumped into plain objects beforehand.
+    """
+    sys.stdout.buffer.write(orjson.dumps(data) + b'\n')
+    sys.stdout.buffer.flush()
+
+
+def exit_with_error(console: "LazyConsole", message: str) -> NoReturn:
+    """
+    Reports an error and exits the command. In the JSON mode, the error is written into
+    stdout as an object with the 'error' key and the process exits with status 1. Otherwise,
+    the error is printed to the console and the process exits with status 0 as it always has.
+    """
+    if _json_mode:
+        emit_json(dict(error=message))
+        raise SystemExit(1)
+    console.print(f"ERROR! {message}\n")
+    raise SystemExit()
+
+
+class LazyConsole:
+    """
+    This class is a stand-in for the rich `Console`, which imports rich and creates the
+    console only when one of its attributes is first accessed. Commands which only emit
+    JSON output therefore never pay for importing and instantiating the rich renderers.
+    """
+    def __init__(self, **kwargs: Any):
+        self._kwargs = kwargs
+        self._console = None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console(**self._kwargs)
+        return getattr(self._console, name)
@@ -0,0 +1,256 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import os
+import sys
+import time
+import pstats
+import orjson
+import cProfile
+import threading
+import tracemalloc
+from pathlib import Path
+from dataclasses import dataclass, field
+from contextlib import contextmanager
+from typing import Iterator, List, Dict, Union
+from devtools_cli.tracing import TraceSpan, add_trace_sink, remove_trace_sink
+
+__all__ = [
+    "PROFILE_OPTION",
+    "DEFAULT_PROFILE_PATH",
+    "MEMPROFILE_OPTION",
+    "MEMORY_PHASES",
+    "Span",
+    "Profiler",
+    "MemoryPhase",
+    "MemoryProfiler",
+    "pop_global_option"
+]
+
+PROFILE_OPTION = "--profile"
+DEFAULT_PROFILE_PATH = "devtools-profile"
+MEMPROFILE_OPTION = "--memprofile"
+SUMMARY_TOP_N = 25
+MEMORY_TOP_N = 10
+MEMORY_FRAMES = 1
+
+# Maps the names of the trace spans, which end at a phase
+# boundary of a command, to the names of the phases.
+MEMORY_PHASES = {
+    "import": "import",
+    "license.apply": "process",
+    "license.download": "process",
+    "license.report": "report",
+    "license.store": "report"
+}
+
+
+@dataclass(frozen=True)
+class Span:
+    name: str
+    start_ns: int
+    end_ns: int
+    tid: int
+    args: Dict[str, Union[str, int, float]] = field(default_factory=dict)
+
+
+def pop_global_option(
+        argv: List[str],
+        option: str,
+        default: str,
+        *, takes_arg: bool = False
+) -> Union[str, None]:
+    """
+    Removes the first occurrence of a global option with an optional value from the
+    command line arguments. Both the '--option' and the '--option=value' forms are
+    recognized, arguments after the '--' separator are left untouched.
+
+    Args:
+        argv: The command line arguments, usually `sys.argv`.
+        option: The name of the option, including the leading dashes.
+        default: The value returned when the option is given without a value.
+        takes_arg: Whether the '--option value' form is recognized as well, in
+            which case the argument after the option is always its value.
+
+    Returns:
+        The value of the option, or None if the option is not present.
+    """
+    for index, arg in enumerate(argv[1:], start=1):
+        if arg == '--':
+            break
+        elif arg == option:
+            argv.pop(index)
+            if takes_arg and index < len(argv):
+                return argv.pop(index)
+            return default
+        elif arg.startswith(option + '='):
+            argv.pop(index)
+            return arg.split('=', 1)[1] or default
+    return None
+
+
+class Profiler:
+    """
+    This class wraps the execution of a command in cProfile and records named spans
+    of wall time. The results are written into a `.pstats` file for offline analysis
+    with pstats or snakeviz and into a Chrome trace-event JSON file, which can be
+    opened in chrome://tracing or https://ui.perfetto.dev.
+    """
+    def __init__(self, path: str):
+        base = Path(path)
+        if base.suffix == '.pstats':
+            base = base.with_suffix('')
+        self.pstats_path = base.with_name(base.name + '.pstats')
+        self.trace_path = base.with_name(base.name + '.trace.json')
+        self.profile = cProfile.Profile()
+        self.spans: List[Span] = list()
+        self.origin_ns = time.perf_counter_ns()
+
+    def enable(self) -> None:
+        self.profile.enable()
+
+    def disable(self) -> None:
+        self.profile.disable()
+
+    @contextmanager
+    def span(self, name: str, **args: Union[str, int, float]) -> Iterator[None]:
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            self.add_span(Span(name, start, end, threading.get_ident(), args))
+
+    def add_span(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def record_trace_span(self, span: TraceSpan) -> None:
+        args = dict(span.attrs)
+        for key in ('bytes_read', 'bytes_written', 'files'):
+            if value := getattr(span, key):
+                args[key] = value
+        self.add_span(Span(span.name, span.start_ns, span.end_ns, span.tid, args))
+
+    def trace_events(self) -> List[dict]:
+        pid = os.getpid()
+        return [
+            {
+                "name": span.name,
+                "cat": "devtools",
+                "ph": "X",
+                "ts": (span.start_ns - self.origin_ns) / 1000,
+                "dur": (span.end_ns - span.start_ns) / 1000,
+                "pid": pid,
+                "tid": span.tid,
+                "args": span.args
+            } for span in self.spans
+        ]
+
+    def write(self) -> None:
+        self.profile.dump_stats(self.pstats_path)
+        trace = {"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}
+        with open(self.trace_path, 'wb') as file:
+            file.write(orjson.dumps(trace))
+
+    def print_summary(self, top: int = SUMMARY_TOP_N) -> None:
+        stream = sys.stderr
+        totals: Dict[str, List[float]] = dict()
+        for span in self.spans:
+            total = totals.setdefault(span.name, [0, 0.0])
+            total[0] += 1
+            total[1] += (span.end_ns - span.start_ns) / 1e6
+        stream.write("\nProfiled spans:\n")
+        for name, (count, duration) in totals.items():
+            stream.write(f"  {name:<32} {count:>6}x {duration:>10.2f} ms\n")
+        stats = pstats.Stats(self.profile, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+        stream.write(f"Profile written to '{self.pstats_path}' and '{self.trace_path}'.\n")
+
+
+@dataclass(frozen=True)
+class MemoryPhase:
+    name: str
+    current: int
+    peak: int
+    top: List[Union[tracemalloc.Statistic, tracemalloc.StatisticDiff]]
+    dump_path: Union[Path, None] = None
+
+
+class MemoryProfiler:
+    """
+    This class traces the memory allocations of a command with tracemalloc and takes a
+    snapshot at every phase boundary, which is marked by the end of a trace span listed
+    in `MEMORY_PHASES`, and when the command exits. Only the top allocation sites of
+    each snapshot are retained, unless the snapshots are dumped into a directory for
+    offline comparison with `tracemalloc.Snapshot.load`. The allocation sites of each
+    phase are ranked by their growth since the previous phase and the peak memory usage
+    is reset after each snapshot, so that every phase reports its own peak.
+    """
+    def __init__(self, dump_dir: str = '', top: int = MEMORY_TOP_N):
+        self.dump_dir = Path(dump_dir) if dump_dir else None
+        self.top = top
+        self.phases: List[MemoryPhase] = list()
+        self.previous: Union[tracemalloc.Snapshot, None] = None
+
+    def start(self) -> None:
+        tracemalloc.start(MEMORY_FRAMES)
+        add_trace_sink(self.record_trace_span)
+
+    def stop(self) -> None:
+        remove_trace_sink(self.record_trace_span)
+        self.snapshot("exit")
+        self.previous = None
+        tracemalloc.stop()
+
+    def record_trace_span(self, span: TraceSpan) -> None:
+        if span.name in MEMORY_PHASES:
+            self.snapshot(MEMORY_PHASES[span.name])
+
+    def snapshot(self, phase: str) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>")
+        ])
+        dump_path = None
+        if self.dump_dir is not None:
+            self.dump_dir.mkdir(parents=True, exist_ok=True)
+            dump_path = self.dump_dir / f"{len(self.phases):02d}-{phase}.snapshot"
+            snapshot.dump(str(dump_path))
+        if self.previous is None:
+            top = snapshot.statistics('lineno')[:self.top]
+        else:
+            top = snapshot.compare_to(self.previous, 'lineno')[:self.top]
+        self.previous = snapshot
+        self.phases.append(MemoryPhase(phase, current, peak, top, dump_path))
+        tracemalloc.reset_peak()
+
+    def print_summary(self) -> None:
+        stream = sys.stderr
+        stream.write("\nMemory profile:\n")
+        for phase in self.phases:
+            stream.write(
+                f"\n  Phase '{phase.name}': current {phase.current / 2**20:.2f} MiB, "
+                f"peak {phase.peak / 2**20:.2f} MiB\n"
+            )
+            for stat in phase.top:
+                frame = stat.traceback[0]
+                size = getattr(stat, 'size_diff', stat.size)
+                count = getattr(stat, 'count_diff', stat.count)
+                stream.write(
+                    f"    {size / 1024:>+10.1f} KiB {count:>+8} blocks  "
+                    f"{frame.filename}:{frame.lineno}\n"
+                )
+            if phase.dump_path is not None:
+                stream.write(f"    Snapshot written to '{phase.dump_path}'.\n")
+        peak = max((phase.peak for phase in self.phases), default=0)
+        stream.write(f"\nPeak traced memory: {peak / 2**20:.2f} MiB\n")
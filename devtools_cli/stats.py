@@ -0,0 +1,197 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import os
+import sys
+import time
+import orjson
+import threading
+from typing import Dict, List, Union
+
+__all__ = [
+    "STATS_OPTION",
+    "STATS_TO_STDERR",
+    "IOCounters",
+    "io_counters",
+    "ConcurrencyStats",
+    "concurrency_stats",
+    "get_peak_rss",
+    "ResourceMonitor"
+]
+
+STATS_OPTION = "--stats"
+STATS_TO_STDERR = "-"
+
+
+def io_counter(name: str) -> property:
+    def getter(self: "IOCounters") -> int:
+        return self.shard()[name]
+
+    def setter(self: "IOCounters", value: int) -> None:
+        self.shard()[name] = value
+
+    return property(getter, setter)
+
+
+class IOCounters:
+    """
+    Process-wide counters of the file system operations performed by the license,
+    version and log commands. Every thread increments its own shard of the counters,
+    so that the instrumented I/O paths of the worker threads can increment them
+    without a lock and without losing increments. The counter attributes read and
+    write the shard of the current thread, while `as_dict` sums up all shards.
+    """
+    __slots__ = ("_local", "_shards", "_lock")
+    __fields__ = ("files_stat", "files_read", "files_written")
+
+    files_stat = io_counter("files_stat")
+    files_read = io_counter("files_read")
+    files_written = io_counter("files_written")
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[Dict[str, int]] = list()
+        self._lock = threading.Lock()
+
+    def shard(self) -> Dict[str, int]:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = dict.fromkeys(self.__fields__, 0)
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def reset(self) -> None:
+        with self._lock:
+            for shard in self._shards:
+                shard.update(dict.fromkeys(self.__fields__, 0))
+
+    def as_dict(self) -> Dict[str, int]:
+        with self._lock:
+            shards = list(self._shards)
+        return {key: sum(shard[key] for shard in shards) for key in self.__fields__}
+
+
+io_counters = IOCounters()
+
+
+class ConcurrencyStats:
+    """
+    The concurrency chosen by the worker pools of the current process: the number of
+    usable CPUs, the final pool size of the largest pool and the peak pool size probed.
+    """
+    __slots__ = ("cpu_limit", "workers", "peak_workers")
+
+    def __init__(self):
+        self.cpu_limit = None
+        self.workers = None
+        self.peak_workers = None
+
+    def reset(self) -> None:
+        self.__init__()
+
+    def update(self, cpu_limit: int, workers: int, peak_workers: int) -> None:
+        self.cpu_limit = cpu_limit
+        self.workers = max(workers, self.workers or 0)
+        self.peak_workers = max(peak_workers, self.peak_workers or 0)
+
+    def as_dict(self) -> Dict[str, Union[int, None]]:
+        return {key: getattr(self, key) for key in self.__slots__}
+
+
+concurrency_stats = ConcurrencyStats()
+
+
+def get_peak_rss() -> int:
+    """
+    Returns the peak resident set size of the current process in bytes.
+    """
+    try:
+        import resource
+    except ImportError:  # pragma: no cover
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss)
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class ResourceMonitor:
+    """
+    This class measures the resources consumed by the current process from the moment
+    of its creation until the report is requested: the wall time, the user and system
+    CPU time, the peak RSS, the bytes read and written according to the operating system,
+    the open file handles, the file system operations counted by `io_counters` and
+    the concurrency chosen by the worker pools.
+    """
+    def __init__(self):
+        import psutil
+        self.process = psutil.Process()
+        self.wall_start = time.perf_counter()
+        self.cpu_start = self.process.cpu_times()
+        self.io_start = self.read_io_counters()
+        io_counters.reset()
+        concurrency_stats.reset()
+
+    def read_io_counters(self) -> Union[tuple, None]:
+        if not hasattr(self.process, 'io_counters'):  # pragma: no cover
+            return None
+        try:
+            io = self.process.io_counters()
+        except Exception:  # pragma: no cover
+            return None
+        return io.read_bytes, io.write_bytes
+
+    def count_open_files(self) -> int:
+        try:
+            if hasattr(self.process, 'num_fds'):
+                return self.process.num_fds()
+            return self.process.num_handles()  # pragma: no cover
+        except Exception:  # pragma: no cover
+            return len(self.process.open_files())
+
+    def report(self) -> Dict[str, Union[int, float, None]]:
+        cpu_end = self.process.cpu_times()
+        io_end = self.read_io_counters()
+        read_bytes = write_bytes = None
+        if self.io_start and io_end:
+            read_bytes = io_end[0] - self.io_start[0]
+            write_bytes = io_end[1] - self.io_start[1]
+        return dict(
+            wall_time_s=round(time.perf_counter() - self.wall_start, 6),
+            cpu_user_s=round(cpu_end.user - self.cpu_start.user, 6),
+            cpu_system_s=round(cpu_end.system - self.cpu_start.system, 6),
+            peak_rss_bytes=get_peak_rss(),
+            read_bytes=read_bytes,
+            write_bytes=write_bytes,
+            open_files=self.count_open_files(),
+            pid=os.getpid(),
+            **io_counters.as_dict(),
+            **concurrency_stats.as_dict()
+        )
+
+    def write_report(self, path: str = STATS_TO_STDERR) -> None:
+        """
+        Writes the resource usage report as JSON into the file at the given
+        path, or as a human-readable table into stderr, if the path is '-'.
+        """
+        report = self.report()
+        if path != STATS_TO_STDERR:
+            with open(path, 'wb') as file:
+                file.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+            return
+        stream = sys.stderr
+        stream.write("\nResource usage:\n")
+        for key, value in report.items():
+            value = 'n/a' if value is None else value
+            stream.write(f"  {key:<16} {value:>14}\n")
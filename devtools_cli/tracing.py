@@ -0,0 +1,232 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import os
+import time
+import atexit
+import orjson
+import inspect
+import threading
+import contextvars
+from functools import wraps
+from typing import Any, Callable, Dict, List, Union
+
+__all__ = [
+    "TRACE_ENV_VAR",
+    "TraceSpan",
+    "JsonLinesSink",
+    "add_trace_sink",
+    "remove_trace_sink",
+    "tracing_enabled",
+    "current_span",
+    "trace_span",
+    "traced",
+    "install_env_trace_sink"
+]
+
+TRACE_ENV_VAR = "DEVTOOLS_TRACE"
+
+TraceSink = Callable[["TraceSpan"], None]
+_sinks: List[TraceSink] = list()
+_current: contextvars.ContextVar = contextvars.ContextVar("devtools_trace_span", default=None)
+
+
+class TraceSpan:
+    """
+    This class records the wall time of a named operation together with the number
+    of bytes and files the operation has processed. Spans are created by `trace_span`
+    and are handed to every registered trace sink when they end.
+    """
+    __slots__ = (
+        "name", "parent", "attrs", "start_ns", "end_ns", "wall_start",
+        "pid", "tid", "bytes_read", "bytes_written", "files", "_token"
+    )
+
+    def __init__(self, name: str, attrs: Dict[str, Any]):
+        self.name = name
+        self.parent: Union[str, None] = None
+        self.attrs = attrs
+        self.start_ns = 0
+        self.end_ns = 0
+        self.wall_start = 0.0
+        self.pid = os.getpid()
+        self.tid = threading.get_ident()
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.files = 0
+        self._token = None
+
+    def __enter__(self) -> "TraceSpan":
+        parent = _current.get()
+        self.parent = parent.name if parent is not None else None
+        self._token = _current.set(self)
+        self.wall_start = time.time()
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.end_ns = time.perf_counter_ns()
+        _current.reset(self._token)
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        for sink in list(_sinks):
+            sink(self)
+
+    @property
+    def duration_ns(self) -> int:
+        return self.end_ns - self.start_ns
+
+    def add(self, *, bytes_read: int = 0, bytes_written: int = 0, files: int = 0) -> None:
+        self.bytes_read += bytes_read
+        self.bytes_written += bytes_written
+        self.files += files
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def to_dict(self) -> dict:
+        return dict(
+            name=self.name,
+            parent=self.parent,
+            start=self.wall_start,
+            duration_ms=self.duration_ns / 1e6,
+            bytes_read=self.bytes_read,
+            bytes_written=self.bytes_written,
+            files=self.files,
+            pid=self.pid,
+            tid=self.tid,
+            attrs=self.attrs
+        )
+
+
+class _NullSpan:
+    """
+    Stand-in for `TraceSpan` when no trace sinks are registered.
+    Every method is a no-op, so that instrumented code stays cheap.
+    """
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        return None
+
+    def add(self, **_: int) -> None:
+        return None
+
+    def set(self, **_: Any) -> None:
+        return None
+
+
+NULL_SPAN = _NullSpan()
+
+
+class JsonLinesSink:
+    """
+    This trace sink appends one JSON object per finished span to a file. Each line is
+    written with a single `os.write` call to a file opened in append mode, so that
+    concurrent processes writing into the same file do not interleave their lines.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self.lock = threading.Lock()
+
+    def __call__(self, span: TraceSpan) -> None:
+        line = orjson.dumps(span.to_dict(), default=str) + b'\n'
+        with self.lock:
+            if self.fd is not None:
+                os.write(self.fd, line)
+
+    def close(self) -> None:
+        with self.lock:
+            if self.fd is not None:
+                os.close(self.fd)
+                self.fd = None
+
+
+def add_trace_sink(sink: TraceSink) -> None:
+    _sinks.append(sink)
+
+
+def remove_trace_sink(sink: TraceSink) -> None:
+    if sink in _sinks:
+        _sinks.remove(sink)
+
+
+def tracing_enabled() -> bool:
+    return bool(_sinks)
+
+
+def current_span() -> Union[TraceSpan, _NullSpan]:
+    return _current.get() or NULL_SPAN
+
+
+def trace_span(name: str, **attrs: Any) -> Union[TraceSpan, _NullSpan]:
+    """
+    Creates a context manager which records the wall time of the enclosed block. When no
+    trace sinks are registered, a shared no-op span is returned instead, so that the cost
+    of an instrumented block is a single function call. The entered span is returned by
+    the `with` statement, which can be used to record the processed bytes and files.
+
+    Args:
+        name: The name of the span, usually in the form of '<area>.<operation>'.
+        attrs: Additional attributes which are attached to the span.
+
+    Returns:
+        A context manager yielding either a `TraceSpan` or a no-op span.
+    """
+    if not _sinks:
+        return NULL_SPAN
+    return TraceSpan(name, attrs)
+
+
+def traced(name: str = None) -> Callable[[Callable], Callable]:
+    """
+    Decorates a function or a coroutine function to run inside a span. The span is
+    named after the qualified name of the function, unless a name is provided.
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_closure(*args, **kwargs) -> Any:
+                if not _sinks:
+                    return await func(*args, **kwargs)
+                with TraceSpan(span_name, dict()):
+                    return await func(*args, **kwargs)
+            return async_closure
+
+        @wraps(func)
+        def closure(*args, **kwargs) -> Any:
+            if not _sinks:
+                return func(*args, **kwargs)
+            with TraceSpan(span_name, dict()):
+                return func(*args, **kwargs)
+        return closure
+
+    return decorator
+
+
+def install_env_trace_sink() -> Union[JsonLinesSink, None]:
+    """
+    Registers a `JsonLinesSink`, if the DEVTOOLS_TRACE environment variable contains
+    the path of the telemetry file. The sink is closed when the interpreter exits.
+    """
+    path = os.environ.get(TRACE_ENV_VAR)
+    if not path:
+        return None
+    sink = JsonLinesSink(path)
+    add_trace_sink(sink)
+    atexit.register(sink.close)
+    return sink
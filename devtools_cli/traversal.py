@@ -0,0 +1,202 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import os
+from pathlib import Path
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Set, Tuple, Union
+from devtools_cli.concurrency import (
+    MAX_WORKERS,
+    IO_OVERSUBSCRIPTION,
+    available_cpus,
+    get_jobs,
+    is_worker_thread
+)
+
+__all__ = [
+    "NameFilter",
+    "ScanResult",
+    "scan_directory",
+    "DirectoryScanner",
+    "walk_tree"
+]
+
+NameFilter = Callable[[str], bool]
+ScanResult = Tuple[List[Tuple[str, bool]], List[str]]
+
+MIN_SCAN_WORKERS = 8
+MAX_PREFETCH = 256
+PARALLEL_SCAN_THRESHOLD = 8
+
+
+def scan_directory(directory: Path, name_filter: NameFilter = None) -> Union[ScanResult, None]:
+    """
+    Lists a directory and resolves the types of its entries. The type lookups may require
+    a stat call per entry on file systems which do not report the entry types, so they
+    are made here, in the scanning thread, rather than by the consumer of the results.
+
+    Args:
+        directory: The directory to list.
+        name_filter: A predicate of the entry names to be matched. Matches all entries if None.
+
+    Returns:
+        The names of the matching entries with whether they are regular files, and the names
+        of the subdirectories, both in the order of the names, or None if the directory cannot
+        be listed.
+    """
+    try:
+        with os.scandir(directory) as scandir_it:
+            entries = list(scandir_it)
+    except OSError:
+        return None
+    # The directory order depends on the file system, so the entries are sorted by name.
+    entries.sort(key=lambda entry: entry.name)
+    matches, subdirs = list(), list()
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.name)
+        except OSError:
+            pass
+        if name_filter is None or name_filter(entry.name):
+            try:
+                is_file = entry.is_file()
+            except OSError:
+                is_file = False
+            matches.append((entry.name, is_file))
+    return matches, subdirs
+
+
+class DirectoryScanner:
+    """
+    This class scans directories ahead of their consumption on a bounded pool of threads,
+    which hides the round trip latency of network file systems. The directories are
+    requested in the order of their discovery and scanned in that order, while the results
+    are taken in any order. At most `prefetch` scans are pending or unconsumed at a time.
+    The pool is only started once more than a few directories have been requested, so that
+    small trees are scanned in the calling thread.
+    """
+    def __init__(self, name_filter: NameFilter = None, workers: int = None, prefetch: int = MAX_PREFETCH):
+        self.name_filter = name_filter
+        self.workers = workers or default_scan_workers()
+        self.prefetch = prefetch
+        self.executor: Union[ThreadPoolExecutor, None] = None
+        self.futures: Dict[Path, Future] = dict()
+        self.wanted: deque = deque()
+        self.scheduled: Set[Path] = set()
+        self.requested = 0
+
+    def __enter__(self) -> "DirectoryScanner":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def request(self, directories: Iterable[Path]) -> None:
+        if self.workers < 2:
+            return
+        for directory in directories:
+            self.wanted.append(directory)
+            self.requested += 1
+        if self.executor is None and self.requested > PARALLEL_SCAN_THRESHOLD:
+            self.executor = ThreadPoolExecutor(self.workers, "devtools-scan")
+        self.pump()
+
+    def pump(self) -> None:
+        if self.executor is None:
+            return
+        while self.wanted and len(self.futures) < self.prefetch:
+            directory = self.wanted.popleft()
+            if directory not in self.scheduled:
+                self.scheduled.add(directory)
+                self.futures[directory] = self.executor.submit(
+                    scan_directory, directory, self.name_filter
+                )
+
+    def get(self, directory: Path) -> Union[ScanResult, None]:
+        future = self.futures.pop(directory, None)
+        if future is None:
+            self.scheduled.add(directory)
+            result = scan_directory(directory, self.name_filter)
+        else:
+            result = future.result()
+        self.pump()
+        return result
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+        self.futures.clear()
+        self.wanted.clear()
+
+
+def default_scan_workers() -> int:
+    jobs = get_jobs()
+    if jobs is not None:
+        return jobs
+    if is_worker_thread():
+        return 1
+    return min(MAX_WORKERS, max(MIN_SCAN_WORKERS, available_cpus() * IO_OVERSUBSCRIPTION))
+
+
+def walk_tree(
+        target: Path,
+        name_filter: NameFilter = None,
+        prune: NameFilter = None,
+        workers: int = None
+) -> Iterator[Tuple[Path, bool]]:
+    """
+    Yields the entries under the target directory, which are matched by the name filter,
+    together with whether each entry is a regular file. The order is fixed on every Python
+    version and file system: the entries of each directory are yielded in the order of their
+    names, and the directories are visited in the order in which `target.rglob(pattern)` visits
+    them on Python 3.12. The directories are scanned concurrently by a `DirectoryScanner` and
+    the entries are yielded as soon as the scans of their directories are complete.
+
+    Args:
+        target: The directory to walk. Nothing is yielded if it is not a directory.
+        name_filter: A predicate of the entry names to be yielded. Yields all entries if None.
+        prune: A predicate of the subdirectory names whose contents are not walked.
+        workers: The number of scanning threads, which defaults to a latency-hiding pool size.
+
+    Returns:
+        An iterator of tuples of the matching paths and their file-ness.
+    """
+    if not target.is_dir():
+        return
+    subdirs: Dict[Path, Union[List[Path], None]] = dict()
+
+    def select(directory: Path) -> Iterator[Tuple[Path, bool]]:
+        subdirs[directory] = None
+        result = scanner.get(directory)
+        if result is None:
+            return
+        matches, names = result
+        children = [directory / name for name in names if not (prune and prune(name))]
+        scanner.request(children)
+        for name, is_file in matches:
+            yield directory / name, is_file
+        subdirs[directory] = children
+
+    with DirectoryScanner(name_filter, workers) as scanner:
+        yield from select(target)
+
+        stack = [target]
+        while stack:
+            directory = stack.pop()
+            children = subdirs.pop(directory, None)
+            if children is None:
+                continue
+            for child in children:
+                yield from select(child)
+            stack += reversed(children)
@@ -10,29 +10,43 @@
 #
 
 import os
+import uuid
+import shutil
+import threading
+import contextvars
 import orjson
+import tempfile
 from pathlib import Path
 from functools import wraps
-from typing import Any, Callable, Literal, Union
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Literal, Tuple, Union, IO
 from pydantic import BaseModel, ValidationError
-from rich.prompt import Confirm
-from rich.pretty import pprint
-from rich import print
+from .tracing import *
+from .stats import *
 from .models import *
 
 GLOBAL_DATA_DIR = ".devtools-cli"
 LOCAL_CONFIG_FILE = ".devtools"
+DEFAULT_FILE_MODE = 0o644
 
 __all__ = [
     "error_printer",
     "check_model_type",
     "get_data_storage_path",
     "find_local_config_file",
+    "read_config_section",
+    "read_config_sections",
+    "write_config_section",
     "read_local_config_file",
     "write_local_config_file",
     "read_file_into_model",
     "write_model_into_file",
+    "atomic_file_writer",
+    "FileTransaction",
+    "file_transaction",
+    "GitHubFileIndex",
     "read_from_github_file",
+    "write_github_variables",
     "write_to_github_file"
 ]
 
@@ -43,6 +57,9 @@ def error_printer(func: Callable) -> Callable:
         try:
             return func(*args, **kwargs)
         except ValidationError as ex:
+            from rich.prompt import Confirm
+            from rich.pretty import pprint
+            from rich import print
             obj = orjson.loads(ex.json())
             part1, part2 = "ERROR! A data object has failed ", " model validation."
             print('-' * len(part1 + f"'{ex.title}'" + part2))
@@ -123,31 +140,113 @@ def get_data_storage_path(subdir='', filename='', create=True) -> Path:
     return data_path
 
 
-def find_local_config_file(*, init_cwd: bool) -> Union[Path, None]:
+def find_local_config_file(*, init_cwd: bool, start: Path = None) -> Union[Path, None]:
     """
     Find the local configuration file.
 
     This function searches for a local configuration file starting from the current working
-    directory and going up to the root directory. If the file is not found and the `init_cwd`
-    keyword argument is True, a new config file is created in the current working directory.
+    directory, or the `start` directory if given, and going up to the root directory. If the
+    file is not found and the `init_cwd` keyword argument is True, a new config file is created
+    in the current working directory.
 
     Returns:
         Either None, if the file is not found and `init_cwd` is False, or an instance
         of `pathlib.Path` representing the path to the local configuration file.
     """
-    current_path = Path.cwd()
-    root = Path(current_path.parts[0])
-
-    while current_path != root:
-        config_path = current_path / LOCAL_CONFIG_FILE
-        if config_path.exists():
+    with trace_span("config.find") as span:
+        current_path = Path(start).absolute() if start is not None else Path.cwd()
+        root = Path(current_path.parts[0])
+
+        while current_path != root:
+            config_path = current_path / LOCAL_CONFIG_FILE
+            span.add(files=1)
+            io_counters.files_stat += 1
+            if config_path.exists():
+                return config_path
+            current_path = current_path.parent
+
+        if init_cwd:
+            config_path = Path.cwd() / LOCAL_CONFIG_FILE
+            config_path.touch(exist_ok=True)
             return config_path
-        current_path = current_path.parent
 
-    if init_cwd:
-        config_path = Path.cwd() / LOCAL_CONFIG_FILE
-        config_path.touch(exist_ok=True)
-        return config_path
+
+def read_config_section(path: Path, model_cls: type[ConfigSection]) -> ConfigSection:
+    """
+    Reads and parses the config file at the given path into an instance of `ConfigSection`.
+    Unlike `read_local_config_file`, validation errors are raised without being reported.
+
+    Raises:
+        TypeError: If the `model_cls` arg is not a subclass of `ConfigSection`.
+        JSONDecodeError: If the file contents cannot be parsed into an object.
+        ValidationError: If the loaded data fails Pydantic model validation.
+        IOError: If there's a problem reading from the config file.
+    """
+    check_model_type(model_cls, DefaultModel, expect="class")
+
+    with trace_span("config.read", section=model_cls.__name__) as span:
+        with open(path, 'rb') as file:
+            data = file.read() or b'{}'
+        span.add(bytes_read=len(data), files=1)
+        io_counters.files_read += 1
+        data = orjson.loads(data)
+        if not isinstance(data, dict):
+            data = dict()
+        return model_cls(**data)
+
+
+def read_config_sections(path: Path, *model_classes: type[ConfigSection]) -> Tuple[ConfigSection, ...]:
+    """
+    Reads the config file at the given path once and parses it into an instance
+    of each of the given `ConfigSection` subclasses, in the order of the classes.
+
+    Raises:
+        TypeError: If any of the `model_classes` is not a subclass of `ConfigSection`.
+        JSONDecodeError: If the file contents cannot be parsed into an object.
+        ValidationError: If the loaded data fails Pydantic model validation.
+        IOError: If there's a problem reading from the config file.
+    """
+    for model_cls in model_classes:
+        check_model_type(model_cls, DefaultModel, expect="class")
+
+    with trace_span("config.read", section=','.join(c.__name__ for c in model_classes)) as span:
+        with open(path, 'rb') as file:
+            data = file.read() or b'{}'
+        span.add(bytes_read=len(data), files=1)
+        io_counters.files_read += 1
+        data = orjson.loads(data)
+        if not isinstance(data, dict):
+            data = dict()
+        return tuple(model_cls(**data) for model_cls in model_classes)
+
+
+def write_config_section(path: Path, model_obj: ConfigSection) -> None:
+    """
+    Serializes and writes a given configuration section into the config file at
+    the given path, leaving the other sections of the config file untouched. The
+    fields which have default values are omitted, while they are equal to them.
+
+    Raises:
+        TypeError: If `model_obj` isn't an instance of `ConfigModel`.
+        IOError: If there's a problem writing to the config file.
+        JSONEncodeError: If the model object can't be serialized.
+    """
+    check_model_type(model_obj, ConfigSection, expect="object")
+
+    with trace_span("config.write", section=model_obj.section) as span:
+        with open(path, 'rb') as file:
+            raw = file.read() or b'{}'
+
+        data = orjson.loads(raw)
+        # The optional fields are only written, if they differ from their defaults.
+        dump = model_obj.model_dump(warnings=False, exclude_defaults=True)
+        data[model_obj.section] = dump
+        dump = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+        with atomic_file_writer(path, 'wb') as file:
+            file.write(dump)
+        span.add(bytes_read=len(raw), bytes_written=len(dump), files=1)
+        io_counters.files_read += 1
 
 
 @error_printer
@@ -170,12 +269,7 @@ def read_local_config_file(model_cls: type[ConfigSection]) -> ConfigSection:
     check_model_type(model_cls, DefaultModel, expect="class")
 
     if path := find_local_config_file(init_cwd=False):
-        with open(path, 'rb') as file:
-            data = file.read() or b'{}'
-        data = orjson.loads(data)
-        if not isinstance(data, dict):
-            data = dict()
-        return model_cls(**data)
+        return read_config_section(path, model_cls)
     return model_cls()
 
 
@@ -194,18 +288,7 @@ def write_local_config_file(model_obj: ConfigSection) -> None:
         JSONEncodeError: If the model object can't be serialized.
     """
     check_model_type(model_obj, ConfigSection, expect="object")
-    path = find_local_config_file(init_cwd=True)
-
-    with open(path, 'rb') as file:
-        data = file.read() or b'{}'
-
-    data = orjson.loads(data)
-    dump = model_obj.model_dump(warnings=False)
-    data[model_obj.section] = dump
-    dump = orjson.dumps(data, option=orjson.OPT_INDENT_2)
-
-    with open(path, 'wb') as file:
-        file.write(dump)
+    write_config_section(find_local_config_file(init_cwd=True), model_obj)
 
 
 @error_printer
@@ -236,6 +319,7 @@ def read_file_into_model(path: Path, model_cls: type[BaseModel]) -> BaseModel:
     with open(path, 'rb') as file:
         data = file.read() or b'{}'
 
+    io_counters.files_read += 1
     data = orjson.loads(data)
     return model_cls(**data)
 
@@ -266,11 +350,210 @@ def write_model_into_file(path: Path, model_obj: BaseModel) -> None:
 
     with open(path, 'wb') as file:
         file.write(data)
+    io_counters.files_written += 1
+
+
+@contextmanager
+def atomic_file_writer(path: Path, mode: Literal['w', 'wb'] = 'w') -> Iterator[IO]:
+    """
+    Opens a temporary file next to the target path for writing and moves it over
+    the target path when the context exits without errors. If an exception is
+    raised inside the context, the temporary file is discarded and the target
+    path is left untouched.
+
+    Args:
+        path: An instance of `pathlib.Path` of the file to be (re-)written.
+        mode: The mode in which the temporary file is opened. Defaults to 'w'.
+
+    Returns:
+        A file object of the temporary file.
+
+    Raises:
+        IOError: If there's a problem writing to or renaming the temporary file.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with open(fd, mode) as file:
+            yield file
+        mode_bits = path.stat().st_mode if path.exists() else DEFAULT_FILE_MODE
+        os.chmod(tmp_name, mode_bits)
+        transaction = _file_transaction.get()
+        if transaction is not None:
+            transaction.record(path)
+        os.replace(tmp_name, path)
+        io_counters.files_written += 1
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+class FileTransaction:
+    """
+    This class records the original state of every file which `atomic_file_writer`
+    replaces while the transaction is active, so that a multi-file operation can be
+    rolled back as a whole. Each write is still atomic on its own, and the later steps
+    of the operation read the files written by the earlier steps. The original files
+    are kept as hard links next to the written files until the transaction ends.
+    """
+    def __init__(self):
+        self._originals: Dict[Path, Union[Path, None]] = dict()
+        self._lock = threading.Lock()
+
+    def record(self, path: Path) -> None:
+        path = Path(os.path.abspath(path))
+        with self._lock:
+            if path in self._originals:
+                return
+            backup = None
+            if path.exists():
+                backup = path.with_name(f".{path.name}.{uuid.uuid4().hex}.bak")
+                try:
+                    os.link(path, backup)
+                except OSError:
+                    shutil.copy2(path, backup)
+            self._originals[path] = backup
+
+    @property
+    def paths(self) -> List[Path]:
+        return list(self._originals)
+
+    def commit(self) -> None:
+        for backup in self._originals.values():
+            if backup is not None:
+                backup.unlink(missing_ok=True)
+        self._originals.clear()
+
+    def rollback(self) -> None:
+        for path, backup in reversed(self._originals.items()):
+            if backup is None:
+                path.unlink(missing_ok=True)
+            else:
+                os.replace(backup, path)
+        self._originals.clear()
+
+
+_file_transaction: contextvars.ContextVar = contextvars.ContextVar("devtools_file_transaction", default=None)
+
+
+@contextmanager
+def file_transaction() -> Iterator[FileTransaction]:
+    """
+    Runs the context as a single transaction of file changes. If an exception is
+    raised inside the context, every file written by `atomic_file_writer` within
+    the context is restored to its original state and the created files are removed.
+    A nested transaction joins the enclosing one. The transaction is scoped to the
+    current context, so it covers the tasks which `adaptive_map` runs on its worker
+    threads, but not the writes of unrelated threads.
+
+    Returns:
+        The active `FileTransaction` instance.
+    """
+    active = _file_transaction.get()
+    if active is not None:
+        yield active
+        return
+
+    transaction = FileTransaction()
+    token = _file_transaction.set(transaction)
+    try:
+        yield transaction
+    except BaseException:
+        transaction.rollback()
+        raise
+    else:
+        transaction.commit()
+    finally:
+        _file_transaction.reset(token)
+
+
+class GitHubFileIndex:
+    """
+    This class indexes the variables of a GitHub Action environment or outputs file.
+    Both the 'name=value' and the multi-line 'name<<DELIMITER' syntaxes are parsed and
+    the later definitions of a variable override the earlier ones. The file is parsed
+    once, and when it has grown, only the appended entries are parsed on the next lookup.
+    """
+    def __init__(self, path: Path):
+        self.path = path
+        self.inode = None
+        self.offset = 0
+        self.values: Dict[str, str] = dict()
+
+    def refresh(self) -> None:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            stat = None
+        if stat is None or stat.st_ino != self.inode or stat.st_size < self.offset:
+            self.inode = stat.st_ino if stat else None
+            self.offset = 0
+            self.values.clear()
+        if stat is None or stat.st_size == self.offset:
+            return
+
+        with open(self.path, 'rb') as file:
+            file.seek(self.offset)
+            data = file.read()
+        io_counters.files_read += 1
+        self.offset += self.parse(data)
+
+    def parse(self, data: bytes) -> int:
+        """
+        Parses the complete entries of the data into the index. A trailing single-line
+        entry without a line break is indexed as well, but it is not consumed, so that
+        it is parsed again once it has been completed.
+
+        Returns:
+            The number of bytes consumed by the complete entries.
+        """
+        lines = data.split(b'\n')
+        complete = len(lines) - 1
+        consumed, index = 0, 0
+        while index < len(lines):
+            entry = lines[index].rstrip(b'\r').decode('utf-8')
+            heredoc = '<<' in entry and ('=' not in entry or entry.index('<<') < entry.index('='))
+            if heredoc:
+                name, delimiter = entry.split('<<', 1)
+                end = index + 1
+                while end < complete and lines[end].rstrip(b'\r').decode('utf-8') != delimiter:
+                    end += 1
+                if end >= complete:
+                    break
+                self.values[name] = b'\n'.join(lines[index + 1:end]).decode('utf-8')
+                consumed += sum(len(line) + 1 for line in lines[index:end + 1])
+                index = end + 1
+                continue
+            if '=' in entry:
+                name, value = entry.split('=', 1)
+                self.values[name] = value
+            if index >= complete:
+                break
+            consumed += len(lines[index]) + 1
+            index += 1
+        return consumed
+
+    def get(self, key: str, default: str = '') -> str:
+        self.refresh()
+        return self.values.get(key, default)
+
+
+_github_file_indexes: Dict[str, GitHubFileIndex] = dict()
+
+
+def get_github_file_path(gh_file: GitHubFile, action: str) -> Path:
+    if gh_file not in os.environ:
+        raise RuntimeError(
+            f"Cannot {action} GitHub Action files "
+            "when not running inside a GitHub Actions runner."
+        )
+    return Path(os.environ[gh_file])
 
 
 def read_from_github_file(key: str, gh_file: GitHubFile) -> str:
     """
-    Reads key-value pairs from GitHub Action files.
+    Reads key-value pairs from GitHub Action files. The file is indexed on the first
+    lookup and only the entries appended since the previous lookup are parsed later.
 
     Args:
         key: Name of the variable to read.
@@ -279,18 +562,59 @@ def read_from_github_file(key: str, gh_file: GitHubFile) -> str:
     Raises:
         RuntimeError: If not running inside a GitHub Actions runner.
     """
-    if gh_file in os.environ:
-        with open(os.environ[gh_file], 'r') as file:
-            lines = file.readlines()
+    path = get_github_file_path(gh_file, "read variables from")
+    index = _github_file_indexes.get(str(path))
+    if index is None:
+        index = _github_file_indexes[str(path)] = GitHubFileIndex(path)
+    return index.get(key)
+
+
+def format_github_variable(key: str, value: str) -> str:
+    if '\n' not in value and '\r' not in value:
+        return f"{key}={value}\n"
+    delimiter = f"ghadelimiter_{uuid.uuid4().hex}"
+    while delimiter in value:  # pragma: no cover
+        delimiter = f"ghadelimiter_{uuid.uuid4().hex}"
+    return f"{key}<<{delimiter}\n{value}\n{delimiter}\n"
+
+
+def write_github_variables(
+        variables: Union[Dict[str, str], Iterable[Tuple[str, str]]],
+        gh_file: GitHubFile
+) -> None:
+    """
+    Appends many key-value pairs to a GitHub Action file with a single write call of
+    the O_APPEND mode, so that the existing contents are neither read nor rewritten and
+    concurrent writers cannot interleave the entries. Values with line breaks are written
+    with the 'name<<DELIMITER' syntax, all other values with the 'name=value' syntax.
 
-        lines = [line.split('=') for line in lines]
-        gh_vars = {line[0]: line[1] for line in lines if len(line) == 2}
-        return gh_vars.get(key, '')
+    Args:
+        variables: A dictionary or an iterable of pairs of the variable keys and values.
+        gh_file: A value of the enum GitHubFile.
 
-    raise RuntimeError(
-        "Cannot read variables from GitHub Action files "
-        "when not running inside a GitHub Actions runner."
-    )
+    Raises:
+        RuntimeError: If not running inside a GitHub Actions runner.
+        ValueError: If a key is empty or contains a line break, '=' or '<<'.
+    """
+    path = get_github_file_path(gh_file, "write variables into")
+    items = variables.items() if isinstance(variables, dict) else variables
+    chunks = list()
+    for key, value in items:
+        if not key or any(x in key for x in ['\n', '\r', '=', '<<']):
+            raise ValueError(f"Invalid GitHub Action variable name: {key!r}")
+        chunks.append(format_github_variable(key, str(value)))
+    data = ''.join(chunks).encode('utf-8')
+    if not data:
+        return
+
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, DEFAULT_FILE_MODE)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    io_counters.files_written += 1
 
 
 def write_to_github_file(key: str, value: str, gh_file: GitHubFile) -> None:
@@ -305,21 +629,4 @@ def write_to_github_file(key: str, value: str, gh_file: GitHubFile) -> None:
     Raises:
         RuntimeError: If not running inside a GitHub Actions runner.
     """
-    if gh_file in os.environ:
-        with open(os.environ[gh_file], 'r') as file:
-            lines = file.readlines()
-
-        lines = [line.split('=') for line in lines]
-        gh_vars = {line[0]: line[1] for line in lines if len(line) == 2}
-
-        gh_vars[key] = value
-        lines = [f"{k}={v}\n" for k, v in gh_vars.items()]
-
-        with open(os.environ[gh_file], 'w') as file:
-            file.writelines(lines)
-            return
-
-    raise RuntimeError(
-        "Cannot write variables into GitHub Action files "
-        "when not running inside a GitHub Actions runner."
-    )
+    write_github_variables({key: value}, gh_file)
@@ -0,0 +1,179 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import os
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Union
+from devtools_cli.errors import DevtoolsError
+from devtools_cli.concurrency import adaptive_map
+from devtools_cli.output import *
+from devtools_cli.tracing import *
+from devtools_cli.utils import LOCAL_CONFIG_FILE
+
+__all__ = [
+    "WORKSPACE_OPTION",
+    "set_workspace_root",
+    "get_workspace_root",
+    "ProjectResult",
+    "discover_projects",
+    "run_in_projects",
+    "report_workspace"
+]
+
+# Directories which never contain project roots of their own.
+PRUNED_DIRNAMES = frozenset({"node_modules", "__pycache__"})
+
+_workspace_root: Union[Path, None] = None
+
+
+def set_workspace_root(root: Union[Path, None]) -> None:
+    global _workspace_root
+    _workspace_root = Path(root).absolute() if root is not None else None
+
+
+def get_workspace_root() -> Union[Path, None]:
+    return _workspace_root
+
+
+@dataclass(frozen=True)
+class ProjectResult:
+    path: Path
+    value: Dict[str, Any] = field(default_factory=dict)
+    error: str = ''
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+
+def discover_projects(root: Path) -> List[Path]:
+    """
+    Finds all directories under the root directory which contain a devtools config file.
+    The walk does not descend into project roots, because devtools configurations cannot
+    be nested, nor into hidden directories and the directories in `PRUNED_DIRNAMES`.
+
+    Returns:
+        The sorted paths of the project root directories.
+    """
+    projects: List[Path] = list()
+    with trace_span("workspace.discover", root=str(root)) as span:
+        stack = [Path(root)]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as scandir_it:
+                    entries = list(scandir_it)
+            except OSError:
+                continue
+            span.add(files=len(entries))
+            if any(e.name == LOCAL_CONFIG_FILE and e.is_file() for e in entries):
+                projects.append(directory)
+                continue
+            for entry in entries:
+                name = entry.name
+                if name.startswith('.') or name in PRUNED_DIRNAMES:
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(Path(entry.path))
+                except OSError:
+                    pass
+    return sorted(projects)
+
+
+def run_in_projects(
+        func: Callable[[Path], Dict[str, Any]],
+        projects: List[Path],
+        root: Path,
+        jobs: int = None
+) -> List[ProjectResult]:
+    """
+    Runs the function for each project root on an autotuned pool of worker threads. The
+    errors of a project are recorded into its result instead of stopping the other projects.
+    The file processing within each project runs sequentially in its worker thread.
+
+    Args:
+        func: A function which takes a project root and returns a dictionary of results.
+        projects: The project root directories.
+        root: The workspace root, which the paths of the results are relative to.
+        jobs: A fixed number of worker threads, autotuned if not given.
+
+    Returns:
+        The results of the projects in the order of the given projects.
+    """
+    def run(project: Path) -> ProjectResult:
+        path = project.relative_to(root)
+        with trace_span("workspace.project", path=str(path)):
+            try:
+                return ProjectResult(path, func(project))
+            except (DevtoolsError, OSError, ValueError) as ex:
+                return ProjectResult(path, error=str(ex) or type(ex).__name__)
+
+    return list(adaptive_map(run, projects, jobs, min_items=2))
+
+
+def report_workspace(
+        console: LazyConsole,
+        results: List[ProjectResult],
+        columns: Dict[str, str],
+        totals: Dict[str, int] = None
+) -> None:
+    """
+    Prints the merged report of a workspace command as a table, or emits it as a
+    single JSON object in the JSON mode. Exits with status 1 if any project failed.
+
+    Args:
+        console: The console of the command.
+        results: The results of the projects.
+        columns: The keys of the project results mapped to their column titles.
+        totals: The totals over all projects, if the command has any.
+    """
+    failed = sum(1 for result in results if not result.ok)
+    if is_json_mode():
+        projects = [
+            dict(path=result.path.as_posix(), **result.value)
+            if result.ok else dict(path=result.path.as_posix(), error=result.error)
+            for result in results
+        ]
+        report = dict(workspace=str(get_workspace_root()), projects=projects, failed=failed)
+        if totals is not None:
+            report['totals'] = totals
+        emit_json(report)
+    else:
+        from rich.table import Table
+        table = Table(title=f"Workspace: {get_workspace_root()}")
+        table.add_column("Project", style="cyan", no_wrap=True)
+        for title in columns.values():
+            table.add_column(title)
+        for result in results:
+            if not result.ok:
+                cells = [f"[bold red]{result.error}[/]", *[''] * (len(columns) - 1)]
+            else:
+                cells = [format_cell(result.value.get(key)) for key in columns]
+            table.add_row(result.path.as_posix(), *cells)
+
+        console.print('')
+        console.print(table)
+        if totals is not None:
+            summary = ', '.join(f"{value} {key}" for key, value in totals.items())
+            console.print(f"Totals over {len(results)} projects: {summary}")
+        if failed:
+            console.print(f"[bold red]{failed} of {len(results)} projects failed.[/]")
+        console.print('')
+    if failed:
+        raise SystemExit(1)
+
+
+def format_cell(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return ', '.join(str(v) for v in value) or '-'
+    return '-' if value is None else str(value)
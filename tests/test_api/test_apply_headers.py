@@ -0,0 +1,74 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import orjson
+import pytest
+from pathlib import Path
+from devtools_cli.api import *
+
+CONFIG = {
+    "license_cmd": {
+        "header": {
+            "title": "MIT License",
+            "year": "2024",
+            "holder": "Holder",
+            "spdx_id": "MIT",
+            "spaces": 3,
+            "oss": True
+        },
+        "paths": ["src"],
+        "file_name": "LICENSE"
+    }
+}
+
+
+@pytest.fixture
+def project(tmp_path) -> Path:
+    (tmp_path / ".devtools").write_bytes(orjson.dumps(CONFIG))
+    (tmp_path / "src/pkg").mkdir(parents=True)
+    (tmp_path / "src/main.py").write_text("print('main')\n")
+    (tmp_path / "src/pkg/util.js").write_text("export {};\n")
+    (tmp_path / "src/notes.txt").write_text("notes\n")
+    return tmp_path
+
+
+def test_apply_headers(project):
+    results = {r.path.as_posix(): r.result for r in apply_headers(project / "src/pkg")}
+    assert results == {
+        "src/main.py": "applied",
+        "src/notes.txt": "unsupported",
+        "src/pkg/util.js": "applied"
+    }
+    assert "MIT License" in (project / "src/main.py").read_text()
+
+    results = {r.result for r in apply_headers(project) if r.path.suffix != ".txt"}
+    assert results == {"skipped"}
+
+
+def test_apply_headers_dry_run(project):
+    results = [r.result for r in apply_headers(project, dry_run=True)]
+    assert results.count("applied") == 2
+    assert (project / "src/main.py").read_text() == "print('main')\n"
+
+
+def test_apply_headers_without_config(tmp_path):
+    with pytest.raises(ConfigFileNotFound):
+        list(apply_headers(tmp_path))
+
+
+def test_apply_headers_files(project, monkeypatch):
+    monkeypatch.chdir(project)
+    (project / "other.py").write_text("print('other')\n")
+    files = ["src/pkg/util.js", project / "other.py", "src/pkg", "src/main.py", "src/pkg/util.js"]
+    results = [(r.path.as_posix(), r.result) for r in apply_headers(project, files=files)]
+    assert results == [("src/pkg/util.js", "applied"), ("src/main.py", "applied")]
+    assert "MIT License" not in (project / "other.py").read_text()
+    assert list(apply_headers(project, files=[])) == []
@@ -0,0 +1,34 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import pytest
+from devtools_cli.api import *
+
+
+@pytest.mark.parametrize("level, kwargs, expected", [
+    ("patch", {}, "1.2.4"),
+    ("minor", {}, "1.3.0"),
+    ("major", {"suffix": "beta"}, "2.0.0-beta"),
+    ("minor", {"downgrade": True}, "1.1.3"),
+    ("patch", {"value": 9}, "1.2.9")
+])
+def test_bump_version(level, kwargs, expected):
+    assert bump_version("1.2.3", level, **kwargs) == expected
+
+
+@pytest.mark.parametrize("version, level, kwargs", [
+    ("invalid", "patch", {}),
+    ("1.2.3", "build", {}),
+    ("0.0.0", "patch", {"downgrade": True})
+])
+def test_bump_version_errors(version, level, kwargs):
+    with pytest.raises(VersionError):
+        bump_version(version, level, **kwargs)
@@ -0,0 +1,59 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import orjson
+import pytest
+from pathlib import Path
+from devtools_cli.api import *
+from devtools_cli.commands.version.models import DigestMode
+
+
+@pytest.fixture
+def project(tmp_path) -> Path:
+    (tmp_path / ".devtools").write_text("{}")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src/main.py").write_text("print('main')\n")
+    return tmp_path
+
+
+def test_track_component(project):
+    assert track_component("app", "src", root=project) == 'created'
+    assert track_component("app", "src", root=project) == 'unchanged'
+    assert track_component("app", "src", ["cache"], root=project) == 'updated'
+
+    digests = component_digests(project)
+    (project / "src/main.py").write_text("print('changed')\n")
+    assert component_digests(project)["app"] != digests["app"]
+
+
+def test_track_component_errors(project):
+    track_component("app", "src", root=project)
+    with pytest.raises(TrackingError):
+        track_component("other", "src", root=project)
+    with pytest.raises(TrackingError):
+        track_component("app", "missing", root=project)
+
+
+def test_set_version(project):
+    track_component("app", "src", root=project)
+    (project / "src/main.py").write_text("print('changed')\n")
+    config = set_version(bump_version(project_version(project), "minor"), root=project)
+    assert config.app_version == "0.1.0"
+    assert config.components[0].hash == component_digests(project)["app"]
+
+
+def test_track_component_omits_defaults(project):
+    track_component("app", "src", root=project)
+    track_component("meta", "src/main.py", mode=DigestMode.METADATA, root=project)
+    config = orjson.loads((project / ".devtools").read_bytes())
+    app, meta = config["version_cmd"]["components"]
+    assert set(app) == {"name", "target", "ignore", "hash", "digest_format"}
+    assert meta["mode"] == "metadata" and "threshold" not in meta
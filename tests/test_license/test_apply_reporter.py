@@ -0,0 +1,62 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import orjson
+from pathlib import Path
+from devtools_cli.commands.license.models import LicenseConfig, ReportFormat
+from devtools_cli.commands.license.reporter import ApplyReporter
+
+
+RESULTS = [
+    (Path("src/a.py"), "applied"),
+    (Path("src/sub/b.py"), "applied"),
+    (Path("src/sub/c.py"), "skipped"),
+    (Path("src/sub/d.bin"), "unsupported"),
+    (Path("e.py"), "skipped"),
+]
+
+
+def test_apply_reporter_aggregates(tmp_path, capsys):
+    with ApplyReporter(LicenseConfig(), tmp_path) as reporter:
+        for path, result in RESULTS:
+            reporter.add(path, result)
+
+    assert reporter.totals == dict(applied=2, skipped=2, unsupported=1)
+    assert reporter.unsupported_types == {".bin"}
+    assert set(reporter.directories) == {"src", "src/sub", "."}
+
+    cumulative = reporter.cumulative_counts()
+    assert (cumulative[''].applied, cumulative[''].skipped) == (2, 2)
+    assert (cumulative['src'].applied, cumulative['src'].skipped) == (2, 1)
+    assert (cumulative['src/sub'].applied, cumulative['src/sub'].skipped) == (1, 1)
+    assert capsys.readouterr().out == ''
+
+
+def test_apply_reporter_verbose_text(tmp_path, capsys):
+    with ApplyReporter(LicenseConfig(), tmp_path, verbose=True) as reporter:
+        for path, result in RESULTS:
+            reporter.add(path, result)
+
+    output = capsys.readouterr().out
+    assert "sub - 1 APPLIED, 1 skipped" in output
+    assert "Licensed 2 files" in output
+    assert "d.bin" not in output
+
+
+def test_apply_reporter_jsonl(tmp_path, capfdbinary):
+    with ApplyReporter(LicenseConfig(), tmp_path, ReportFormat.JSONL) as reporter:
+        for path, result in RESULTS:
+            reporter.add(path, result)
+
+    lines = [orjson.loads(line) for line in capfdbinary.readouterr().out.splitlines()]
+    assert [line["path"] for line in lines[:-1]] == [p.as_posix() for p, _ in RESULTS]
+    assert lines[-1]["type"] == "summary"
+    assert (lines[-1]["applied"], lines[-1]["skipped"], lines[-1]["unsupported"]) == (2, 2, 1)
@@ -0,0 +1,43 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import os
+from pathlib import Path
+from devtools_cli.commands.license.helpers import iter_target_files
+
+
+def test_iter_target_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for directory in ["src/a/b/c", "src/a/d", "src/e.f/g", "src/.hidden", "src/h"]:
+        Path(directory).mkdir(parents=True)
+    for file in [
+        "src/x.py", "src/a/y.js", "src/a/b/z.sh", "src/a/b/c/w.py", "src/a/d/noext",
+        "src/e.f/g/v.ts", "src/.hidden/u.py", "src/h/.bashrc", "src/README.md"
+    ]:
+        Path(file).write_text("content")
+    os.symlink(tmp_path / "src/a", tmp_path / "src/h/link.dir")
+    os.symlink(tmp_path / "src/x.py", tmp_path / "src/h/link.py")
+
+    expected = [
+        "src/.hidden", "src/.hidden/u.py", "src/README.md", "src/a/b/c/w.py", "src/a/b/z.sh",
+        "src/a/y.js", "src/e.f", "src/e.f/g/v.ts", "src/h/.bashrc", "src/h/link.dir",
+        "src/h/link.py", "src/x.py"
+    ]
+    actual = list(iter_target_files(Path("src")))
+
+    assert sorted(path.as_posix() for path, _ in actual) == expected
+    assert all(is_file == path.is_file() for path, is_file in actual)
+
+
+def test_iter_target_files_missing_target(tmp_path):
+    assert list(iter_target_files(tmp_path / "missing")) == []
+    (tmp_path / "file.py").write_text("content")
+    assert list(iter_target_files(tmp_path / "file.py")) == []
@@ -10,6 +10,7 @@
 #
 
 from pathlib import Path
+from devtools_cli.tracing import add_trace_sink, remove_trace_sink
 from devtools_cli.commands.license.header import *
 from devtools_cli.commands.license.models import *
 
@@ -117,3 +118,19 @@ def test_oss_license_header_non_file_path():
 
     result = OSS_HEADER.apply(non_file_path)
     assert result == 'unsupported'
+
+
+def test_license_header_apply_traces_bytes(tmp_path):
+    file_path = tmp_path / "test.py"
+    file_path.write_text("print('äöü')\n", encoding="utf-8")
+    size = file_path.stat().st_size
+    spans = list()
+    add_trace_sink(spans.append)
+    try:
+        OSS_HEADER.apply(file_path)
+    finally:
+        remove_trace_sink(spans.append)
+
+    read, write = [s for s in spans if s.name.startswith("license.")]
+    assert (read.name, read.bytes_read) == ("license.read", size)
+    assert (write.name, write.bytes_written) == ("license.write", file_path.stat().st_size)
@@ -0,0 +1,106 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import os
+import pytest
+from pathlib import Path
+from devtools_cli.utils import write_local_config_file
+from devtools_cli.commands.log.archive import *
+from devtools_cli.commands.log.helpers import *
+from devtools_cli.commands.log.models import *
+
+CONFIG = LogConfig(log_cmd={"gh_user": "user", "gh_repo": "repo"})
+VERSIONS = ["1.0.0", "1.1.0", "2.0.0", "2.1.0", "3.0.0"]
+
+
+@pytest.fixture(autouse=True)
+def set_env_vars():
+    os.environ['PYTEST'] = "true"
+
+
+@pytest.fixture
+def logfile(tmp_path, monkeypatch) -> Path:
+    project = tmp_path / "project"
+    project.mkdir()
+    monkeypatch.setattr(Path, 'cwd', lambda: project)
+    monkeypatch.setattr(Path, 'home', lambda: tmp_path)
+    write_local_config_file(CONFIG)
+    path = project / CHANGELOG_FILENAME
+    path.write_text(Header())
+    for version in VERSIONS:
+        write_new_section(version, [f"change {version}"], CONFIG)
+    return path
+
+
+def test_archive_sections_moves_sections_and_link_refs(logfile):
+    archived = archive_sections(keep=2)
+    assert archived == ["2.0.0", "1.1.0", "1.0.0"]
+
+    hot = parse_changelog(logfile)
+    assert [s.version for s in hot.sections] == ["3.0.0", "2.1.0"]
+    assert hot.sections[0].latest is True
+    assert all(s.url for s in hot.sections)
+
+    archive_dir = get_archive_dir(logfile)
+    major_1 = parse_changelog(archive_dir / "1.md")
+    major_2 = parse_changelog(archive_dir / "2.md")
+    assert [s.version for s in major_1.sections] == ["1.1.0", "1.0.0"]
+    assert [s.version for s in major_2.sections] == ["2.0.0"]
+    assert all(s.url and not s.latest for s in major_1.sections + major_2.sections)
+
+    index = read_archive_index(logfile)
+    assert index.versions == {"2.0.0": "2.md", "1.1.0": "1.md", "1.0.0": "1.md"}
+
+
+def test_archive_sections_merges_into_existing_archives(logfile):
+    archive_sections(keep=3)
+    archive_sections(keep=1)
+
+    major_2 = parse_changelog(get_archive_dir(logfile) / "2.md")
+    assert [s.version for s in major_2.sections] == ["2.1.0", "2.0.0"]
+    assert [s.version for s in parse_changelog(logfile).sections] == ["3.0.0"]
+
+
+def test_archive_sections_keeps_everything_within_limit(logfile):
+    assert archive_sections(keep=10) == []
+    assert not get_archive_dir(logfile).exists()
+
+
+def test_read_archived_section_and_sections(logfile):
+    archive_sections(keep=1)
+    section = read_archived_section("1.1.0")
+    assert section.entries == ["change 1.1.0"]
+    assert read_archived_section("9.9.9") is None
+
+    assert [s.version for s in read_sections()] == list(reversed(VERSIONS))
+    assert [s.version for s in read_sections("1.1.0", "2.1.0")] == ["2.1.0", "2.0.0", "1.1.0"]
+
+
+def test_auto_archive_sections(logfile):
+    config = LogConfig(log_cmd={"gh_user": "user", "gh_repo": "repo", "archive_threshold": 5})
+    assert auto_archive_sections(config) == []
+
+    config.archive_threshold = 4
+    config.archive_keep = 2
+    assert len(auto_archive_sections(config)) == 3
+
+
+def test_archive_sections_moves_prerelease_link_refs(logfile):
+    write_new_section("4.0.0-rc.1", ["change 4.0.0-rc.1"], CONFIG)
+    archive_sections(keep=2)
+
+    hot = parse_changelog(logfile)
+    assert [s.version for s in hot.sections] == ["4.0.0-rc.1", "3.0.0"]
+    assert hot.sections[0].entries == ["change 4.0.0-rc.1"]
+    assert all(s.url for s in hot.sections)
+
+    major_2 = parse_changelog(get_archive_dir(logfile) / "2.md")
+    assert [s.entries for s in major_2.sections] == [["change 2.1.0"], ["change 2.0.0"]]
@@ -0,0 +1,43 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import os
+import pytest
+from devtools_cli.commands.log.helpers import load_release_records
+
+
+@pytest.fixture(autouse=True)
+def set_env_vars():
+    os.environ['PYTEST'] = "true"
+
+
+def test_load_release_records_from_json_array():
+    data = b'[{"version": "v1.0.0", "date": "2024-01-01", "changes": ["a", "b"]}]'
+    records = load_release_records(data)
+    assert len(records) == 1
+    assert records[0].version == "1.0.0"
+    assert records[0].date == "2024-01-01"
+    assert records[0].changes == ["a", "b"]
+
+
+def test_load_release_records_from_json_lines():
+    data = b'{"version": "1.0.0", "changes": "a"}\n\n{"version": "1.1.0", "changes": "b\\nc"}\n'
+    records = load_release_records(data)
+    assert [r.version for r in records] == ["1.0.0", "1.1.0"]
+    assert records[1].changes == ["b", "c"]
+
+
+def test_load_release_records_from_yaml_documents():
+    data = b"version: 1.0.0\ndate: 2024-01-01\nchanges: [a]\n---\n- version: 1.1.0\n"
+    records = load_release_records(data)
+    assert [r.version for r in records] == ["1.0.0", "1.1.0"]
+    assert records[0].date == "2024-01-01"
+    assert records[1].changes == []
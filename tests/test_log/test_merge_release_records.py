@@ -0,0 +1,75 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import os
+import pytest
+from pathlib import Path
+from devtools_cli.utils import write_local_config_file
+from devtools_cli.commands.log.helpers import *
+from devtools_cli.commands.log.models import *
+
+URL = "https://github.com/user/repo/compare"
+CONFIG = LogConfig(log_cmd={"gh_user": "user", "gh_repo": "repo"})
+
+
+@pytest.fixture(autouse=True)
+def set_env_vars():
+    os.environ['PYTEST'] = "true"
+
+
+@pytest.fixture
+def logfile(tmp_path, monkeypatch) -> Path:
+    monkeypatch.setattr(Path, 'cwd', lambda: tmp_path)
+    write_local_config_file(CONFIG)
+    path = tmp_path / CHANGELOG_FILENAME
+    path.write_text(Header())
+    return path
+
+
+def test_merge_release_records_orders_sections_and_link_refs(logfile):
+    write_new_section("1.2.0", ["existing"], CONFIG)
+    records = [
+        ReleaseRecord(version="1.0.0", date="2024-01-01", changes=["first"]),
+        ReleaseRecord(version="1.3.0", date="2024-03-01", changes=["third"]),
+        ReleaseRecord(version="1.2.0", date="2024-02-01", changes=["duplicate"]),
+        ReleaseRecord(version="invalid", date="2024-02-01", changes=[]),
+    ]
+    imported, skipped = merge_release_records(records, CONFIG)
+
+    assert imported == ["1.0.0", "1.3.0"]
+    assert skipped == ["1.2.0", "invalid"]
+
+    lines = read_existing_content(init_cwd=False)
+    labels = [line for line in lines if line.startswith(SECTION_LEVEL)]
+    assert labels[0] == "### [1.3.0] - 2024-03-01 - _latest_"
+    assert labels[1].startswith("### [1.2.0]") and "_latest_" not in labels[1]
+    assert labels[2] == "### [1.0.0] - 2024-01-01"
+    assert lines[-3:] == [
+        f"[1.3.0]: {URL}/1.2.0...1.3.0",
+        f"[1.2.0]: {URL}/1.0.0...1.2.0",
+        f"[1.0.0]: {URL}/1.0.0...1.0.0"
+    ]
+
+
+def test_merge_release_records_without_new_versions(logfile):
+    imported, skipped = merge_release_records([], CONFIG)
+    assert imported == [] and skipped == []
+    assert logfile.read_text() == Header()
+
+
+def test_merge_release_records_with_invalid_labels(logfile):
+    write_new_section("1.0.0", ["existing"], CONFIG)
+    content = logfile.read_text().replace("[1.0.0]", "[Unreleased]")
+    logfile.write_text(content)
+    records = [ReleaseRecord(version="1.1.0", date="2024-01-01", changes=["new"])]
+    with pytest.raises(ValueError, match="Unreleased"):
+        merge_release_records(records, CONFIG)
+    assert logfile.read_text() == content
@@ -0,0 +1,80 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import pytest
+from devtools_cli.commands.log.helpers import *
+from devtools_cli.commands.log.models import *
+
+CHANGELOG = Header() + """
+### [1.1.0] - 2024-02-01 - _latest_
+
+- second
+  - nested
+
+### [1.0.0] - 2024-01-01
+
+- first
+
+[1.1.0]: https://github.com/user/repo/compare/1.0.0...1.1.0
+[1.0.0]: https://github.com/user/repo/compare/1.0.0...1.0.0"""
+
+
+def test_parse_changelog(tmp_path):
+    path = tmp_path / CHANGELOG_FILENAME
+    path.write_text(CHANGELOG)
+    changelog = parse_changelog(path)
+
+    assert [s.version for s in changelog.sections] == ["1.1.0", "1.0.0"]
+    latest = changelog.sections[0]
+    assert latest.date == "2024-02-01"
+    assert latest.latest is True
+    assert latest.entries == ["second\n- nested"]
+    assert latest.url == "https://github.com/user/repo/compare/1.0.0...1.1.0"
+    assert latest.render() == ["- second", "  - nested"]
+    assert changelog.sections[1].latest is False
+
+
+def test_iter_changelog_sections_is_lazy():
+    lines = iter(CHANGELOG.splitlines())
+    sections = iter_changelog_sections(lines)
+    assert next(sections).version == "1.1.0"
+    assert next(lines) == ""
+    assert next(lines) == "- first"
+
+
+def test_filter_sections(tmp_path):
+    sections = [ChangelogSection(version=v) for v in ["2.0.0", "1.1.0", "1.0.0", "bad"]]
+    assert [s.version for s in filter_sections(sections, "1.1.0")] == ["2.0.0", "1.1.0"]
+    assert [s.version for s in filter_sections(sections, None, "1.1.0")] == ["1.1.0", "1.0.0"]
+    assert [s.version for s in filter_sections(sections, "1.0.0", "1.1.0")] == ["1.1.0", "1.0.0"]
+    with pytest.raises(ValueError):
+        filter_sections(sections, "bad")
+
+
+def test_parse_changelog_prerelease_link_refs(tmp_path):
+    path = tmp_path / CHANGELOG_FILENAME
+    path.write_text(Header() + """
+### [2.0.0-rc.1+build.5] - 2024-03-01 - _latest_
+
+- candidate
+
+### [1.0.0] - 2024-01-01
+
+- first
+
+[2.0.0-rc.1+build.5]: https://github.com/user/repo/compare/1.0.0...2.0.0-rc.1+build.5
+[1.0.0]: https://github.com/user/repo/compare/1.0.0...1.0.0""")
+    changelog = parse_changelog(path)
+
+    assert [s.entries for s in changelog.sections] == [["candidate"], ["first"]]
+    assert changelog.sections[0].url.endswith("/compare/1.0.0...2.0.0-rc.1+build.5")
+    assert is_line_link_ref("[2.0.0-rc.1]: https://example.com")
+    assert not is_line_link_ref("[2.0.0] - 2024-01-01")
@@ -0,0 +1,57 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import os
+import pytest
+from pathlib import Path
+from devtools_cli.utils import write_local_config_file
+from devtools_cli.commands.log import helpers
+from devtools_cli.commands.log.helpers import *
+from devtools_cli.commands.log.models import *
+
+CONFIG = LogConfig(log_cmd={"gh_user": "user", "gh_repo": "repo"})
+
+
+@pytest.fixture(autouse=True)
+def set_env_vars():
+    os.environ['PYTEST'] = "true"
+
+
+@pytest.fixture
+def logfile(tmp_path, monkeypatch) -> Path:
+    project = tmp_path / "project"
+    project.mkdir()
+    monkeypatch.setattr(Path, 'cwd', lambda: project)
+    monkeypatch.setattr(Path, 'home', lambda: tmp_path)
+    write_local_config_file(CONFIG)
+    path = project / CHANGELOG_FILENAME
+    path.write_text(Header())
+    return path
+
+
+def test_read_changelog_uses_cache(logfile, monkeypatch):
+    write_new_section("1.0.0", ["first"], CONFIG)
+    assert read_changelog(init_cwd=False).sections[0].entries == ["first"]
+
+    def fail(_):
+        raise AssertionError("changelog was parsed again")
+
+    monkeypatch.setattr(helpers, "parse_changelog", fail)
+    assert read_changelog(init_cwd=False).sections[0].version == "1.0.0"
+
+
+def test_read_changelog_invalidates_cache(logfile):
+    write_new_section("1.0.0", ["first"], CONFIG)
+    assert len(read_changelog(init_cwd=False).sections) == 1
+
+    write_new_section("1.1.0", ["second"], CONFIG)
+    sections = read_changelog(init_cwd=False).sections
+    assert [s.version for s in sections] == ["1.1.0", "1.0.0"]
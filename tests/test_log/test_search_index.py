@@ -0,0 +1,77 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import os
+import pytest
+from pathlib import Path
+from devtools_cli.utils import write_local_config_file
+from devtools_cli.commands.log.archive import *
+from devtools_cli.commands.log.helpers import *
+from devtools_cli.commands.log.search import *
+from devtools_cli.commands.log.index import *
+from devtools_cli.commands.log.models import *
+
+CONFIG = LogConfig(log_cmd={"gh_user": "user", "gh_repo": "repo"})
+
+
+@pytest.fixture(autouse=True)
+def set_env_vars():
+    os.environ['PYTEST'] = "true"
+
+
+@pytest.fixture
+def logfile(tmp_path, monkeypatch) -> Path:
+    project = tmp_path / "project"
+    project.mkdir()
+    monkeypatch.setattr(Path, 'cwd', lambda: project)
+    monkeypatch.setattr(Path, 'home', lambda: tmp_path)
+    write_local_config_file(CONFIG)
+    path = project / CHANGELOG_FILENAME
+    path.write_text(Header())
+    write_new_section("1.0.0", ["Fixed memory leak in parser"], CONFIG)
+    write_new_section("1.1.0", ["Added parser plugins", "Improved docs"], CONFIG)
+    write_new_section("2.0.0", ["Removed deprecated API"], CONFIG)
+    return path
+
+
+def test_search_sections_ranks_matches(logfile):
+    results = search_sections(["parser", "leak"], limit=10)
+    assert [section.version for section, _ in results] == ["1.0.0", "1.1.0"]
+    assert results[0][1] > results[1][1]
+    assert search_sections(["nonexistent"], limit=10) == []
+
+
+def test_search_index_is_updated_incrementally(logfile, monkeypatch):
+    sync_search_index()
+    write_new_section("2.1.0", ["Faster parser"], CONFIG)
+    update_latest_section(["Smaller wheels"])
+
+    index = read_search_index(logfile)
+    assert index.sources[logfile.name] == get_file_identity(logfile)
+    assert set(index.postings["wheels"]) == {"2.1.0"}
+
+    def fail(*_):
+        raise AssertionError("search index was rebuilt")
+
+    monkeypatch.setattr("devtools_cli.commands.log.search.add_indexed_section", fail)
+    results = search_sections(["parser"], limit=1)
+    assert results[0][0].version == "2.1.0"
+
+
+def test_search_sections_across_archives(logfile):
+    sync_search_index()
+    archive_sections(keep=1)
+
+    results = search_sections(["leak"], limit=10)
+    assert [section.version for section, _ in results] == ["1.0.0"]
+    index = read_search_index(logfile)
+    assert index.sections["1.0.0"].source == f"{ARCHIVE_DIRNAME}/1.md"
+    assert index.sections["2.0.0"].source == CHANGELOG_FILENAME
@@ -0,0 +1,75 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import os
+import pytest
+from pathlib import Path
+from datetime import date
+from devtools_cli.utils import write_local_config_file
+from devtools_cli.commands.log.helpers import *
+from devtools_cli.commands.log.models import *
+
+TODAY = date.today().isoformat()
+URL = "https://github.com/user/repo/compare"
+
+
+@pytest.fixture(autouse=True)
+def set_env_vars():
+    os.environ['PYTEST'] = "true"
+
+
+@pytest.fixture
+def logfile(tmp_path, monkeypatch) -> Path:
+    monkeypatch.setattr(Path, 'cwd', lambda: tmp_path)
+    write_local_config_file(LogConfig(log_cmd={"gh_user": "user", "gh_repo": "repo"}))
+    path = tmp_path / CHANGELOG_FILENAME
+    path.write_text(Header())
+    return path
+
+
+def test_write_new_section_into_empty_changelog(logfile):
+    write_new_section("1.0.0", "first\nsecond")
+
+    assert read_existing_content(init_cwd=False) == [
+        f"### [1.0.0] - {TODAY} - _latest_",
+        "",
+        "- first",
+        "- second",
+        "",
+        f"[1.0.0]: {URL}/1.0.0...1.0.0"
+    ]
+
+
+def test_write_new_section_moves_latest_label_and_link_refs(logfile):
+    write_new_section("1.0.0", ["first"])
+    write_new_section("1.1.0", ["second"])
+
+    assert read_existing_content(init_cwd=False) == [
+        f"### [1.1.0] - {TODAY} - _latest_",
+        "",
+        "- second",
+        "",
+        f"### [1.0.0] - {TODAY}",
+        "",
+        "- first",
+        "",
+        f"[1.1.0]: {URL}/1.0.0...1.1.0",
+        f"[1.0.0]: {URL}/1.0.0...1.0.0"
+    ]
+
+
+def test_write_new_section_preserves_header(logfile):
+    write_new_section("1.0.0", ["first"])
+    write_new_section("1.1.0", ["second"])
+
+    text = logfile.read_text()
+    assert text.startswith(Header() + "\n\n### [1.1.0]")
+    assert not list(logfile.parent.glob(f".{CHANGELOG_FILENAME}.*"))
@@ -0,0 +1,60 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import time
+import threading
+from devtools_cli.stats import concurrency_stats
+from devtools_cli.concurrency import *
+
+
+def test_read_cgroup_cpu_limit_v2(tmp_path):
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    assert read_cgroup_cpu_limit(tmp_path) is None
+    (tmp_path / "cpu.max").write_text("250000 100000\n")
+    assert read_cgroup_cpu_limit(tmp_path) == 2.5
+
+
+def test_read_cgroup_cpu_limit_v1(tmp_path):
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu/cpu.cfs_quota_us").write_text("-1\n")
+    (tmp_path / "cpu/cpu.cfs_period_us").write_text("100000\n")
+    assert read_cgroup_cpu_limit(tmp_path) is None
+    (tmp_path / "cpu/cpu.cfs_quota_us").write_text("50000\n")
+    assert read_cgroup_cpu_limit(tmp_path) == 0.5
+    assert read_cgroup_cpu_limit(tmp_path / "missing") is None
+
+
+def test_adaptive_map_sequential():
+    threads = set()
+
+    def func(item: int) -> int:
+        threads.add(threading.get_ident())
+        return item * 2
+
+    assert list(adaptive_map(func, range(100), jobs=1)) == [i * 2 for i in range(100)]
+    assert list(adaptive_map(func, range(10))) == [i * 2 for i in range(10)]
+    assert threads == {threading.get_ident()}
+
+
+def test_adaptive_map_grows_pool_for_blocking_work():
+    def func(item: int) -> int:
+        time.sleep(0.001)
+        return item
+
+    concurrency_stats.reset()
+    assert list(adaptive_map(func, range(600))) == list(range(600))
+    assert concurrency_stats.peak_workers > 1
+
+
+def test_autotuner_fixed_jobs():
+    tuner = Autotuner(jobs=3)
+    assert tuner.workers == tuner.max_workers == 3
+    assert tuner.settled
@@ -0,0 +1,63 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import pytest
+import threading
+from pathlib import Path
+from devtools_cli.concurrency import adaptive_map
+from devtools_cli.utils import atomic_file_writer, file_transaction
+
+
+def write(path: Path, text: str) -> None:
+    with atomic_file_writer(path) as file:
+        file.write(text)
+
+
+def test_file_transaction_commit(tmp_path: Path):
+    (tmp_path / "a.txt").write_text("old")
+    with file_transaction() as transaction:
+        write(tmp_path / "a.txt", "new")
+        write(tmp_path / "b.txt", "created")
+        assert (tmp_path / "a.txt").read_text() == "new"
+        assert transaction.paths == [tmp_path / "a.txt", tmp_path / "b.txt"]
+
+    assert (tmp_path / "a.txt").read_text() == "new"
+    assert (tmp_path / "b.txt").read_text() == "created"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.txt", "b.txt"]
+
+
+def test_file_transaction_rollback(tmp_path: Path):
+    (tmp_path / "a.txt").write_text("old")
+    with pytest.raises(RuntimeError):
+        with file_transaction():
+            write(tmp_path / "a.txt", "new")
+            with file_transaction():
+                write(tmp_path / "a.txt", "newer")
+                write(tmp_path / "b.txt", "created")
+            raise RuntimeError()
+
+    assert (tmp_path / "a.txt").read_text() == "old"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.txt"]
+
+
+def test_file_transaction_scope(tmp_path: Path):
+    paths = [tmp_path / f"{i}.txt" for i in range(8)]
+    other = tmp_path / "other.txt"
+    with pytest.raises(RuntimeError):
+        with file_transaction() as transaction:
+            list(adaptive_map(lambda path: write(path, "created"), paths, jobs=4, min_items=1))
+            thread = threading.Thread(target=write, args=(other, "unrelated"))
+            thread.start()
+            thread.join()
+            assert sorted(transaction.paths) == paths
+            raise RuntimeError()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["other.txt"]
@@ -0,0 +1,71 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import pytest
+from pathlib import Path
+from devtools_cli.models import GitHubFile
+from devtools_cli.utils import *
+
+
+@pytest.fixture
+def gh_output(tmp_path, monkeypatch) -> Path:
+    path = tmp_path / "github_output"
+    path.write_text("existing=value\n")
+    monkeypatch.setenv(GitHubFile.OUT.value, str(path))
+    return path
+
+
+def test_write_github_variables(gh_output):
+    write_github_variables({"version": "1.2.3", "query": "a=b&c=d"}, GitHubFile.OUT)
+    write_to_github_file("notes", "line 1\nline 2", GitHubFile.OUT)
+    lines = gh_output.read_text().splitlines()
+
+    assert lines[:3] == ["existing=value", "version=1.2.3", "query=a=b&c=d"]
+    assert lines[3].startswith("notes<<ghadelimiter_")
+    assert lines[4:6] == ["line 1", "line 2"]
+    assert lines[6] == lines[3].split("<<")[1]
+
+
+def test_read_from_github_file(gh_output):
+    write_github_variables([("a", "1"), ("b", "x=y"), ("c", "one\ntwo"), ("a", "2")], GitHubFile.OUT)
+    assert read_from_github_file("a", GitHubFile.OUT) == "2"
+    assert read_from_github_file("b", GitHubFile.OUT) == "x=y"
+    assert read_from_github_file("c", GitHubFile.OUT) == "one\ntwo"
+    assert read_from_github_file("existing", GitHubFile.OUT) == "value"
+
+    write_to_github_file("d", "appended", GitHubFile.OUT)
+    assert read_from_github_file("d", GitHubFile.OUT) == "appended"
+    assert read_from_github_file("missing", GitHubFile.OUT) == ""
+
+
+def test_github_file_index_partial_entries(tmp_path):
+    path = tmp_path / "github_env"
+    path.write_bytes(b"a=1\nb<<EOF\nfirst\n")
+    index = GitHubFileIndex(path)
+    assert index.get("a") == "1"
+    assert index.get("b") == ""
+
+    with path.open("ab") as file:
+        file.write(b"second\nEOF\nc=unfinish")
+    assert index.get("b") == "first\nsecond"
+    assert index.get("c") == "unfinish"
+
+    with path.open("ab") as file:
+        file.write(b"ed\n")
+    assert index.get("c") == "unfinished"
+
+
+def test_write_github_variables_errors(gh_output, monkeypatch):
+    with pytest.raises(ValueError):
+        write_github_variables({"bad=key": "value"}, GitHubFile.OUT)
+    monkeypatch.delenv(GitHubFile.OUT.value)
+    with pytest.raises(RuntimeError):
+        write_to_github_file("key", "value", GitHubFile.OUT)
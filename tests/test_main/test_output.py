@@ -0,0 +1,52 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import pytest
+import orjson
+from devtools_cli.output import *
+
+
+@pytest.fixture
+def json_mode():
+    set_json_mode(True)
+    yield
+    set_json_mode(False)
+
+
+def test_lazy_console_defers_creation():
+    console = LazyConsole(soft_wrap=True)
+    assert console._console is None
+    assert console.soft_wrap is True
+    assert console._console is not None
+
+
+def test_emit_json(capsys):
+    emit_json(dict(version="1.2.3", items=[1, 2]))
+    out = capsys.readouterr().out
+    assert out.endswith('\n')
+    assert orjson.loads(out) == dict(version="1.2.3", items=[1, 2])
+
+
+def test_exit_with_error_text(capsys):
+    console = LazyConsole()
+    with pytest.raises(SystemExit) as ex:
+        exit_with_error(console, "Something failed.")
+    assert not ex.value.code
+    assert "ERROR! Something failed." in capsys.readouterr().out
+
+
+def test_exit_with_error_json(capsys, json_mode):
+    console = LazyConsole()
+    with pytest.raises(SystemExit) as ex:
+        exit_with_error(console, "Something failed.")
+    assert ex.value.code == 1
+    assert console._console is None
+    assert orjson.loads(capsys.readouterr().out) == dict(error="Something failed.")
@@ -0,0 +1,78 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import pstats
+import tracemalloc
+import orjson
+from devtools_cli.profiling import Profiler, MemoryProfiler, pop_global_option
+from devtools_cli.tracing import trace_span
+
+
+def test_pop_global_option():
+    argv = ["devtools", "--profile", "log", "view"]
+    assert pop_global_option(argv, "--profile", "default") == "default"
+    assert argv == ["devtools", "log", "view"]
+
+    argv = ["devtools", "log", "--profile=out", "view"]
+    assert pop_global_option(argv, "--profile", "default") == "out"
+    assert argv == ["devtools", "log", "view"]
+
+    argv = ["devtools", "log", "--", "--profile"]
+    assert pop_global_option(argv, "--profile", "default") is None
+    assert argv == ["devtools", "log", "--", "--profile"]
+
+    argv = ["devtools", "--workspace", "root", "log", "view"]
+    assert pop_global_option(argv, "--workspace", ".", takes_arg=True) == "root"
+    assert argv == ["devtools", "log", "view"]
+
+
+def test_profiler_writes_pstats_and_trace(tmp_path, capsys):
+    profiler = Profiler(str(tmp_path / "out.pstats"))
+    profiler.enable()
+    with profiler.span("outer", argv="test"):
+        with profiler.span("inner"):
+            sum(range(1000))
+    profiler.disable()
+    profiler.write()
+    profiler.print_summary()
+
+    assert pstats.Stats(str(tmp_path / "out.pstats")).total_calls > 0
+
+    trace = orjson.loads((tmp_path / "out.trace.json").read_bytes())
+    events = {e["name"]: e for e in trace["traceEvents"]}
+    assert set(events) == {"outer", "inner"}
+    assert events["outer"]["ph"] == "X"
+    assert events["outer"]["args"] == {"argv": "test"}
+    assert events["outer"]["dur"] >= events["inner"]["dur"]
+
+    assert "Profiled spans" in capsys.readouterr().err
+
+
+def test_memory_profiler_phases(tmp_path, capsys):
+    profiler = MemoryProfiler(str(tmp_path / "snapshots"))
+    profiler.start()
+    with trace_span("license.apply"):
+        data = [bytearray(1024) for _ in range(100)]
+    with trace_span("license.read"):
+        pass
+    profiler.stop()
+    profiler.print_summary()
+
+    assert [phase.name for phase in profiler.phases] == ["process", "exit"]
+    assert profiler.phases[0].peak >= 100 * 1024
+    assert tracemalloc.is_tracing() is False
+
+    snapshot = tracemalloc.Snapshot.load(str(profiler.phases[0].dump_path))
+    assert len(snapshot.traces) > 0
+    assert len(data) == 100
+
+    output = capsys.readouterr().err
+    assert "Phase 'process'" in output and "Peak traced memory" in output
@@ -0,0 +1,44 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+
+import sys
+import subprocess
+from pathlib import Path
+from devtools_cli.main import run_cli
+from devtools_cli.workspace import get_workspace_root, set_workspace_root
+from devtools_cli.concurrency import get_jobs, set_jobs
+
+
+def test_main_imports_no_command_dependencies():
+    code = (
+        "import sys, devtools_cli.main; "
+        "print([m for m in ('devtools_cli.workspace', 'devtools_cli.utils', 'pydantic') if m in sys.modules])"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_run_cli_applies_settings_in_import_phase(tmp_path, monkeypatch):
+    seen = dict()
+
+    def loader():
+        seen.update(root=get_workspace_root(), jobs=get_jobs())
+        return lambda: None
+
+    monkeypatch.setattr(sys, "argv", ["devtools", "--workspace", str(tmp_path), "--jobs", "3", "version"])
+    try:
+        run_cli(loader)
+    finally:
+        set_workspace_root(None)
+        set_jobs(None)
+    assert seen == dict(root=Path(tmp_path), jobs=3)
+    assert sys.argv == ["devtools", "version"]
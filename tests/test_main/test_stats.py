@@ -0,0 +1,54 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import orjson
+from devtools_cli.stats import *
+from devtools_cli.concurrency import adaptive_map
+from devtools_cli.commands.version.helpers import digest_directory
+
+
+def test_io_counters(tmp_path):
+    for name in ["a.txt", "b.txt", "c.txt"]:
+        (tmp_path / name).write_text(name)
+    io_counters.reset()
+    digest_directory(tmp_path, [])
+    assert io_counters.as_dict() == dict(files_stat=0, files_read=3, files_written=0)
+
+
+def test_io_counters_threads():
+    def count(_) -> None:
+        for _ in range(1000):
+            io_counters.files_read += 1
+
+    io_counters.reset()
+    list(adaptive_map(count, range(64), jobs=8))
+    assert io_counters.as_dict()["files_read"] == 64000
+    io_counters.reset()
+    assert io_counters.as_dict() == dict(files_stat=0, files_read=0, files_written=0)
+
+
+def test_resource_monitor_report(tmp_path, capsys):
+    monitor = ResourceMonitor()
+    io_counters.files_read += 2
+    report = monitor.report()
+
+    assert report["wall_time_s"] >= 0
+    assert report["cpu_user_s"] >= 0 and report["cpu_system_s"] >= 0
+    assert report["peak_rss_bytes"] > 0
+    assert report["open_files"] > 0
+    assert report["files_read"] == 2
+
+    path = tmp_path / "stats.json"
+    monitor.write_report(str(path))
+    assert set(orjson.loads(path.read_bytes())) == set(report)
+
+    monitor.write_report(STATS_TO_STDERR)
+    assert "Resource usage:" in capsys.readouterr().err
@@ -0,0 +1,80 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import asyncio
+import orjson
+from devtools_cli.tracing import *
+
+
+def test_trace_span_disabled():
+    assert tracing_enabled() is False
+    with trace_span("noop") as span:
+        span.add(bytes_read=10, files=1)
+        span.set(key="value")
+    assert not isinstance(span, TraceSpan)
+
+
+def test_trace_span_sink():
+    spans = list()
+    add_trace_sink(spans.append)
+    try:
+        with trace_span("outer", key="value") as outer:
+            with trace_span("inner") as inner:
+                inner.add(bytes_read=10, bytes_written=5, files=2)
+    finally:
+        remove_trace_sink(spans.append)
+
+    assert [s.name for s in spans] == ["inner", "outer"]
+    assert inner.parent == "outer" and outer.parent is None
+    assert (inner.bytes_read, inner.bytes_written, inner.files) == (10, 5, 2)
+    assert outer.attrs == {"key": "value"}
+    assert outer.duration_ns >= inner.duration_ns > 0
+    assert tracing_enabled() is False
+
+
+def test_traced_decorator():
+    @traced("sync")
+    def sync_func(value):
+        return value * 2
+
+    @traced("async")
+    async def async_func(value):
+        await asyncio.sleep(0)
+        return value * 3
+
+    spans = list()
+    add_trace_sink(spans.append)
+    try:
+        assert sync_func(2) == 4
+        assert asyncio.run(async_func(2)) == 6
+    finally:
+        remove_trace_sink(spans.append)
+    assert [s.name for s in spans] == ["sync", "async"]
+
+
+def test_json_lines_sink(tmp_path, monkeypatch):
+    path = tmp_path / "trace.jsonl"
+    monkeypatch.setenv(TRACE_ENV_VAR, str(path))
+    sink = install_env_trace_sink()
+    try:
+        with trace_span("first") as span:
+            span.add(bytes_read=3, files=1)
+        with trace_span("second", name_attr="x"):
+            pass
+    finally:
+        remove_trace_sink(sink)
+        sink.close()
+
+    lines = [orjson.loads(line) for line in path.read_bytes().splitlines()]
+    assert [line["name"] for line in lines] == ["first", "second"]
+    assert lines[0]["bytes_read"] == 3 and lines[0]["files"] == 1
+    assert lines[1]["attrs"] == {"name_attr": "x"}
+    assert all(line["pid"] > 0 and line["duration_ms"] >= 0 for line in lines)
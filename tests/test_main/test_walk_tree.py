@@ -0,0 +1,63 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+from pathlib import Path
+from devtools_cli.traversal import *
+
+
+def make_tree(root: Path) -> None:
+    for i in range(4):
+        for j in range(4):
+            directory = root / f"dir{i}" / f"sub{j}.d"
+            directory.mkdir(parents=True)
+            (directory / f"file{j}.py").write_text("content")
+            (directory / "noext").write_text("content")
+        (root / f"dir{i}" / ".hidden").mkdir()
+        (root / f"dir{i}" / ".hidden" / "x.py").write_text("content")
+
+
+def test_walk_tree_order(tmp_path):
+    for path in ["b/x.py", "b/a.txt", "a/c/y.py", "a/z.py", ".h/w.py", "noext"]:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text("content")
+    expected = [
+        ".h", "a", "b", "noext", ".h/w.py", "a/c",
+        "a/z.py", "b/a.txt", "b/x.py", "a/c/y.py"
+    ]
+    for workers in [1, 4]:
+        walked = list(walk_tree(tmp_path, workers=workers))
+        assert [path.relative_to(tmp_path).as_posix() for path, _ in walked] == expected
+        assert all(is_file == path.is_file() for path, is_file in walked)
+
+        walked = [path for path, _ in walk_tree(tmp_path, lambda n: '.' in n, workers=workers)]
+        assert [path.relative_to(tmp_path).as_posix() for path in walked] == [
+            ".h", ".h/w.py", "a/z.py", "b/a.txt", "b/x.py", "a/c/y.py"
+        ]
+
+
+def test_walk_tree_prune(tmp_path):
+    make_tree(tmp_path)
+    walked = [path for path, _ in walk_tree(tmp_path, prune=lambda n: n.startswith('.'), workers=4)]
+    expected = [p for p, _ in walk_tree(tmp_path, workers=1) if '.hidden' not in p.parent.parts]
+    assert walked == expected
+    assert sorted(walked) == sorted(p for p in tmp_path.rglob('*') if '.hidden' not in p.parent.parts)
+
+
+def test_directory_scanner_prefetch(tmp_path):
+    make_tree(tmp_path)
+    directories = sorted(p for p in tmp_path.rglob('*') if p.is_dir())
+    with DirectoryScanner(workers=2, prefetch=3) as scanner:
+        scanner.request(directories)
+        assert len(scanner.futures) == 3
+        for directory in reversed(directories):
+            assert scanner.get(directory) == scan_directory(directory)
+            assert len(scanner.futures) <= 3
+    assert scan_directory(tmp_path / "missing") is None
@@ -0,0 +1,62 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import orjson
+import pytest
+from pathlib import Path
+from devtools_cli.output import set_json_mode, LazyConsole
+from devtools_cli.errors import ConfigFileNotFound
+from devtools_cli.workspace import *
+
+
+@pytest.fixture
+def workspace(tmp_path) -> Path:
+    for directory in ["svc-a", "svc-b", "svc-b/nested", "libs/svc-c", "node_modules/pkg", ".cache/svc"]:
+        (tmp_path / directory).mkdir(parents=True)
+        (tmp_path / directory / ".devtools").write_text("{}")
+    (tmp_path / "docs").mkdir()
+    set_workspace_root(tmp_path)
+    yield tmp_path
+    set_workspace_root(None)
+
+
+def test_discover_projects(workspace):
+    projects = [p.relative_to(workspace).as_posix() for p in discover_projects(workspace)]
+    assert projects == ["libs/svc-c", "svc-a", "svc-b"]
+
+
+def test_run_in_projects(workspace):
+    def func(root: Path) -> dict:
+        if root.name == "svc-b":
+            raise ConfigFileNotFound("broken")
+        return dict(name=root.name)
+
+    results = run_in_projects(func, discover_projects(workspace), workspace, jobs=2)
+    assert [r.path.as_posix() for r in results] == ["libs/svc-c", "svc-a", "svc-b"]
+    assert [r.value.get("name") for r in results] == ["svc-c", "svc-a", None]
+    assert [r.error for r in results] == ['', '', "broken"]
+
+
+def test_report_workspace_json(workspace, capsys):
+    results = [ProjectResult(Path("a"), dict(count=2)), ProjectResult(Path("b"), error="broken")]
+    set_json_mode(True)
+    try:
+        with pytest.raises(SystemExit) as ex:
+            report_workspace(LazyConsole(), results, dict(count="Count"), dict(count=2))
+    finally:
+        set_json_mode(False)
+    assert ex.value.code == 1
+    assert orjson.loads(capsys.readouterr().out) == dict(
+        workspace=str(workspace),
+        projects=[dict(path="a", count=2), dict(path="b", error="broken")],
+        failed=1,
+        totals=dict(count=2)
+    )
@@ -0,0 +1,75 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import orjson
+import pytest
+from pathlib import Path
+from typer.testing import CliRunner
+from devtools_cli.api import project_status, track_component
+from devtools_cli.commands.release.main import app
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch) -> Path:
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src/main.py").write_text("print('app')\n")
+    (tmp_path / "pyproject.toml").write_text('[project]\nversion = "1.0.0"\n')
+    (tmp_path / ".devtools").write_bytes(orjson.dumps(dict(
+        version_cmd=dict(
+            app_version="1.0.0",
+            track_descriptor=True,
+            track_chart=False,
+            components=[
+                dict(name="app", target="src", ignore=[], hash=""),
+                dict(name="alias", target="src/", ignore=[], hash="")
+            ]
+        ),
+        log_cmd=dict(gh_user="user", gh_repo="repo")
+    )))
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_release(project):
+    result = runner.invoke(app, ["--minor", "--changes", "Added a feature"])
+    assert result.exit_code == 0
+
+    config = orjson.loads((project / ".devtools").read_bytes())["version_cmd"]
+    assert config["app_version"] == "1.1.0"
+    assert config["components"][0]["hash"] == config["components"][1]["hash"] != ""
+    assert (project / "pyproject.toml").read_text() == '[project]\nversion = "1.1.0"\n'
+    assert "### [1.1.0]" in (project / "CHANGELOG.md").read_text()
+
+    result = runner.invoke(app, ["--minor", "--value", "1"])
+    assert result.exit_code == 0
+    assert "duplicate" in result.stdout
+
+
+def test_release_rollback(project, monkeypatch):
+    before = {p: p.read_bytes() for p in project.rglob("*") if p.is_file()}
+
+    def fail(*_, **__):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("devtools_cli.commands.release.main.write_new_section", fail)
+    result = runner.invoke(app, ["--major"])
+    assert "rolled back" in result.stdout
+    after = {p: p.read_bytes() for p in project.rglob("*") if p.is_file()}
+    assert after == before
+
+
+def test_release_hashes_changelog(project):
+    track_component("root", ".", root=project)
+    result = runner.invoke(app, ["--patch", "--changes", "Fixed a bug"])
+    assert result.exit_code == 0
+    assert not any(comp["changed"] for comp in project_status(project)["components"])
@@ -0,0 +1,73 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+
+import orjson
+import pytest
+from pathlib import Path
+from typer.testing import CliRunner
+from devtools_cli import api
+from devtools_cli.api import project_status, track_component
+from devtools_cli.commands.version.main import app
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch) -> Path:
+    (tmp_path / "packages/a").mkdir(parents=True)
+    (tmp_path / "packages/b").mkdir(parents=True)
+    (tmp_path / "packages/a/package.json").write_text('{\n  "version": "1.0.0"\n}\n')
+    (tmp_path / "packages/b/package.json").write_text('{\n  "version": "1.0.0"\n}\n')
+    (tmp_path / ".devtools").write_bytes(orjson.dumps(dict(version_cmd=dict(
+        app_version="1.0.0",
+        track_descriptor=False,
+        track_chart=False,
+        components=[]
+    ))))
+    track_component("root", ".", root=tmp_path)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_bump_monorepo(project):
+    result = runner.invoke(app, ["bump", "--minor", "--monorepo"], input="y\n")
+    assert result.exit_code == 0
+    assert '"version": "1.1.0"' in (project / "packages/b/package.json").read_text()
+    status = project_status(project)
+    assert status["version"] == "1.1.0"
+    assert not any(comp["changed"] for comp in status["components"])
+
+
+def test_bump_monorepo_rollback(project, monkeypatch):
+    before = {p: p.read_bytes() for p in project.rglob("*") if p.is_file()}
+    update = api.update_descriptor_version
+
+    def failing_update(path: Path, new_version: str) -> str:
+        if path.parent.name == "b":
+            raise OSError("disk full")
+        return update(path, new_version)
+
+    monkeypatch.setattr(api, "update_descriptor_version", failing_update)
+    result = runner.invoke(app, ["bump", "--minor", "--monorepo"], input="y\n")
+    assert "disk full" in result.stdout
+    after = {p: p.read_bytes() for p in project.rglob("*") if p.is_file()}
+    assert after == before
+
+
+def test_bump_ignores_secondary_descriptors(project):
+    (project / "pyproject.toml").write_text('[project]\nversion = "1.0.0"\n')
+    (project / "Chart.yaml").write_text("version: 0.3.0\n")
+    result = runner.invoke(app, ["bump", "--minor"], input="y\n")
+    assert result.exit_code == 0
+    assert "Successfully bumped" in result.stdout
+    assert project_status(project)["version"] == "1.1.0"
+    assert (project / "Chart.yaml").read_text() == "version: 0.3.0\n"
@@ -0,0 +1,53 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import orjson
+import pytest
+from pathlib import Path
+from typer.testing import CliRunner
+from devtools_cli.api import track_component
+from devtools_cli.models import GitHubFile
+from devtools_cli.commands.version.main import app
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch) -> Path:
+    (tmp_path / ".devtools").write_text("{}")
+    for name in ["app", "lib"]:
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "main.py").write_text(f"print('{name}')\n")
+        track_component(name, name, root=tmp_path)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv(GitHubFile.OUT.value, str(tmp_path / "gh_output"))
+    return tmp_path
+
+
+def test_echo_all(project):
+    (project / "lib/main.py").write_text("print('changed')\n")
+    result = runner.invoke(app, ["echo", "--all", "--matrix", "--ghout-prefix", "v_"])
+    assert result.exit_code == 0
+
+    lines = result.stdout.splitlines()
+    assert lines[0] == "version=0.0.0"
+    assert [line.split('=')[0] for line in lines[1:]] == ["app", "lib", "matrix"]
+
+    matrix = orjson.loads(lines[3].split('=', 1)[1])
+    assert [entry["name"] for entry in matrix["include"]] == ["lib"]
+
+    outputs = (project / "gh_output").read_text().splitlines()
+    assert [line.split('=')[0] for line in outputs] == ["v_version", "v_app", "v_lib", "v_matrix"]
+
+
+def test_echo_all_rejects_name(project):
+    result = runner.invoke(app, ["echo", "--all", "--name", "app"])
+    assert "cannot be combined" in result.stdout
@@ -0,0 +1,70 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import pytest
+from pathlib import Path
+from typer.testing import CliRunner
+from devtools_cli.commands.version.main import app
+
+runner = CliRunner()
+
+TAGS = ["v1.10.0", "v1.2.0", "not-a-version", "1.2.0-rc.1", "v0.9.1", ""]
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch) -> Path:
+    git_dir = tmp_path / ".git"
+    (git_dir / "refs/tags/release").mkdir(parents=True)
+    (git_dir / "packed-refs").write_text(
+        "# pack-refs with: peeled fully-peeled sorted\n"
+        "1111111111111111111111111111111111111111 refs/tags/v1.0.0\n"
+        "^2222222222222222222222222222222222222222\n"
+        "3333333333333333333333333333333333333333 refs/heads/main\n"
+        "4444444444444444444444444444444444444444 refs/tags/v2.0.0-beta.1\n"
+    )
+    (git_dir / "refs/tags/v1.1.0").write_text("5555555555555555555555555555555555555555\n")
+    (git_dir / "refs/tags/v1.0.0").write_text("1111111111111111111111111111111111111111\n")
+    (git_dir / "refs/tags/release/bad").write_text("6666666666666666666666666666666666666666\n")
+    (tmp_path / "sub").mkdir()
+    monkeypatch.chdir(tmp_path / "sub")
+    return tmp_path
+
+
+def test_sort_stdin():
+    result = runner.invoke(app, ["sort", "--stdin"], input="\n".join(TAGS))
+    assert result.exit_code == 0
+    assert result.stdout.splitlines() == ["v0.9.1", "1.2.0-rc.1", "v1.2.0", "v1.10.0"]
+    assert "not-a-version" in result.stderr
+
+
+def test_sort_prerelease_policy():
+    args = ["sort", "--stdin", "--reverse", "--prerelease-policy"]
+    result = runner.invoke(app, [*args, "exclude"], input="\n".join(TAGS))
+    assert result.stdout.splitlines() == ["v1.10.0", "v1.2.0", "v0.9.1"]
+    result = runner.invoke(app, [*args, "only"], input="\n".join(TAGS))
+    assert result.stdout.splitlines() == ["1.2.0-rc.1"]
+
+
+def test_sort_git_latest(repo):
+    result = runner.invoke(app, ["sort", "--git"])
+    assert result.exit_code == 0
+    assert result.stdout.splitlines() == ["v1.0.0", "v1.1.0", "v2.0.0-beta.1"]
+    assert "release/bad" in result.stderr
+
+    result = runner.invoke(app, ["sort", "--git", "--latest", "-p", "exclude"])
+    assert result.stdout.splitlines() == ["v1.1.0"]
+
+
+def test_cmp_stdin():
+    pairs = "1.0.0 1.0.1\nv2.0.0 1.9.9\n\n1.0.0 bogus\n1.0.0\nv1.0.0 1.0.0\n"
+    result = runner.invoke(app, ["cmp", "--stdin"], input=pairs)
+    assert result.exit_code == 0
+    assert result.stdout.splitlines() == ["gt", "lt", "invalid", "invalid", "eq"]
@@ -0,0 +1,110 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import pytest
+from pathlib import Path
+from devtools_cli.api import project_version, update_descriptors, VersionError
+from devtools_cli.commands.version.descriptors import SupportedDescriptors
+
+DESCRIPTORS = {
+    "pyproject.toml": (
+        '[tool.black]\nversion = "skip"\n\n'
+        "[project]\nname = 'pkg'\nversion = '1.2.3'  # keep\n",
+        "[project]\nname = 'pkg'\nversion = '2.0.0'  # keep\n"
+    ),
+    "package.json": (
+        '{\r\n    "name": "pkg",\r\n    "dependencies": {"version": "9.9.9"},\r\n    "version": "1.2.3"\r\n}',
+        '    "dependencies": {"version": "9.9.9"},\r\n    "version": "2.0.0"\r\n}'
+    ),
+    "Cargo.toml": (
+        '[package]\nname = "pkg"\nversion = "1.2.3"\n\n[dependencies]\nserde = { version = "1.0" }\n',
+        'version = "2.0.0"\n\n[dependencies]\nserde = { version = "1.0" }\n'
+    ),
+    "pom.xml": (
+        '<project xmlns="http://maven.apache.org/POM/4.0.0"\n'
+        '         xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">\n'
+        '  <parent>\n    <version>0.1.0</version>\n  </parent>\n'
+        '  <!-- <version>0.0.1</version> -->\n'
+        '  <version>1.2.3</version>\n</project>\n',
+        '    <version>0.1.0</version>\n  </parent>\n'
+        '  <!-- <version>0.0.1</version> -->\n'
+        '  <version>2.0.0</version>\n</project>\n'
+    ),
+    "setup.cfg": (
+        "[metadata]\nname = pkg\nversion = 1.2.3\n",
+        "version = 2.0.0\n"
+    ),
+    "Chart.yaml": (
+        "apiVersion: v2\nversion: 1.2.3\nappVersion: \"1.2.3\"\n"
+        "dependencies:\n  - name: db\n    version: 4.5.6\n",
+        "version: 2.0.0\nappVersion: \"2.0.0\"\n"
+        "dependencies:\n  - name: db\n    version: 4.5.6\n"
+    ),
+    "version.txt": ("\n1.2.3\n", "\n2.0.0\n")
+}
+
+
+@pytest.mark.parametrize("name", DESCRIPTORS)
+def test_descriptor_roundtrip(tmp_path: Path, name: str):
+    content, expected = DESCRIPTORS[name]
+    path = tmp_path / name
+    path.write_bytes(content.encode())
+    editor = SupportedDescriptors[name]
+
+    assert editor('read', path) == "1.2.3"
+    editor('write', path, "2.0.0")
+    assert editor('read', path) == "2.0.0"
+    assert path.read_bytes().endswith(expected.encode())
+
+
+def test_descriptor_without_version(tmp_path: Path):
+    path = tmp_path / "setup.cfg"
+    path.write_text("[metadata]\nversion = attr: pkg.__version__\n")
+    editor = SupportedDescriptors["setup.cfg"]
+    assert editor('read', path) == "0.0.0"
+    editor('write', path, "2.0.0")
+    assert path.read_text() == "[metadata]\nversion = attr: pkg.__version__\n"
+
+
+def test_project_version_uses_primary_descriptor(tmp_path: Path):
+    (tmp_path / ".devtools").write_text("{}")
+    (tmp_path / "version.txt").write_text("1.2.3\n")
+    (tmp_path / "Chart.yaml").write_text("version: 0.3.0\n")
+    assert project_version(tmp_path) == "0.0.0"
+
+    (tmp_path / "package.json").write_text('{"version": "1.2.4"}')
+    assert project_version(tmp_path) == "1.2.4"
+
+    (tmp_path / "pyproject.toml").write_text('[project]\nversion = "1.0.0"\n')
+    assert project_version(tmp_path) == "1.0.0"
+
+
+def test_update_descriptors(tmp_path: Path):
+    (tmp_path / ".devtools").write_text("{}")
+    for name, (content, _) in DESCRIPTORS.items():
+        (tmp_path / "packages" / name.lower()).mkdir(parents=True)
+        (tmp_path / "packages" / name.lower() / name).write_bytes(content.encode())
+    for pruned in ["node_modules/dep", "target/package", ".venv"]:
+        (tmp_path / pruned).mkdir(parents=True)
+        (tmp_path / pruned / "package.json").write_text('{"version": "0.0.1"}')
+    (tmp_path / "package.json").write_text('{"name": "root"}')
+
+    results = update_descriptors("2.0.0", tmp_path)
+    by_path = {r.path.as_posix(): r for r in results}
+    assert set(by_path) == {
+        "package.json", *[f"packages/{name.lower()}/{name}" for name in DESCRIPTORS]
+    }
+    assert by_path["package.json"].old_version == ""
+    for name, (_, expected) in DESCRIPTORS.items():
+        path = tmp_path / "packages" / name.lower() / name
+        assert by_path[f"packages/{name.lower()}/{name}"].old_version == "1.2.3"
+        assert path.read_bytes().endswith(expected.encode())
+    assert (tmp_path / "node_modules/dep/package.json").read_text() == '{"version": "0.0.1"}'
@@ -0,0 +1,93 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+import time
+import shutil
+import pytest
+import subprocess
+from pathlib import Path
+from collections import Counter
+from devtools_cli.api import component_digests, export_digest_cache, import_digest_cache, track_component
+from devtools_cli.commands.version import helpers
+from devtools_cli.commands.version.cache import DigestCache
+from devtools_cli.commands.version.gitrepo import read_git_index
+
+requires_git = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def git(cwd: Path, *args: str) -> str:
+    cmd = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args]
+    return subprocess.run(cmd, cwd=cwd, check=True, capture_output=True, text=True).stdout
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch) -> Path:
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    root = tmp_path / "repo"
+    (root / "src/sub").mkdir(parents=True)
+    for i in range(10):
+        (root / f"src/file{i}.txt").write_text(f"content {i}\n")
+    (root / "src/sub/ünïcode.py").write_text("print()\n")
+    (root / ".devtools").write_text("{}")
+    track_component("src", "src", root=root)
+    git(root, "init", "-q")
+    git(root, "add", "-A")
+    git(root, "commit", "-qm", "init")
+    return root
+
+
+def test_digest_cache_roundtrip():
+    cache = DigestCache({("a/b.txt", 12, bytes(20)): "0123456789abcdef0123456789abcdef"})
+    assert DigestCache.loads(cache.dumps()).entries == cache.entries
+    with pytest.raises(ValueError):
+        DigestCache.loads(b"not a digest cache")
+
+
+@requires_git
+@pytest.mark.parametrize("index_version", ["2", "3", "4"])
+def test_read_git_index(repo, index_version):
+    git(repo, "update-index", "--index-version", index_version)
+    entries = read_git_index(repo / ".git/index")
+    expected = {}
+    for line in git(repo, "ls-files", "-s", "-z").split("\0"):
+        if line:
+            meta, path = line.split("\t", 1)
+            expected[path] = bytes.fromhex(meta.split()[1])
+    assert {path: entry[2] for path, entry in entries.items()} == expected
+
+
+@requires_git
+def test_export_import_digest_cache(repo, tmp_path, monkeypatch):
+    expected = component_digests(repo)
+    artifact = tmp_path / "digests.bin"
+    assert export_digest_cache(artifact, repo) == 11
+
+    clone = tmp_path / "clone"
+    git(tmp_path, "clone", "-q", str(repo), str(clone))
+    # Rewrite the index after the checkout, so that its entries are not racily clean.
+    time.sleep(0.05)
+    git(clone, "status", "--porcelain")
+    assert import_digest_cache(artifact, clone) == 11
+
+    calls = Counter()
+    digest_file = helpers.digest_file
+
+    def counting_digest_file(path: Path) -> str:
+        calls[path.name] += 1
+        return digest_file(path)
+
+    monkeypatch.setattr(helpers, "digest_file", counting_digest_file)
+    assert component_digests(clone) == expected
+    assert sum(calls.values()) <= 1
+
+    (clone / "src/file3.txt").write_text("changed\n")
+    assert component_digests(clone) != expected
+    assert calls["file3.txt"] == 1
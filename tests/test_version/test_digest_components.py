@@ -0,0 +1,89 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+from pathlib import Path
+import os
+from collections import Counter
+from devtools_cli.commands.version import helpers
+from devtools_cli.commands.version.helpers import digest_component, digest_components
+from devtools_cli.commands.version.models import DigestMode, TrackedComponent
+
+
+def make_tree(root: Path) -> None:
+    for path in [
+        "README.md",
+        "services/api/main.py",
+        "services/api/data/blob.bin",
+        "services/web/index.js",
+        "services/_private/secret.txt",
+        "lib/util.py"
+    ]:
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_text(f"content of {path}\n")
+
+
+def component(name: str, target: str, ignore: list = None, **kwargs) -> TrackedComponent:
+    return TrackedComponent(name=name, target=target, ignore=ignore or [], hash="", **kwargs)
+
+
+def test_digest_components_match_separate_runs(tmp_path: Path, monkeypatch):
+    make_tree(tmp_path)
+    components = [
+        component("all", ".", ["lib"]),
+        component("api", "services/api", ["data"]),
+        component("api2", "./services/api/", ["data"]),
+        component("services", "services"),
+        component("readme", "README.md"),
+        component("missing", "does/not/exist")
+    ]
+    expected = [digest_component(tmp_path, comp) for comp in components]
+
+    calls = Counter()
+    digest_file = helpers.digest_file
+
+    def counting_digest_file(path: Path) -> str:
+        calls[path] += 1
+        return digest_file(path)
+
+    monkeypatch.setattr(helpers, "digest_file", counting_digest_file)
+    assert digest_components(tmp_path, components) == expected
+    assert len(calls) == 4
+    assert set(calls.values()) == {1}
+
+
+def test_digest_modes(tmp_path: Path, monkeypatch):
+    make_tree(tmp_path)
+    blob = tmp_path / "services/api/data/blob.bin"
+    blob.write_bytes(bytes(4096))
+    components = [
+        component("content", "services"),
+        component("metadata", "services", mode=DigestMode.METADATA),
+        component("hybrid", "services", mode=DigestMode.HYBRID, threshold=1024),
+        component("file", "README.md", mode=DigestMode.METADATA)
+    ]
+    expected = [digest_component(tmp_path, comp) for comp in components]
+    assert len(set(expected)) == 4
+
+    calls = Counter()
+    digest_file = helpers.digest_file
+
+    def counting_digest_file(path: Path) -> str:
+        calls[path.name] += 1
+        return digest_file(path)
+
+    monkeypatch.setattr(helpers, "digest_file", counting_digest_file)
+    assert digest_components(tmp_path, components) == expected
+    assert calls == {"main.py": 2, "index.js": 2, "blob.bin": 1}
+
+    stat = blob.stat()
+    os.utime(blob, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    changed = digest_components(tmp_path, components)
+    assert [a == b for a, b in zip(expected, changed)] == [True, False, False, True]
@@ -0,0 +1,67 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+
+import orjson
+from pathlib import Path
+from devtools_cli.api import project_status, update_component_digests
+from devtools_cli.commands.version.helpers import digest_directory
+from devtools_cli.commands.version.models import LEGACY_DIGEST_FORMAT, DIGEST_FORMAT
+
+FILES = ["b/x.py", "b-c/y.py", "a/c/z.py", "a/w.py", "a.py", "_private/v.py", ".hidden/u.py"]
+
+
+def make_tree(root: Path) -> None:
+    for path in FILES:
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_text(f"content of {path}\n")
+
+
+def test_digest_directory_is_fixed(tmp_path):
+    make_tree(tmp_path)
+    assert digest_directory(tmp_path, []) == "be9bab4956dd96b57352ef72d05e0f8d"
+
+
+def test_legacy_digests_are_migrated(tmp_path):
+    make_tree(tmp_path / "src")
+    legacy = digest_directory(tmp_path / "src", [], digest_format=LEGACY_DIGEST_FORMAT)
+    current = digest_directory(tmp_path / "src", [])
+    config = dict(version_cmd=dict(
+        app_version="0.1.0",
+        track_descriptor=False,
+        track_chart=False,
+        components=[dict(name="src", target="src", ignore=[], hash=legacy)]
+    ))
+    (tmp_path / ".devtools").write_bytes(orjson.dumps(config))
+
+    comp = project_status(tmp_path)["components"][0]
+    assert comp["changed"] is False and comp["current"] == current
+
+    assert update_component_digests(tmp_path) == {}
+    comp = orjson.loads((tmp_path / ".devtools").read_bytes())["version_cmd"]["components"][0]
+    assert comp["hash"] == current and comp["digest_format"] == DIGEST_FORMAT
+    assert project_status(tmp_path)["components"][0]["changed"] is False
+
+
+def test_changed_legacy_digests_are_reported(tmp_path):
+    make_tree(tmp_path / "src")
+    legacy = digest_directory(tmp_path / "src", [], digest_format=LEGACY_DIGEST_FORMAT)
+    config = dict(version_cmd=dict(
+        app_version="0.1.0",
+        track_descriptor=False,
+        track_chart=False,
+        components=[dict(name="src", target="src", ignore=[], hash=legacy)]
+    ))
+    (tmp_path / ".devtools").write_bytes(orjson.dumps(config))
+    (tmp_path / "src/a.py").write_text("changed\n")
+
+    assert project_status(tmp_path)["components"][0]["changed"] is True
+    assert list(update_component_digests(tmp_path)) == ["src"]
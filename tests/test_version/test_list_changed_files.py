@@ -0,0 +1,70 @@
+#
+#   Apache License 2.0
+#   
+#   Copyright (c) 2024, Mattias Aabmets
+#   
+#   The contents of this file are subject to the terms and conditions defined in the License.
+#   You may not use, modify, or distribute this file except in compliance with the License.
+#   
+#   SPDX-License-Identifier: Apache-2.0
+#
+
+
+import shutil
+import pytest
+import subprocess
+from pathlib import Path
+from devtools_cli.errors import GitCommandError
+from devtools_cli.commands.version.gitrepo import list_changed_files
+
+requires_git = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def git(cwd: Path, *args: str) -> str:
+    cmd = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args]
+    return subprocess.run(cmd, cwd=cwd, check=True, capture_output=True, text=True).stdout
+
+
+@pytest.fixture
+def repo(tmp_path) -> Path:
+    (tmp_path / "src").mkdir()
+    for name in ["a.py", "b.py", "c.py"]:
+        (tmp_path / "src" / name).write_text(f"# {name}\n")
+    (tmp_path / ".gitignore").write_text("*.log\n")
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "add", "-A")
+    git(tmp_path, "commit", "-qm", "init")
+    return tmp_path
+
+
+def names(paths) -> list:
+    return sorted(path.relative_to(path.parents[1]).as_posix() for path in paths)
+
+
+@requires_git
+def test_list_changed_files(repo):
+    git(repo, "tag", "v1")
+    (repo / "src/a.py").write_text("# changed\n")
+    (repo / "src/b.py").unlink()
+    (repo / "src/new.py").write_text("# new\n")
+    (repo / "src/debug.log").write_text("log\n")
+    (repo / "src/staged.py").write_text("# staged\n")
+    git(repo, "add", "src/staged.py")
+
+    changed = list_changed_files(repo / "src")
+    assert all(path.is_absolute() for path in changed)
+    assert names(changed) == ["src/a.py", "src/new.py", "src/staged.py"]
+    assert names(list_changed_files(repo, staged=True)) == ["src/staged.py"]
+
+    git(repo, "commit", "-qam", "next")
+    assert names(list_changed_files(repo)) == ["src/new.py"]
+    assert names(list_changed_files(repo, since="v1")) == ["src/a.py", "src/new.py", "src/staged.py"]
+    assert names(list_changed_files(repo, since="v1", staged=True)) == ["src/a.py", "src/staged.py"]
+
+
+@requires_git
+def test_list_changed_files_errors(repo, tmp_path_factory):
+    with pytest.raises(GitCommandError):
+        list_changed_files(repo, since="no-such-revision")
+    with pytest.raises(GitCommandError):
+        list_changed_files(tmp_path_factory.mktemp("not_a_repo"))